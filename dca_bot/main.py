@@ -2,6 +2,7 @@ import os
 
 from dotenv import load_dotenv
 
+from dca_investment_bot.async_dca_invester import AsyncDCAInvester
 from dca_investment_bot.config_manager import ConfigManager
 from dca_investment_bot.DCAInvester import DCAInvester
 from dca_investment_bot.logger import init_logger
@@ -30,7 +31,11 @@ def main():
     else:
         LOG_WARNING_AND_NOTIFY(debug_tag, "No .env file found at {}", dotEnvPath)
 
-    invester = DCAInvester(config_manager)
+    if config_manager.use_asyncio:
+        LOG_INFO(debug_tag, "Using asyncio backend")
+        invester = AsyncDCAInvester(config_manager)
+    else:
+        invester = DCAInvester(config_manager)
     invester.run()
 
 
@@ -2,20 +2,24 @@ import datetime
 import json
 import os
 import signal
-import time
+import threading
 from decimal import getcontext
-from typing import Union
+from typing import List
+from typing import Optional
 
 from binance.enums import SIDE_BUY
 from binance.exceptions import BinanceAPIException
-from requests.exceptions import ConnectionError
-from requests.exceptions import ReadTimeout
 
 import dca_investment_bot.global_vars as global_vars
 from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
 from dca_investment_bot.config_manager import ConfigManager
 from dca_investment_bot.dca_investment_parameter import DCAInvestmentParameter
 from dca_investment_bot.exceptions import KillProcessException
+from dca_investment_bot.http_transport import NETWORK_ERRORS
+from dca_investment_bot.investment_scheduler import InvestmentScheduler
+from dca_investment_bot.logger import is_info_enabled
 from dca_investment_bot.logger import log_and_raise_exeption
 from dca_investment_bot.logger import LOG_CRITICAL_AND_NOTIFY
 from dca_investment_bot.logger import LOG_DEBUG
@@ -23,10 +27,13 @@ from dca_investment_bot.logger import LOG_ERROR_AND_NOTIFY
 from dca_investment_bot.logger import LOG_INFO
 from dca_investment_bot.logger import LOG_WARNING
 from dca_investment_bot.logger import LOG_WARNING_AND_NOTIFY
+from dca_investment_bot.market_snapshot import MarketSnapshot
+from dca_investment_bot.market_snapshot import MarketSnapshotFetcher
 from dca_investment_bot.order_fulfilled_checker_thread import OrderFulfilledChecker
 from dca_investment_bot.order_list_manager import OrderListManager
 from dca_investment_bot.paths import Paths
 from dca_investment_bot.trading_bot import TradingBot
+from dca_investment_bot.user_data_stream_checker import UserDataStreamOrderChecker
 
 
 def signal_handler(signal, frame):
@@ -34,10 +41,19 @@ def signal_handler(signal, frame):
 
 
 class DCAInvester:
-    def __init__(self, config_manager: ConfigManager) -> None:
+    def __init__(self, config_manager: ConfigManager, clock: Clock = SYSTEM_CLOCK) -> None:
+        """
+        clock is used for every time lookup and wait of the main loop and the order checker,
+        e.g. a VirtualClock for paper trading.
+        """
         self.bot: TradingBot = None
         self.order_list_manager: OrderListManager = None
         self.config_manager: ConfigManager = config_manager
+        self.clock: Clock = clock
+        self.scheduler: InvestmentScheduler = InvestmentScheduler(clock)
+        self.dca_file_modification_time: Optional[float] = None
+        self.market_snapshot_fetcher: MarketSnapshotFetcher = None
+        self.stop_requested = threading.Event()
 
     def run(self):
         # set precision for Decimal to 8 since most numbers in binance use max 8 digits
@@ -45,79 +61,26 @@ class DCAInvester:
 
         debug_tag = "[Startup]"
 
-        self.order_list_manager = OrderListManager(Paths.order_filepath)
+        self.order_list_manager = self.create_order_list_manager()
         self.order_list_manager.load_fulfilled_from_file()
 
-        order_fulfilled_checker_thread: OrderFulfilledChecker = OrderFulfilledChecker(
-            self.order_list_manager,
-            on_order_filled_callback=self.on_order_filled_callback,
-            get_order_status_callback=self.get_order_status_callback,
-        )
-
-        ids = []
-        global_vars.sync_fulfilled_orders_to_firebase = self.config_manager.sync_fulfilled_orders_to_firebase
-
-        if self.config_manager.use_firebase:
-            from dca_investment_bot.firebase.firebase_storage import FirebaseStorage
-            from dca_investment_bot.firebase.firebase_messager import FirebaseMessager
-
-            LOG_INFO(debug_tag, "Using Firebase")
-            firebase_project_id = self.config_manager.firebase_project_id
-            global_vars.firebaseStorage = FirebaseStorage(firebase_project_id)
-            global_vars.firebaseStorage.connect()
-
-            # retrieve user ids from firebase
-            LOG_INFO(debug_tag, "Retrieving all users to notify from firebase")
-            ids = global_vars.firebaseStorage.get_all_ids()
-            if len(ids) == 0:
-                LOG_WARNING(debug_tag, "No users found to notify")
-            else:
-                LOG_INFO(debug_tag, f"{len(ids)} users found to notify")
-
-            global_vars.firebaseMessager = FirebaseMessager()
-            global_vars.firebaseMessager.set_ids(ids)
-        else:
-            LOG_INFO(debug_tag, "Not using firebase")
-
-        if global_vars.firebaseMessager is not None:
-            LOG_DEBUG(debug_tag, "Sending push notification that bot is starting")
-            global_vars.firebaseMessager.push_notification(
-                title="DCA Bot starting",
-                body="Bot started at: {}".format(datetime.datetime.now().strftime("%d.%m.%Y %H:%M:%S")),
-            )
-
-        USE_TESTNET = self.config_manager.use_testnet
-        check_interval = self.config_manager.check_interval
-
-        # check_interval must be at least 30 seconds
-        if check_interval < 30:
-            LOG_ERROR_AND_NOTIFY(debug_tag, "Check interval in config file is too small. (>=30 seconds)")
-            raise Exception("Check interval in config file is too small. (>=30 seconds)")
-        LOG_DEBUG(
-            debug_tag,
-            f"Check interval set to {check_interval} seconds ({str(datetime.timedelta(seconds=check_interval))})",
-        )
+        self.setup_firebase(debug_tag)
+        check_interval = self.get_check_interval(debug_tag)
 
-        self.bot = TradingBot(use_testnet=USE_TESTNET)
+        self.bot = self.create_trading_bot()
         self.bot.connect()
+        self.market_snapshot_fetcher = MarketSnapshotFetcher(self.bot, self.config_manager.max_concurrent_requests)
+        order_fulfilled_checker_thread = self.create_order_fulfilled_checker()
 
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
+        if hasattr(signal, "SIGHUP"):
+            # SIGHUP wakes up the main loop to reload the dca investment parameter file
+            signal.signal(signal.SIGHUP, lambda signum, frame: self.scheduler.notify())
 
-        dca_investment_strategies = []
-        if os.path.isfile(Paths.dca_file_path):
-            try:
-                with open(Paths.dca_file_path) as f:
-                    dca_investments = json.load(f)
-                    for dca_investment in dca_investments:
-                        dca_investment_strategies.append(DCAInvestmentParameter(dca_investment))
-            except Exception as e:
-                log_and_raise_exeption(e)
-        else:
-            LOG_ERROR_AND_NOTIFY(
-                debug_tag,
-                f"Failed to load dca investment parameter file at {Paths.dca_file_path}",
-            )
+        dca_investment_strategies = self.load_investment_strategies()
+        self.bot.set_price_symbols([s.symbol for s in dca_investment_strategies])
+        self.dca_file_modification_time = self.get_dca_file_modification_time()
 
         # store every order made
         # don't retrieve it from binance in case a manuel order is made
@@ -135,12 +98,16 @@ class DCAInvester:
 
         debug_tag = "[MainLoop]"
 
+        self.schedule_investment_strategies(dca_investment_strategies, check_interval)
+        last_unfulfilled_notification = self.clock.time()
+        # failed cycles in a row, the requests were already retried by the transport of the bot
+        network_failures = 0
+
         # TODO: Make this more organized
         try:
             running = True
             while running:
                 try:
-                    LOG_INFO("----Checking if DCA investment is neccessary----")
                     if len(dca_investment_strategies) == 0:
                         LOG_ERROR_AND_NOTIFY(
                             debug_tag,
@@ -149,118 +116,35 @@ class DCAInvester:
                         )
                         running = False
                         continue
-                    for investment_strategy in dca_investment_strategies:
-                        """
-                        A symbol is composed of a base asset and a quote asset.
-                        Given a symbol BTCUSDT,
-                        BTC stands for the base asset and USDT stands for the quote asset.
-                        """
-                        symbol = investment_strategy.symbol
-                        # print current asset balance for BTC and USDT
-                        info = self.bot.get_symbol_info(symbol)
-                        base_asset = info["baseAsset"]
-                        quote_asset = info["quoteAsset"]
-                        now = datetime.datetime.now()
-                        LOG_INFO("------------------------------------------------")
-                        LOG_INFO("Time: ", now.strftime("%d.%m.%Y %H:%M:%S"))
-                        LOG_INFO(f"Symbol: {symbol}")
-                        LOG_INFO(f"Current average price for {symbol}: {self.bot.get_avg_price(symbol)}")
-                        LOG_INFO(f"Balance base asset {base_asset}: {self.bot.get_asset_balance(base_asset)}")
-                        LOG_INFO(f"Balance quote asset {quote_asset}: {self.bot.get_asset_balance(quote_asset)}")
-
-                        # interval to add to last investment time
-                        investment_interval_timedelta = datetime.timedelta(seconds=investment_strategy.interval)
-
-                        # get hours and minute from investment time
-                        hours = investment_strategy.investment_time // 3600
-                        minutes = (investment_strategy.investment_time % 3600) // 60
-
-                        investment_start = datetime.datetime.fromtimestamp(
-                            investment_strategy.start_date + investment_strategy.investment_time
+
+                    if self.stop_requested.is_set():
+                        LOG_INFO(debug_tag, "Stop requested")
+                        running = False
+                        continue
+
+                    self.check_due_strategies(check_interval)
+                    network_failures = 0
+
+                    next_due = self.scheduler.next_due_timestamp()
+                    if next_due is not None:
+                        LOG_DEBUG(
+                            debug_tag,
+                            "Next investment check at",
+                            self.clock.fromtimestamp(next_due).strftime("%d.%m.%Y %H:%M:%S"),
                         )
-                        if now >= investment_start:
-                            # get last order for symbol
-                            last_order: Union[BinanceOrder, None] = None
-
-                            # TODO: put this into OrderListManager
-                            # -> get_last_order_for_symbol
-                            for order in self.order_list_manager.fulfilled_orders():
-                                if order.symbol == symbol and order.side == SIDE_BUY:
-                                    last_order = order
-                            should_invest = False
-                            if last_order is not None:
-                                time_of_last_investment = datetime.datetime.fromtimestamp(last_order.time / 1000)
-                                LOG_INFO(
-                                    "Last investment time:",
-                                    time_of_last_investment.strftime("%d.%m.%Y %H:%M:%S"),
-                                )
-
-                                time_diff_today = datetime.datetime.now() - time_of_last_investment
-                                LOG_INFO(
-                                    "Time since last investment:",
-                                    str(datetime.timedelta(seconds=time_diff_today.total_seconds())),
-                                )
-
-                                time_of_last_investment_midnight = time_of_last_investment.replace(
-                                    hour=0, minute=0, second=0, microsecond=0
-                                )
-
-                                # next investment should happen at
-                                # last investment time + interval at defined time
-                                next_investment_timestamp = (
-                                    time_of_last_investment_midnight + investment_interval_timedelta
-                                ).replace(hour=hours, minute=minutes, second=0, microsecond=0)
-                                LOG_INFO(
-                                    "Time for next investment:",
-                                    next_investment_timestamp.strftime("%d.%m.%Y %H:%M:%S"),
-                                )
-
-                                # check if last investment is older than interval
-                                if now >= next_investment_timestamp:
-                                    time_delta = datetime.timedelta(seconds=investment_strategy.interval)
-                                    LOG_INFO(f"Last investment is older than interval of {time_delta}, invest again")
-                                    if not self.exists_unfulfilled_order_for_symbol(symbol):
-                                        should_invest = True
-                                    else:
-                                        LOG_INFO("Investment order is in place, wait for it to be filled")
-                            else:
-                                if not self.exists_unfulfilled_order_for_symbol(symbol):
-                                    LOG_INFO("No previous investment found, invest now")
-                                    should_invest = True
-                                else:
-                                    LOG_INFO("Investment order is in place, wait for it to be filled")
-
-                            # invest in crypto
-                            if should_invest:
-                                self.invest(investment_strategy)
-
-                            LOG_INFO("------------------------------------------------")
-                            # print orders
-                            LOG_INFO("Current open orders:")
-                            self.order_list_manager.print_orders(self.bot.get_orders(investment_strategy.symbol))
-
-                            LOG_INFO("Unfulfilled orders:")
-                            self.order_list_manager.print_orders(self.order_list_manager.unfulfilled_orders())
-
-                            LOG_INFO("fulfilled orders:")
-                            self.order_list_manager.print_orders(self.order_list_manager.fulfilled_orders())
-                        else:
-                            LOG_INFO("Investment starts at {}".format(investment_start.strftime("%d.%m.%Y %H:%M:%S")))
-                    time.sleep(check_interval)
-
-                    # notify user if there are unfulfilled orders
-                    if global_vars.firebaseMessager is not None:
-                        if len(self.order_list_manager.unfulfilled_orders()) > 0:
-                            LOG_DEBUG(
-                                debug_tag,
-                                "Sending push notifications for unfulfilled orders",
-                            )
-                            for order in self.order_list_manager.unfulfilled_orders():
-                                LOG_DEBUG(debug_tag, "Unfulfilled Order:", order.to_info_string())
-                                global_vars.firebaseMessager.push_notification(
-                                    f"Unfulfilled Order {order.orderId}",
-                                    order.to_info_string(),
-                                )
+
+                    # sleep until the next strategy is due or an event (e.g. order filled) wakes us up
+                    if self.scheduler.wait_until_next_due(self.clock.time(), max_wait=check_interval):
+                        LOG_DEBUG(debug_tag, "Woken up by event, rescheduling investment strategies")
+                        dca_investment_strategies = self.reload_investment_strategies_if_changed(
+                            dca_investment_strategies
+                        )
+                        self.schedule_investment_strategies(dca_investment_strategies, check_interval)
+
+                    # notify user if there are unfulfilled orders (at most once per check interval)
+                    if self.clock.time() - last_unfulfilled_notification >= check_interval:
+                        last_unfulfilled_notification = self.clock.time()
+                        self.notify_unfulfilled_orders(debug_tag)
 
                 except KillProcessException:
                     LOG_INFO(debug_tag, "Process killed from outside")
@@ -269,12 +153,12 @@ class DCAInvester:
                 except KeyboardInterrupt:
                     LOG_INFO(debug_tag, "Exiting...")
                     running = False
-                except ReadTimeout:
+                except NETWORK_ERRORS:
                     LOG_WARNING(debug_tag, "No Internet connection... retrying...")
-                    time.sleep(15)
-                except ConnectionError:
-                    LOG_WARNING(debug_tag, "No Internet connection... retrying...")
-                    time.sleep(15)
+                    self.clock.sleep(self.bot.transport.backoff(network_failures))
+                    network_failures += 1
+                    # strategies that were popped but not checked need to be checked again
+                    self.schedule_investment_strategies(dca_investment_strategies, check_interval)
                 except Exception as e:
                     log_and_raise_exeption(e, raise_exception=False)
                     LOG_ERROR_AND_NOTIFY(
@@ -293,9 +177,12 @@ class DCAInvester:
                 LOG_INFO("Waiting for threads to finish, this can take a few seconds...")
                 order_fulfilled_checker_thread.stop_and_join()
                 LOG_DEBUG("Order listener thread stopped (order_fulfilled_checker_thread)")
+                # the checker could have journaled fills in the meantime
+                self.order_list_manager.close()
 
                 # make sure to cancel all unfulfilled orders before closing the bot
                 canceled = False
+                attempt = 0
                 while not canceled:
                     try:
                         # TODO: Store to file and load on next start
@@ -308,26 +195,17 @@ class DCAInvester:
                                 LOG_ERROR_AND_NOTIFY(e)
                                 continue
                         canceled = True
-                    except ReadTimeout:
+                    except NETWORK_ERRORS:
                         LOG_WARNING(
                             "[Deleting all current orders] No Internet connection... \
                                 retrying..."
                         )
-                        time.sleep(15)
-                    except ConnectionError:
-                        LOG_WARNING(
-                            "[Deleting all current orders] No Internet connection... \
-                                retrying..."
-                        )
-                        time.sleep(15)
+                        # canceling is not retried by the transport, orders canceled before are skipped with an error
+                        self.clock.sleep(self.bot.transport.backoff(attempt))
+                        attempt += 1
 
                 LOG_INFO("Process exited")
-                if global_vars.firebaseMessager is not None:
-                    LOG_DEBUG(debug_tag, "Sending push notification that bot shut down")
-                    global_vars.firebaseMessager.push_notification(
-                        title="Bot shut down",
-                        body="Bot shut down at: {}".format(datetime.datetime.now().strftime("%d.%m.%Y %H:%M:%S")),
-                    )
+                self.notify_shutdown(debug_tag)
             except KillProcessException:
                 LOG_CRITICAL_AND_NOTIFY(
                     debug_tag,
@@ -336,45 +214,379 @@ class DCAInvester:
             except Exception as e:
                 log_and_raise_exeption(e)
 
+    def setup_firebase(self, debug_tag: str) -> None:
+        ids = []
+        global_vars.sync_fulfilled_orders_to_firebase = self.config_manager.sync_fulfilled_orders_to_firebase
+
+        if self.config_manager.use_firebase:
+            from dca_investment_bot.firebase.firebase_storage import FirebaseStorage
+            from dca_investment_bot.firebase.firebase_messager import FirebaseMessager
+
+            LOG_INFO(debug_tag, "Using Firebase")
+            firebase_project_id = self.config_manager.firebase_project_id
+            global_vars.firebaseStorage = FirebaseStorage(firebase_project_id)
+            global_vars.firebaseStorage.connect()
+
+            # retrieve user ids from firebase
+            LOG_INFO(debug_tag, "Retrieving all users to notify from firebase")
+            ids = global_vars.firebaseStorage.get_all_ids()
+            if len(ids) == 0:
+                LOG_WARNING(debug_tag, "No users found to notify")
+            else:
+                LOG_INFO(debug_tag, f"{len(ids)} users found to notify")
+
+            global_vars.firebaseMessager = FirebaseMessager()
+            global_vars.firebaseMessager.set_ids(ids)
+        else:
+            LOG_INFO(debug_tag, "Not using firebase")
+
+        if global_vars.firebaseMessager is not None:
+            LOG_DEBUG(debug_tag, "Sending push notification that bot is starting")
+            global_vars.firebaseMessager.push_notification(
+                title="DCA Bot starting",
+                body="Bot started at: {}".format(self.clock.now().strftime("%d.%m.%Y %H:%M:%S")),
+            )
+
+    def stop(self) -> None:
+        """
+        Makes the main loop exit and shut down like on SIGTERM, can be called from any thread.
+        """
+        self.stop_requested.set()
+        self.scheduler.notify()
+
+    def create_trading_bot(self) -> TradingBot:
+        return TradingBot(
+            use_testnet=self.config_manager.use_testnet,
+            request_weight_limit=self.config_manager.request_weight_limit,
+            price_max_age=self.config_manager.price_max_age,
+            exchange_info_ttl=self.config_manager.exchange_info_ttl,
+            api_url=self.config_manager.api_url or None,
+            clock=self.clock,
+        )
+
+    def create_order_list_manager(self) -> OrderListManager:
+        if self.config_manager.use_order_database:
+            # the journal (if enabled before) is only read to import it into the database
+            journal_filepath = Paths.order_journal_filepath if self.config_manager.use_order_journal else None
+            return OrderListManager(
+                Paths.order_filepath, journal_filepath=journal_filepath, database_filepath=Paths.order_database_filepath
+            )
+        if self.config_manager.use_order_journal:
+            return OrderListManager(Paths.order_filepath, journal_filepath=Paths.order_journal_filepath)
+        return OrderListManager(Paths.order_filepath)
+
+    def create_order_fulfilled_checker(self) -> OrderFulfilledChecker:
+        """
+        Returns the checker that detects filled orders, either by polling
+        the order status or by listening to the user data stream.
+        """
+        if self.config_manager.use_user_data_stream:
+            return UserDataStreamOrderChecker(
+                self.order_list_manager,
+                on_order_filled_callback=self.on_order_filled_callback,
+                get_order_status_callback=self.get_order_status_callback,
+                bot=self.bot,
+            )
+        return OrderFulfilledChecker(
+            self.order_list_manager,
+            on_order_filled_callback=self.on_order_filled_callback,
+            get_order_status_callback=self.get_order_status_callback,
+            get_open_orders_callback=self.get_open_orders_callback,
+            clock=self.clock,
+        )
+
+    def get_check_interval(self, debug_tag: str) -> int:
+        check_interval = self.config_manager.check_interval
+
+        # check_interval must be at least 30 seconds
+        if check_interval < 30:
+            LOG_ERROR_AND_NOTIFY(debug_tag, "Check interval in config file is too small. (>=30 seconds)")
+            raise Exception("Check interval in config file is too small. (>=30 seconds)")
+        LOG_DEBUG(
+            debug_tag,
+            f"Check interval set to {check_interval} seconds ({str(datetime.timedelta(seconds=check_interval))})",
+        )
+        return check_interval
+
+    def notify_unfulfilled_orders(self, debug_tag: str) -> None:
+        if global_vars.firebaseMessager is not None:
+            if len(self.order_list_manager.unfulfilled_orders()) > 0:
+                LOG_DEBUG(
+                    debug_tag,
+                    "Sending push notifications for unfulfilled orders",
+                )
+                for order in self.order_list_manager.unfulfilled_orders():
+                    LOG_DEBUG(debug_tag, "Unfulfilled Order:", order.to_info_string())
+                    global_vars.firebaseMessager.push_notification(
+                        f"Unfulfilled Order {order.orderId}",
+                        order.to_info_string(),
+                    )
+
+    def notify_shutdown(self, debug_tag: str) -> None:
+        if global_vars.firebaseMessager is not None:
+            LOG_DEBUG(debug_tag, "Sending push notification that bot shut down")
+            global_vars.firebaseMessager.push_notification(
+                title="Bot shut down",
+                body="Bot shut down at: {}".format(self.clock.now().strftime("%d.%m.%Y %H:%M:%S")),
+            )
+
+    def load_investment_strategies(self) -> List[DCAInvestmentParameter]:
+        """
+        Loads the DCA investment strategies from the dca investment parameter file.
+        """
+        debug_tag = "[Main - load_investment_strategies]"
+        dca_investment_strategies = []
+        if os.path.isfile(Paths.dca_file_path):
+            try:
+                with open(Paths.dca_file_path) as f:
+                    dca_investments = json.load(f)
+                    for dca_investment in dca_investments:
+                        dca_investment_strategies.append(DCAInvestmentParameter(dca_investment, self.clock))
+            except Exception as e:
+                log_and_raise_exeption(e)
+        else:
+            LOG_ERROR_AND_NOTIFY(
+                debug_tag,
+                f"Failed to load dca investment parameter file at {Paths.dca_file_path}",
+            )
+        return dca_investment_strategies
+
+    def reload_investment_strategies_if_changed(
+        self, dca_investment_strategies: List[DCAInvestmentParameter]
+    ) -> List[DCAInvestmentParameter]:
+        """
+        Reloads the strategies if the dca investment parameter file changed.
+        """
+        if self.dca_file_modification_time != self.get_dca_file_modification_time():
+            LOG_INFO("[Main]", "DCA investment parameter file changed, reloading strategies")
+            self.dca_file_modification_time = self.get_dca_file_modification_time()
+            dca_investment_strategies = self.load_investment_strategies()
+            self.bot.set_price_symbols([s.symbol for s in dca_investment_strategies])
+        return dca_investment_strategies
+
+    def get_dca_file_modification_time(self) -> Optional[float]:
+        if os.path.isfile(Paths.dca_file_path):
+            return os.path.getmtime(Paths.dca_file_path)
+        return None
+
+    def check_due_strategies(self, check_interval: int) -> int:
+        """
+        One cycle of the main loop: checks every strategy that is due and schedules its next check.
+        Returns the number of checked strategies.
+        """
+        due_strategies = self.scheduler.pop_due_strategies(self.clock.time())
+        if len(due_strategies) == 0:
+            return 0
+        LOG_INFO("----Checking if DCA investment is neccessary----")
+        # balances are fetched once per cycle
+        self.bot.invalidate_account_snapshot()
+        # fetch market data of all due strategies in parallel, then decide one by one
+        market_snapshots = self.market_snapshot_fetcher.fetch([s.symbol for s in due_strategies])
+        for investment_strategy in due_strategies:
+            # the snapshot is missing if the exchange does not know the symbol or has no price for it
+            market_snapshot = market_snapshots.get(investment_strategy.symbol)
+            if market_snapshot is not None:
+                self.check_investment(investment_strategy, market_snapshot)
+            self.schedule_investment_strategy(investment_strategy, check_interval, checked=True)
+        return len(due_strategies)
+
+    def schedule_investment_strategies(
+        self, dca_investment_strategies: List[DCAInvestmentParameter], retry_interval: int
+    ) -> None:
+        """
+        (Re)schedules all strategies at their next investment time.
+        """
+        self.scheduler.unschedule_all()
+        for investment_strategy in dca_investment_strategies:
+            self.schedule_investment_strategy(investment_strategy, retry_interval)
+
+    def schedule_investment_strategy(
+        self, investment_strategy: DCAInvestmentParameter, retry_interval: int, checked: bool = False
+    ) -> None:
+        """
+        Schedules the strategy at its next investment time.
+        If the investment time already passed but the strategy was just checked
+        or an order is still waiting to be filled, it is checked again after retry_interval seconds.
+        """
+        now = self.clock.now()
+        next_investment_time = self.get_next_investment_time(investment_strategy, now)
+        if next_investment_time <= now and (
+            checked or self.exists_unfulfilled_order_for_symbol(investment_strategy.symbol)
+        ):
+            next_investment_time = now + datetime.timedelta(seconds=retry_interval)
+        self.scheduler.schedule(investment_strategy, self.clock.timestamp(next_investment_time))
+
+    def get_next_investment_time(
+        self, investment_strategy: DCAInvestmentParameter, now: datetime.datetime
+    ) -> datetime.datetime:
+        """
+        Returns the time the strategy should invest next.
+        This only uses local data and does not make any requests.
+        """
+        investment_start = self.clock.fromtimestamp(
+            investment_strategy.start_date + investment_strategy.investment_time
+        )
+        if now < investment_start:
+            return investment_start
+
+        last_order = self.order_list_manager.get_last_order_for_symbol(investment_strategy.symbol)
+        if last_order is None:
+            return now
+
+        # next investment should happen at
+        # last investment time + interval at defined time
+        return self.clock.fromtimestamp(investment_strategy.next_investment_timestamp(last_order.time / 1000))
+
+    def check_investment(self, investment_strategy: DCAInvestmentParameter, market_snapshot: MarketSnapshot) -> None:
+        """
+        Checks if an investment is necessary for the given strategy and invests if so.
+        """
+        now = self.clock.now()
+        self.log_market_snapshot(now, market_snapshot)
+        if not self.investment_started(investment_strategy, now):
+            return
+
+        # invest in crypto
+        if self.should_invest(investment_strategy, now):
+            self.invest(investment_strategy)
+
+        self.print_order_overview(market_snapshot)
+
+    def log_market_snapshot(self, now: datetime.datetime, market_snapshot: MarketSnapshot) -> None:
+        """
+        A symbol is composed of a base asset and a quote asset.
+        Given a symbol BTCUSDT,
+        BTC stands for the base asset and USDT stands for the quote asset.
+        """
+        symbol = market_snapshot.symbol
+        # print current asset balance for BTC and USDT
+        base_asset = market_snapshot.base_asset
+        quote_asset = market_snapshot.quote_asset
+        LOG_INFO("------------------------------------------------")
+        LOG_INFO("Time: ", now.strftime("%d.%m.%Y %H:%M:%S"))
+        LOG_INFO(f"Symbol: {symbol}")
+        LOG_INFO(f"Current average price for {symbol}: {market_snapshot.avg_price}")
+        LOG_INFO(f"Balance base asset {base_asset}: {market_snapshot.base_balance}")
+        LOG_INFO(f"Balance quote asset {quote_asset}: {market_snapshot.quote_balance}")
+
+    def investment_started(self, investment_strategy: DCAInvestmentParameter, now: datetime.datetime) -> bool:
+        investment_start = self.clock.fromtimestamp(
+            investment_strategy.start_date + investment_strategy.investment_time
+        )
+        if now < investment_start:
+            LOG_INFO("Investment starts at {}".format(investment_start.strftime("%d.%m.%Y %H:%M:%S")))
+            return False
+        return True
+
+    def should_invest(self, investment_strategy: DCAInvestmentParameter, now: datetime.datetime) -> bool:
+        """
+        Decides if a new investment order should be created.
+        Only uses local data and does not make any requests.
+        """
+        symbol = investment_strategy.symbol
+        # looked up before the last order, the order checker thread could move
+        # a filled order from the unfulfilled to the fulfilled orders in between
+        has_unfulfilled_order = self.exists_unfulfilled_order_for_symbol(symbol)
+        # get last order for symbol
+        last_order = self.order_list_manager.get_last_order_for_symbol(symbol)
+        should_invest = False
+        if last_order is not None:
+            time_of_last_investment = self.clock.fromtimestamp(last_order.time / 1000)
+            LOG_INFO(
+                "Last investment time:",
+                time_of_last_investment.strftime("%d.%m.%Y %H:%M:%S"),
+            )
+
+            time_diff_today = now - time_of_last_investment
+            LOG_INFO(
+                "Time since last investment:",
+                str(datetime.timedelta(seconds=time_diff_today.total_seconds())),
+            )
+
+            next_investment_timestamp = self.get_next_investment_time(investment_strategy, now)
+            LOG_INFO(
+                "Time for next investment:",
+                next_investment_timestamp.strftime("%d.%m.%Y %H:%M:%S"),
+            )
+
+            # check if last investment is older than interval
+            if now >= next_investment_timestamp:
+                time_delta = datetime.timedelta(seconds=investment_strategy.interval)
+                LOG_INFO(f"Last investment is older than interval of {time_delta}, invest again")
+                if not has_unfulfilled_order:
+                    should_invest = True
+                else:
+                    LOG_INFO("Investment order is in place, wait for it to be filled")
+        else:
+            if not has_unfulfilled_order:
+                LOG_INFO("No previous investment found, invest now")
+                should_invest = True
+            else:
+                LOG_INFO("Investment order is in place, wait for it to be filled")
+        return should_invest
+
+    def print_order_overview(self, market_snapshot: MarketSnapshot) -> None:
+        if not is_info_enabled():
+            # the overview formats the whole order history, skip it if it is not logged
+            return
+        LOG_INFO("------------------------------------------------")
+        # print orders
+        LOG_INFO("Current open orders:")
+        self.order_list_manager.print_orders(market_snapshot.open_orders)
+
+        LOG_INFO("Unfulfilled orders:")
+        self.order_list_manager.print_orders(self.order_list_manager.unfulfilled_orders())
+
+        LOG_INFO("fulfilled orders:")
+        self.order_list_manager.print_orders(self.order_list_manager.fulfilled_orders())
+
     def exists_unfulfilled_order_for_symbol(self, symbol: str) -> bool:
-        for order in self.order_list_manager.unfulfilled_orders():
-            if order.symbol == symbol and order.side == SIDE_BUY:
-                return True
-        return False
+        return len(self.order_list_manager.open_orders_for_symbol(symbol, SIDE_BUY)) > 0
 
     def on_order_filled_callback(self, order: BinanceOrder) -> None:
         debug_tag = "[OrderFulfilledChecker Callback - on_order_filled]"
+        self.bot.invalidate_account_snapshot()
         message_body = f"Order filled: {order.to_info_string()}\n"
         if global_vars.firebaseMessager is not None:
             LOG_DEBUG(debug_tag, "Sending push notification for filled order", message_body)
             global_vars.firebaseMessager.push_notification(title="Order filled!", body=message_body)
 
+        # the filled order changes the next investment time of its strategy
+        self.scheduler.notify()
+
     def get_order_status_callback(self, symbol, order_id):
         debug_tag = "[OrderFulfilledChecker Callback - get_order_status]"
         try:
             return self.bot.get_order_status(symbol, order_id)
-        except ReadTimeout:
+        except NETWORK_ERRORS as e:
+            # the request was already retried by the transport, the checker asks again on its next check
             LOG_WARNING_AND_NOTIFY(
                 debug_tag,
-                f"Timeout while checking order status for order {symbol} {order_id}",
+                f"Network error while checking order status for order {symbol} {order_id}: {type(e).__name__}",
             )
             return None
-        except ConnectionError:
+
+    def get_open_orders_callback(self, symbol: str) -> Optional[List[BinanceOrder]]:
+        debug_tag = "[OrderFulfilledChecker Callback - get_open_orders]"
+        try:
+            return self.bot.get_orders(symbol)
+        except NETWORK_ERRORS as e:
             LOG_WARNING_AND_NOTIFY(
-                debug_tag,
-                f"Connection error while checking order status for order {symbol} {order_id}",
+                debug_tag, f"Network error while requesting open orders for {symbol}: {type(e).__name__}"
             )
             return None
 
     def invest(self, investment_strategy: DCAInvestmentParameter) -> None:
-        debug_tag = "[Main - invest]"
-
         symbol = investment_strategy.symbol
         amount = investment_strategy.investment_amount_quoteasset
         interval = investment_strategy.interval
         LOG_INFO(f"Defined Investment with interval ({str(datetime.timedelta(seconds=interval))}): {amount}")
 
         new_order = self.bot.invest_at_current_price(symbol, amount)
+        self.on_new_order_created(new_order)
+
+    def on_new_order_created(self, new_order: Optional[BinanceOrder]) -> None:
+        debug_tag = "[Main - invest]"
         if new_order is not None:
             self.order_list_manager.add_new_order(new_order)
             LOG_INFO(debug_tag, "New Investment order created:", new_order)
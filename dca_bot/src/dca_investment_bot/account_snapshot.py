@@ -0,0 +1,95 @@
+import threading
+from decimal import Decimal
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
+from dca_investment_bot.logger import LOG_DEBUG
+
+"""
+Caches the balances of all assets.
+The balances are fetched with a single account request and served from
+the snapshot until it gets invalidated (e.g. an order is placed or filled).
+"""
+
+
+class AccountSnapshot:
+    def __init__(
+        self, fetch_account: Optional[Callable[[], Dict[str, Any]]] = None, clock: Clock = SYSTEM_CLOCK
+    ) -> None:
+        """
+        fetch_account is called to refresh the snapshot on lookup.
+        Without it (e.g. when the account is fetched asynchronously), the snapshot
+        has to be refreshed with update() before looking up balances.
+        """
+        self._debug_tag = "[AccountSnapshot]"
+        self._fetch_account = fetch_account
+        self._clock = clock
+        self._free_balances: Optional[Dict[str, Decimal]] = None
+        self._locked_balances: Dict[str, Decimal] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get_free_balance(self, asset: str) -> Optional[Decimal]:
+        """
+        Returns the free balance of the asset or None if the account has no such asset.
+        Fetches the account if there is no valid snapshot.
+        """
+        with self._lock:
+            if self._free_balances is None:
+                self.__refresh()
+            assert self._free_balances is not None
+            return self._free_balances.get(asset.upper())
+
+    def get_locked_balance(self, asset: str) -> Optional[Decimal]:
+        with self._lock:
+            if self._free_balances is None:
+                self.__refresh()
+            return self._locked_balances.get(asset.upper())
+
+    def is_valid(self) -> bool:
+        with self._lock:
+            return self._free_balances is not None
+
+    def update(self, account: Dict[str, Any]) -> None:
+        """
+        Replaces the snapshot with the balances of the given account response.
+        """
+        with self._lock:
+            self.__update(account)
+
+    def invalidate(self) -> None:
+        """
+        Marks the snapshot as outdated, the next lookup fetches the account again.
+        """
+        with self._lock:
+            self._free_balances = None
+
+    def age(self) -> Optional[float]:
+        """
+        Returns the age of the snapshot in seconds or None if there is no valid snapshot.
+        """
+        with self._lock:
+            if self._free_balances is None or self._fetched_at is None:
+                return None
+            return self._clock.monotonic() - self._fetched_at
+
+    def __refresh(self) -> None:
+        if self._fetch_account is None:
+            raise Exception("Account snapshot is not valid and no fetch function is set")
+        self.__update(self._fetch_account())
+
+    def __update(self, account: Dict[str, Any]) -> None:
+        free_balances = {}
+        locked_balances = {}
+        for balance in account.get("balances", []):
+            asset = balance["asset"].upper()
+            free_balances[asset] = Decimal(balance["free"])
+            locked_balances[asset] = Decimal(balance["locked"])
+        self._free_balances = free_balances
+        self._locked_balances = locked_balances
+        self._fetched_at = self._clock.monotonic()
+        LOG_DEBUG(self._debug_tag, f"Account snapshot refreshed ({len(free_balances)} assets)")
@@ -0,0 +1,264 @@
+import asyncio
+import datetime
+import signal
+from decimal import getcontext
+from typing import Optional
+
+from binance.exceptions import BinanceAPIException
+
+from dca_investment_bot.async_trading_bot import AsyncTradingBot
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
+from dca_investment_bot.config_manager import ConfigManager
+from dca_investment_bot.DCAInvester import DCAInvester
+from dca_investment_bot.DCAInvester import signal_handler
+from dca_investment_bot.dca_investment_parameter import DCAInvestmentParameter
+from dca_investment_bot.exceptions import KillProcessException
+from dca_investment_bot.http_transport import ASYNC_NETWORK_ERRORS
+from dca_investment_bot.logger import log_and_raise_exeption
+from dca_investment_bot.logger import LOG_CRITICAL_AND_NOTIFY
+from dca_investment_bot.logger import LOG_DEBUG
+from dca_investment_bot.logger import LOG_ERROR_AND_NOTIFY
+from dca_investment_bot.logger import LOG_INFO
+from dca_investment_bot.logger import LOG_WARNING
+from dca_investment_bot.logger import LOG_WARNING_AND_NOTIFY
+from dca_investment_bot.market_snapshot import AsyncMarketSnapshotFetcher
+from dca_investment_bot.market_snapshot import MarketSnapshot
+from dca_investment_bot.order_fulfilled_checker_thread import OrderFulfilledChecker
+
+"""
+Runs the DCAInvester on a single asyncio event loop (USE_ASYNCIO in config.json).
+Uses the AsyncTradingBot and checks the unfulfilled orders in a coroutine
+instead of a separate thread. The investment decisions are the same as in the DCAInvester.
+"""
+
+
+class AsyncDCAInvester(DCAInvester):
+    def __init__(self, config_manager: ConfigManager, clock: Clock = SYSTEM_CLOCK) -> None:
+        """
+        clock is used for every time lookup and wait of the main loop and the order checker coroutine,
+        it has to support sleep_async (the VirtualClock does not).
+        """
+        super().__init__(config_manager, clock)
+        self.bot: AsyncTradingBot = None  # type: ignore
+        self.market_snapshot_fetcher: AsyncMarketSnapshotFetcher = None  # type: ignore
+        self._running = False
+
+    def run(self):
+        asyncio.run(self.run_async())
+
+    def stop(self) -> None:
+        """
+        Stops the main loop, called by the signal handlers.
+        """
+        self._running = False
+        self.scheduler.notify()
+
+    async def run_async(self):
+        # set precision for Decimal to 8 since most numbers in binance use max 8 digits
+        getcontext().prec = 8
+
+        debug_tag = "[Startup]"
+
+        self.order_list_manager = self.create_order_list_manager()
+        self.order_list_manager.load_fulfilled_from_file()
+
+        order_fulfilled_checker = OrderFulfilledChecker(
+            self.order_list_manager,
+            on_order_filled_callback=self.on_order_filled_callback,
+            get_order_status_callback=self.get_order_status_callback_async,
+            clock=self.clock,
+        )
+
+        self.setup_firebase(debug_tag)
+        check_interval = self.get_check_interval(debug_tag)
+
+        self.bot = AsyncTradingBot(
+            use_testnet=self.config_manager.use_testnet,
+            request_weight_limit=self.config_manager.request_weight_limit,
+            price_max_age=self.config_manager.price_max_age,
+            exchange_info_ttl=self.config_manager.exchange_info_ttl,
+            api_url=self.config_manager.api_url or None,
+            clock=self.clock,
+        )
+        await self.bot.connect()
+        if self.config_manager.use_user_data_stream:
+            LOG_WARNING(debug_tag, "USE_USER_DATA_STREAM is not supported with USE_ASYNCIO, polling order status")
+        # load_and_validate_config sets the defaults of missing values
+        assert self.config_manager.max_concurrent_requests is not None
+        self.market_snapshot_fetcher = AsyncMarketSnapshotFetcher(self.bot, self.config_manager.max_concurrent_requests)
+
+        self.__install_signal_handlers()
+
+        dca_investment_strategies = self.load_investment_strategies()
+        self.bot.set_price_symbols([s.symbol for s in dca_investment_strategies])
+        self.dca_file_modification_time = self.get_dca_file_modification_time()
+
+        LOG_DEBUG(debug_tag, "Starting order fulfill checker coroutine")
+        order_fulfilled_checker_task = asyncio.ensure_future(order_fulfilled_checker.run_async())
+
+        debug_tag = "[MainLoop]"
+
+        self.schedule_investment_strategies(dca_investment_strategies, check_interval)
+        last_unfulfilled_notification = self.clock.time()
+        loop = asyncio.get_event_loop()
+        # failed cycles in a row, the requests were already retried by the transport of the bot
+        network_failures = 0
+
+        try:
+            self._running = True
+            while self._running:
+                try:
+                    if len(dca_investment_strategies) == 0:
+                        LOG_ERROR_AND_NOTIFY(
+                            debug_tag,
+                            "No DCA investment strategies found. \
+                            Please add strategies to the dca_investment_parameter.json file",
+                        )
+                        self._running = False
+                        continue
+
+                    due_strategies = self.scheduler.pop_due_strategies(self.clock.time())
+                    if len(due_strategies) > 0:
+                        LOG_INFO("----Checking if DCA investment is neccessary----")
+                        # balances are fetched once per cycle
+                        self.bot.invalidate_account_snapshot()
+                        market_snapshots = await self.market_snapshot_fetcher.fetch([s.symbol for s in due_strategies])
+                    for investment_strategy in due_strategies:
+                        market_snapshot = market_snapshots.get(investment_strategy.symbol)
+                        if market_snapshot is not None:
+                            await self.check_investment_async(investment_strategy, market_snapshot)
+                        self.schedule_investment_strategy(investment_strategy, check_interval, checked=True)
+                    network_failures = 0
+
+                    # the scheduler waits on a threading.Event, so wait in the default executor
+                    woken_up = await loop.run_in_executor(
+                        None, self.scheduler.wait_until_next_due, self.clock.time(), check_interval
+                    )
+                    if woken_up and self._running:
+                        LOG_DEBUG(debug_tag, "Woken up by event, rescheduling investment strategies")
+                        dca_investment_strategies = self.reload_investment_strategies_if_changed(
+                            dca_investment_strategies
+                        )
+                        self.schedule_investment_strategies(dca_investment_strategies, check_interval)
+
+                    # notify user if there are unfulfilled orders (at most once per check interval)
+                    if self.clock.time() - last_unfulfilled_notification >= check_interval:
+                        last_unfulfilled_notification = self.clock.time()
+                        self.notify_unfulfilled_orders(debug_tag)
+
+                except ASYNC_NETWORK_ERRORS:
+                    LOG_WARNING(debug_tag, "No Internet connection... retrying...")
+                    await self.clock.sleep_async(self.bot.transport.backoff(network_failures))
+                    network_failures += 1
+                    # strategies that were popped but not checked need to be checked again
+                    self.schedule_investment_strategies(dca_investment_strategies, check_interval)
+        except KillProcessException:
+            LOG_INFO(debug_tag, "Process killed from outside")
+        except Exception as e:
+            log_and_raise_exeption(e, raise_exception=False)
+            LOG_ERROR_AND_NOTIFY(
+                debug_tag,
+                "Error while checking if DCA investment is neccessary. \
+                    Aborting program",
+            )
+            raise e
+        finally:
+            try:
+                # store fulfilled orders in file
+                self.order_list_manager.store_orders_to_file()
+
+                LOG_INFO("Waiting for the order checker to finish, this can take a few seconds...")
+                order_fulfilled_checker.stop()
+                order_fulfilled_checker_task.cancel()
+                await asyncio.gather(order_fulfilled_checker_task, return_exceptions=True)
+                LOG_DEBUG("Order checker stopped")
+                self.order_list_manager.close()
+
+                # make sure to cancel all unfulfilled orders before closing the bot
+                await self.cancel_unfulfilled_orders_async()
+                await self.bot.close_all()
+
+                LOG_INFO("Process exited")
+                self.notify_shutdown(debug_tag)
+            except KillProcessException:
+                LOG_CRITICAL_AND_NOTIFY(
+                    debug_tag,
+                    "Process killed from outside again... just wait a god damn moment!",
+                )
+            except Exception as e:
+                log_and_raise_exeption(e)
+
+    async def cancel_unfulfilled_orders_async(self) -> None:
+        canceled = False
+        attempt = 0
+        while not canceled:
+            try:
+                LOG_INFO("Canceling all unfulfilled orders")
+                orders = list(self.order_list_manager.unfulfilled_orders())
+                results = await asyncio.gather(
+                    *[self.bot.cancel_order(order.symbol, order.orderId) for order in orders],
+                    return_exceptions=True,
+                )
+                for order, result in zip(orders, results):
+                    if isinstance(result, BinanceAPIException):
+                        LOG_ERROR_AND_NOTIFY(f"Order {order.orderId} could not be canceled")
+                        LOG_ERROR_AND_NOTIFY(result)
+                    elif isinstance(result, Exception):
+                        raise result
+                canceled = True
+            except ASYNC_NETWORK_ERRORS:
+                LOG_WARNING("[Deleting all current orders] No Internet connection... retrying...")
+                await self.clock.sleep_async(self.bot.transport.backoff(attempt))
+                attempt += 1
+
+    async def check_investment_async(
+        self, investment_strategy: DCAInvestmentParameter, market_snapshot: MarketSnapshot
+    ) -> None:
+        """
+        Same as DCAInvester.check_investment but awaits the investment order.
+        """
+        now = self.clock.now()
+        self.log_market_snapshot(now, market_snapshot)
+        if not self.investment_started(investment_strategy, now):
+            return
+
+        # invest in crypto
+        if self.should_invest(investment_strategy, now):
+            await self.invest_async(investment_strategy)
+
+        self.print_order_overview(market_snapshot)
+
+    async def invest_async(self, investment_strategy: DCAInvestmentParameter) -> None:
+        symbol = investment_strategy.symbol
+        amount = investment_strategy.investment_amount_quoteasset
+        interval = investment_strategy.interval
+        LOG_INFO(f"Defined Investment with interval ({str(datetime.timedelta(seconds=interval))}): {amount}")
+
+        new_order = await self.bot.invest_at_current_price(symbol, amount)
+        self.on_new_order_created(new_order)
+
+    async def get_order_status_callback_async(self, symbol, order_id) -> Optional[BinanceOrder]:
+        debug_tag = "[OrderFulfilledChecker Callback - get_order_status]"
+        try:
+            return await self.bot.get_order_status(symbol, order_id)
+        except ASYNC_NETWORK_ERRORS as e:
+            # the request was already retried by the transport, the checker asks again on its next check
+            LOG_WARNING_AND_NOTIFY(
+                debug_tag,
+                f"Network error while checking order status for order {symbol} {order_id}: {type(e).__name__}",
+            )
+            return None
+
+    def __install_signal_handlers(self) -> None:
+        loop = asyncio.get_event_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.stop)
+            loop.add_signal_handler(signal.SIGTERM, self.stop)
+            # SIGHUP wakes up the main loop to reload the dca investment parameter file
+            loop.add_signal_handler(signal.SIGHUP, self.scheduler.notify)
+        except (NotImplementedError, AttributeError):
+            # the event loop on windows does not support signal handlers
+            signal.signal(signal.SIGINT, signal_handler)
+            signal.signal(signal.SIGTERM, signal_handler)
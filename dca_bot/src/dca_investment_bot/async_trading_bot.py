@@ -0,0 +1,304 @@
+import asyncio
+import json
+import os
+from decimal import Decimal
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from binance import AsyncClient
+from binance.enums import ORDER_TYPE_LIMIT
+from binance.enums import SIDE_BUY
+from binance.enums import TIME_IN_FORCE_GTC
+from binance.exceptions import BinanceAPIException
+
+from dca_investment_bot.account_snapshot import AccountSnapshot
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
+from dca_investment_bot.exceptions import UnknownSymbolException
+from dca_investment_bot.exchange_info_cache import DEFAULT_EXCHANGE_INFO_TTL
+from dca_investment_bot.exchange_info_cache import ExchangeInfoCache
+from dca_investment_bot.http_transport import ASYNC_NETWORK_ERRORS
+from dca_investment_bot.http_transport import HttpTransport
+from dca_investment_bot.logger import LOG_ERROR_AND_NOTIFY
+from dca_investment_bot.logger import LOG_INFO
+from dca_investment_bot.logger import LOG_WARNING
+from dca_investment_bot.order_validator import OrderValidator
+from dca_investment_bot.price_provider import PriceProvider
+from dca_investment_bot.request_weight_limiter import DEFAULT_REQUEST_WEIGHT_LIMIT
+from dca_investment_bot.request_weight_limiter import PRIORITY_DEFAULT
+from dca_investment_bot.request_weight_limiter import RATE_LIMIT_STATUS_CODES
+from dca_investment_bot.request_weight_limiter import RequestWeightLimiter
+from dca_investment_bot.request_weight_limiter import response_headers
+from dca_investment_bot.symbol_rules import SymbolRules
+from dca_investment_bot.symbol_rules import SymbolRulesCache
+from dca_investment_bot.trading_bot import calculate_investment_order
+from dca_investment_bot.trading_bot import client_class_for_api_url
+from dca_investment_bot.trading_bot import exchange_info_filepath
+from dca_investment_bot.trading_bot import is_invalid_symbol_error
+from dca_investment_bot.trading_bot import notify_failed_investment_order
+
+"""
+Asyncio version of the TradingBot.
+Uses the AsyncClient of python-binance, all requests run on a single event loop.
+Has the same methods as the TradingBot but they have to be awaited.
+"""
+
+
+class AsyncTradingBot:
+    def __init__(
+        self,
+        use_testnet=True,
+        request_weight_limit=DEFAULT_REQUEST_WEIGHT_LIMIT,
+        price_max_age=10,
+        exchange_info_ttl=DEFAULT_EXCHANGE_INFO_TTL,
+        api_url: Optional[str] = None,
+        clock: Clock = SYSTEM_CLOCK,
+        request_weight_limiter: Optional[RequestWeightLimiter] = None,
+        transport: Optional[HttpTransport] = None,
+    ):
+        """
+        clock is used for the age of the cached account, prices and exchange info and the reconnect waits.
+        request_weight_limiter is shared with other bots using the same api key,
+        by default the bot has its own limiter with request_weight_limit.
+        transport retries idempotent requests (see HttpTransport), aiohttp pools the connections itself.
+        """
+        self.debug_tag = "[AsyncTradingBot]"
+        self.connected = False
+        self.use_testnet = use_testnet
+        self.api_url = api_url
+        self.client: Optional[AsyncClient] = None
+        self._clock = clock
+
+        if request_weight_limiter is None:
+            request_weight_limiter = RequestWeightLimiter(request_weight_limit)
+        self.request_weight_limiter = request_weight_limiter
+        self.transport = transport if transport is not None else HttpTransport()
+        # refreshed by this class with update(), see get_asset_balance and get_avg_price
+        self.account_snapshot = AccountSnapshot(clock=clock)
+        self.price_provider = PriceProvider(max_age_seconds=price_max_age, clock=clock)
+        # refreshed on lookup once it is older than exchange_info_ttl, see get_symbol_info
+        self.exchange_info_cache = ExchangeInfoCache(
+            filepath=exchange_info_filepath(use_testnet, api_url), ttl_seconds=exchange_info_ttl, clock=clock
+        )
+        self.symbol_rules = SymbolRulesCache()
+        self.exchange_info_cache.add_invalidation_listener(self.symbol_rules.invalidate)
+        # make sure concurrent lookups share a single request
+        # created in connect() so they belong to the running event loop
+        self._account_lock: Optional[asyncio.Lock] = None
+        self._price_lock: Optional[asyncio.Lock] = None
+        self._exchange_info_lock: Optional[asyncio.Lock] = None
+
+    async def connect(self):
+        # load key and secret from env and throw error if they are empty
+        key = os.environ.get("BINANCE_KEY")
+        secret = os.environ.get("BINANCE_SECRET")
+
+        if key is None or secret is None:
+            raise Exception("Binance key or secret is not set")
+
+        if self.api_url is not None:
+            LOG_INFO(self.debug_tag, f"Using {self.api_url} instead of binance")
+        elif self.use_testnet:
+            LOG_INFO(self.debug_tag, "Using testnet to connect to binance")
+        else:
+            LOG_INFO(self.debug_tag, "!!!Using MAINNET!!!")
+
+        self._account_lock = asyncio.Lock()
+        self._price_lock = asyncio.Lock()
+        self._exchange_info_lock = asyncio.Lock()
+        self.exchange_info_cache.load_from_file()
+
+        self.connected = False
+        attempt = 0
+        while not self.connected:
+            try:
+                client_class = client_class_for_api_url(AsyncClient, self.api_url)
+                self.client = await client_class.create(key, secret, testnet=self.use_testnet)
+                self.connected = True
+            except ASYNC_NETWORK_ERRORS:
+                delay = self.transport.backoff(attempt)
+                LOG_WARNING(f"No internet connection... retrying in {delay:.1f}sec..")
+                await self._clock.sleep_async(delay)
+                attempt += 1
+
+    def check_connected(self):
+        if not self.connected:
+            LOG_ERROR_AND_NOTIFY(
+                self.debug_tag,
+                "Client not connected to Binance",
+                "Please call AsyncTradingBot::connect()",
+            )
+            raise Exception("Binance client is not connected")
+
+    @staticmethod
+    def __connected_lock(lock: Optional[asyncio.Lock]) -> asyncio.Lock:
+        # the locks are created in connect() so they belong to its event loop
+        if lock is None:
+            raise Exception("Binance client is not connected")
+        return lock
+
+    async def __request(self, endpoint: str, method_name: str, priority: Optional[int] = None, **params: Any) -> Any:
+        """
+        Awaits the method of the client once the request weight of the endpoint is reserved
+        and feeds the used weight binance reports back to the limiter.
+        Idempotent requests are retried by the transport, every attempt reserves its weight.
+        """
+        self.check_connected()
+        return await self.transport.call_async(endpoint, lambda: self.__send(endpoint, method_name, priority, **params))
+
+    async def __send(self, endpoint: str, method_name: str, priority: Optional[int], **params: Any) -> Any:
+        await self.request_weight_limiter.endpoint_async(endpoint, priority)
+        try:
+            return await getattr(self.client, method_name)(**params)
+        except BinanceAPIException as e:
+            if e.status_code in RATE_LIMIT_STATUS_CODES:
+                LOG_WARNING(self.debug_tag, "Request weight limit exceeded, pausing all requests:", e)
+                self.request_weight_limiter.pause_from_headers(response_headers(e.response))
+            raise
+        finally:
+            # the client keeps the last response of any request, an outdated used weight only makes requests wait longer
+            self.request_weight_limiter.update_from_headers(response_headers(getattr(self.client, "response", None)))
+
+    async def close_all(self):
+        if self.client is not None:
+            await self.client.close_connection()
+        self.connected = False
+
+    async def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
+        """
+        Raises UnknownSymbolException if the exchange does not know the symbol.
+        """
+        self.check_connected()
+        if self.exchange_info_cache.needs_refresh(symbol):
+            async with self.__connected_lock(self._exchange_info_lock):
+                if self.exchange_info_cache.needs_refresh(symbol):
+                    self.exchange_info_cache.update(await self.__request("exchangeInfo", "get_exchange_info"))
+        # the cache has no fetch function, so this does not refresh it
+        return self.exchange_info_cache.get_symbol_info(symbol)
+
+    async def get_symbol_rules(self, symbol: str) -> SymbolRules:
+        return self.symbol_rules.get(await self.get_symbol_info(symbol))
+
+    def add_symbol_info_listener(self, listener: Callable[[List[str]], None]) -> None:
+        self.exchange_info_cache.add_invalidation_listener(listener)
+
+    async def get_order_status(self, symbol: str, order_id) -> BinanceOrder:
+        return BinanceOrder(await self.__request("order_get", "get_order", symbol=symbol, orderId=order_id))
+
+    async def create_limit_buy_order(self, symbol: str, limit, quantity) -> BinanceOrder:
+        self.check_connected()
+        # the order locks part of the quote balance
+        self.account_snapshot.invalidate()
+        return BinanceOrder(
+            await self.__request(
+                "order_post",
+                "create_order",
+                symbol=symbol,
+                side=SIDE_BUY,
+                type=ORDER_TYPE_LIMIT,
+                timeInForce=TIME_IN_FORCE_GTC,
+                quantity=quantity,
+                price=str(limit),
+            )
+        )
+
+    async def cancel_order(self, symbol, order_id) -> None:
+        self.check_connected()
+        self.account_snapshot.invalidate()
+        LOG_INFO(await self.__request("order_delete", "cancel_order", symbol=symbol, orderId=order_id))
+
+    async def get_orders(self, symbol: str, priority: int = PRIORITY_DEFAULT) -> List[BinanceOrder]:
+        """
+        Returns the open orders of the symbol.
+        Use PRIORITY_LOW if the orders are only logged.
+        """
+        return [
+            BinanceOrder(order)
+            for order in await self.__request("openOrders", "get_open_orders", priority, symbol=symbol)
+        ]
+
+    async def get_asset_balance(self, asset: str) -> Optional[Decimal]:
+        """
+        Returns the free balance of the asset, served from the account snapshot.
+        """
+        self.check_connected()
+        if not self.account_snapshot.is_valid():
+            async with self.__connected_lock(self._account_lock):
+                if not self.account_snapshot.is_valid():
+                    self.account_snapshot.update(await self.__request("account", "get_account"))
+        return self.account_snapshot.get_free_balance(asset)
+
+    def invalidate_account_snapshot(self) -> None:
+        self.account_snapshot.invalidate()
+
+    async def get_avg_price(self, symbol: str) -> Decimal:
+        """
+        Returns the current price of the symbol.
+        Prices of all configured symbols are fetched with a single ticker request.
+        Raises UnknownSymbolException if the exchange does not know the symbol
+        and PriceNotAvailableException if it returned no price for it.
+        """
+        # an unknown symbol would make binance reject the request of all symbols
+        await self.get_symbol_info(symbol)
+        if self.price_provider.needs_refresh(symbol):
+            async with self.__connected_lock(self._price_lock):
+                if self.price_provider.needs_refresh(symbol):
+                    self.price_provider.update(await self.__fetch_prices(self.price_provider.get_symbols()))
+        return self.price_provider.get_cached_price(symbol)
+
+    def set_price_symbols(self, symbols: List[str]) -> None:
+        """
+        Sets the symbols whose prices are fetched together.
+        Symbols the exchange does not know are left out once the exchange info is loaded.
+        """
+        if not self.exchange_info_cache.needs_refresh():
+            unknown_symbols = [s for s in symbols if self.exchange_info_cache.get_cached_symbol_info(s) is None]
+            for symbol in unknown_symbols:
+                LOG_WARNING(self.debug_tag, f"{UnknownSymbolException(symbol)}, its price is not fetched")
+            symbols = [s for s in symbols if s not in unknown_symbols]
+        self.price_provider.set_symbols(symbols)
+
+    async def __fetch_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        if len(symbols) == 0:
+            return {}
+        try:
+            tickers = await self.__request(
+                "tickerPrice", "get_symbol_ticker", symbols=json.dumps(symbols, separators=(",", ":"))
+            )
+        except BinanceAPIException as e:
+            if not is_invalid_symbol_error(e):
+                raise
+            # a symbol was delisted after the exchange info was fetched, fetch the prices one by one
+            LOG_WARNING(self.debug_tag, "Ticker request of all symbols rejected, fetching them one by one:", e)
+            tickers = []
+            for symbol in symbols:
+                try:
+                    tickers.append(await self.__request("tickerPrice_symbol", "get_symbol_ticker", symbol=symbol))
+                except BinanceAPIException as symbol_error:
+                    if not is_invalid_symbol_error(symbol_error):
+                        raise
+                    LOG_WARNING(self.debug_tag, f"Ticker request of {symbol} rejected:", symbol_error)
+        return {ticker["symbol"]: Decimal(ticker["price"]) for ticker in tickers}
+
+    async def cancel_all_orders_for_symbol(self, symbol: str) -> None:
+        orders = await self.get_orders(symbol)
+        await asyncio.gather(*[self.cancel_order(symbol, order.orderId) for order in orders])
+
+    async def invest_at_current_price(self, symbol: str, quote_amount: Decimal) -> Optional[BinanceOrder]:
+        price, symbol_rules = await asyncio.gather(self.get_avg_price(symbol), self.get_symbol_rules(symbol))
+        amount, price = calculate_investment_order(symbol_rules, quote_amount, price)
+        LOG_INFO(f"Investing {amount} at price {price} for {symbol}")
+        try:
+            quote_balance = await self.get_asset_balance(symbol_rules.quote_asset)
+            if OrderValidator.check_order_possible(symbol_rules, quote_balance, symbol, amount, price):
+                return await self.create_limit_buy_order(symbol, price, amount)
+            else:
+                LOG_ERROR_AND_NOTIFY(self.debug_tag, "Investment not possible")
+        except BinanceAPIException as e:
+            notify_failed_investment_order(self.debug_tag, symbol, amount, price, e)
+
+        return None
@@ -0,0 +1,343 @@
+import heapq
+import math
+import os
+from decimal import Decimal
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+from dca_investment_bot.batch_order_validator import BatchOrderValidator
+from dca_investment_bot.batch_order_validator import ValidationReason
+from dca_investment_bot.dca_investment_parameter import DCAInvestmentParameter
+from dca_investment_bot.symbol_rules import SymbolRules
+
+"""
+Replays historical klines through a DCA investment strategy to evaluate it before investing real money.
+
+Uses the same rules as DCAInvester.should_invest: the first investment is at start_date + investment_time
+(or at the start of the klines if they start later), the next one at midnight of the day of the last
+investment + interval, at investment_time (see DCAInvestmentParameter.next_investment_timestamp).
+No new order is placed while the last one is not filled, if it fills after the next scheduled time
+the next order is placed right after the fill.
+Orders are sized and rounded like TradingBot.invest_at_current_price and validated with the
+rules of the OrderValidator (see BatchOrderValidator).
+The order columns are computed with numpy for all klines at once, only the schedule is stepped through.
+
+Simplifications:
+- the price of an investment is the open price of the kline containing the investment time,
+  use klines with a short interval (e.g. 1h) for more accurate prices
+- a limit order fills at the first kline whose low reaches the limit price,
+  orders that never fill are counted as unfilled and stop the strategy
+- a filled order costs amount * min(limit price, price), fees are not included
+- an order is only placed if the quote balance covers amount * limit price (it is locked until the fill)
+- the bot retries a rejected investment (exchange rules or balance) every check interval,
+  the backtest retries it at the next scheduled time
+
+Requires numpy (pip install .[analytics]), parquet files require pyarrow (pip install .[arrow]).
+"""
+
+KLINE_COLUMNS = ("open_time", "open", "high", "low", "close")
+
+
+class Klines:
+    """
+    Columns of a kline file, open_time in milliseconds, sorted by open_time.
+    """
+
+    def __init__(
+        self, open_time: np.ndarray, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray
+    ) -> None:
+        self.open_time = open_time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    def kline_duration(self) -> int:
+        """
+        Returns the duration of a kline in milliseconds.
+        """
+        if len(self) < 2:
+            return 0
+        return int(np.median(np.diff(self.open_time)))
+
+    def end_time(self) -> int:
+        return int(self.open_time[-1]) + self.kline_duration()
+
+
+def load_klines(filepath: str) -> Klines:
+    """
+    Loads klines from a csv file in the format of the binance kline downloads
+    (open_time, open, high, low, close, ... with or without header) or a parquet file
+    with the columns open_time, open, high, low and close.
+    """
+    if os.path.splitext(filepath)[1].lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(filepath, columns=list(KLINE_COLUMNS))
+        columns = [table.column(name).to_numpy() for name in KLINE_COLUMNS]
+    else:
+        with open(filepath) as f:
+            first_line = f.readline()
+        has_header = len(first_line) > 0 and not first_line.lstrip()[:1].isdigit()
+        data = np.loadtxt(filepath, delimiter=",", usecols=range(5), skiprows=1 if has_header else 0, ndmin=2)
+        columns = [data[:, i] for i in range(5)]
+
+    open_time = np.asarray(columns[0], dtype=np.int64)
+    # newer binance downloads use microseconds
+    if len(open_time) > 0 and open_time[0] > 10**14:
+        open_time = open_time // 1000
+    order = np.argsort(open_time, kind="stable")
+    return Klines(open_time[order], *[np.asarray(c, dtype=np.float64)[order] for c in columns[1:]])
+
+
+class BacktestResult:
+    """
+    Columns per scheduled investment and the summary of the backtest.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        times: np.ndarray,
+        prices: np.ndarray,
+        limit_prices: np.ndarray,
+        amounts: np.ndarray,
+        reasons: np.ndarray,
+        filled: np.ndarray,
+        fill_prices: np.ndarray,
+        final_price: float,
+    ) -> None:
+        self.symbol = symbol
+        self.times = times
+        self.prices = prices
+        self.limit_prices = limit_prices
+        self.amounts = amounts
+        self.reasons = reasons
+        self.filled = filled
+        self.fill_prices = fill_prices
+        self.final_price = final_price
+
+        self.fill_count = int(np.count_nonzero(filled))
+        self.base_amount = float(amounts[filled].sum())
+        self.invested_quote = float((amounts[filled] * fill_prices[filled]).sum())
+        self.avg_cost = self.invested_quote / self.base_amount if self.base_amount > 0 else 0.0
+        self.final_value = self.base_amount * final_price
+        self.pnl = self.final_value - self.invested_quote
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "investments": len(self.times),
+            "fills": self.fill_count,
+            "invested_quote": self.invested_quote,
+            "base_amount": self.base_amount,
+            "avg_cost": self.avg_cost,
+            "final_price": self.final_price,
+            "final_value": self.final_value,
+            "pnl": self.pnl,
+        }
+
+
+class Backtester:
+    def __init__(self, klines: Klines, symbol_rules: SymbolRules, quote_balance: Optional[float] = None) -> None:
+        """
+        quote_balance is the free balance of the quote asset at the start, None for an unlimited balance.
+        """
+        self._klines = klines
+        self._symbol_rules = symbol_rules
+        self._quote_balance = quote_balance
+
+    def run(self, strategy: DCAInvestmentParameter, end_time: Optional[int] = None) -> BacktestResult:
+        """
+        Runs the strategy over the klines until end_time (milliseconds) or the end of the klines.
+        """
+        return run_backtests([(self, strategy)], self._quote_balance, end_time)[0]
+
+
+def run_backtests(
+    runs: Sequence[Tuple[Backtester, DCAInvestmentParameter]],
+    quote_balance: Optional[float] = None,
+    end_time: Optional[int] = None,
+) -> List[BacktestResult]:
+    """
+    Runs the strategies side by side in time order until end_time (milliseconds) or the end of their klines.
+    They share one quote balance (None for an unlimited balance), like strategies of the bot with the same quote asset.
+    The quote balances of the backtesters are not used.
+    """
+    balance = math.inf if quote_balance is None else float(quote_balance)
+    strategy_runs = [_StrategyRun(backtester, strategy, end_time) for backtester, strategy in runs]
+    # (time, fills before orders placed at the same time, index of the run)
+    events: List[Tuple[int, int, int]] = []
+    for index, strategy_run in enumerate(strategy_runs):
+        _push_next_event(events, strategy_run, index)
+    while len(events) > 0:
+        _, _, index = heapq.heappop(events)
+        balance = strategy_runs[index].handle_next_event(balance)
+        _push_next_event(events, strategy_runs[index], index)
+    return [strategy_run.result() for strategy_run in strategy_runs]
+
+
+def _push_next_event(events: List[Tuple[int, int, int]], strategy_run: "_StrategyRun", index: int) -> None:
+    next_event = strategy_run.next_event()
+    if next_event is not None:
+        heapq.heappush(events, next_event + (index,))
+
+
+class _StrategyRun:
+    """
+    State of one strategy in run_backtests: the next investment time and the open order.
+    """
+
+    FILL = 0
+    ORDER = 1
+
+    def __init__(self, backtester: Backtester, strategy: DCAInvestmentParameter, end_time: Optional[int]) -> None:
+        klines = backtester._klines
+        rules = backtester._symbol_rules
+        self._klines = klines
+        self._symbol_rules = rules
+        self._strategy = strategy
+        self._data_end = klines.end_time() if end_time is None else min(end_time, klines.end_time())
+        # klines that start before the end
+        self._kline_count = int(np.searchsorted(klines.open_time, self._data_end, side="left"))
+
+        # order of every kline, validated against the exchange rules only, the balance is checked on placement
+        prices = klines.open[: self._kline_count]
+        self._limit_prices, self._amounts = _order_columns(
+            rules, Decimal(str(strategy.investment_amount_quoteasset)), prices
+        )
+        self._reasons = BatchOrderValidator.validate(
+            np.full(self._kline_count, rules.symbol),
+            self._amounts,
+            self._limit_prices,
+            {rules.symbol: rules},
+            {rules.quote_asset: math.inf},
+        )
+
+        first = int((strategy.start_date + strategy.investment_time) * 1000)
+        self._next_time: Optional[int] = max(first, int(klines.open_time[0])) if len(klines) > 0 else None
+        # row and fill time of the order that is not filled yet
+        self._open_order: Optional[Tuple[int, Optional[int]]] = None
+
+        self._times: List[int] = []
+        self._kline_indexes: List[int] = []
+        self._order_reasons: List[int] = []
+        self._filled: List[bool] = []
+
+    def next_event(self) -> Optional[Tuple[int, int]]:
+        """
+        Returns (time, FILL or ORDER) of the next event or None if the strategy is done.
+        """
+        if self._open_order is not None:
+            _, fill_time = self._open_order
+            # an order that never fills blocks the strategy until the end
+            return (fill_time, self.FILL) if fill_time is not None else None
+        if self._next_time is not None and self._next_time < self._data_end:
+            return (self._next_time, self.ORDER)
+        return None
+
+    def handle_next_event(self, balance: float) -> float:
+        """
+        Places or fills the order of the next event, returns the remaining balance.
+        """
+        if self._open_order is not None:
+            return self.__fill(balance)
+        return self.__place_order(balance)
+
+    def result(self) -> BacktestResult:
+        kline_indexes = np.array(self._kline_indexes, dtype=np.int64)
+        prices = self._klines.open[kline_indexes]
+        limit_prices = self._limit_prices[kline_indexes]
+        final_index = max(0, self._kline_count - 1)
+        return BacktestResult(
+            self._symbol_rules.symbol,
+            np.array(self._times, dtype=np.int64),
+            prices,
+            limit_prices,
+            self._amounts[kline_indexes],
+            np.array(self._order_reasons, dtype=np.int8),
+            np.array(self._filled, dtype=bool),
+            np.minimum(limit_prices, prices),
+            float(self._klines.close[final_index]) if len(self._klines) > 0 else 0.0,
+        )
+
+    def __place_order(self, balance: float) -> float:
+        assert self._next_time is not None
+        time = self._next_time
+        kline_index = int(np.searchsorted(self._klines.open_time, time, side="right")) - 1
+        limit_price = float(self._limit_prices[kline_index])
+        cost = float(self._amounts[kline_index]) * limit_price
+        reason = int(self._reasons[kline_index])
+        if reason == ValidationReason.OK and cost > balance:
+            reason = ValidationReason.NOT_ENOUGH_BALANCE
+
+        self._times.append(time)
+        self._kline_indexes.append(kline_index)
+        self._order_reasons.append(reason)
+        self._filled.append(False)
+        # the time of the last order is the creation time, not the fill time (like BinanceOrder.time)
+        self._next_time = int(round(self._strategy.next_investment_timestamp(time / 1000) * 1000))
+        if reason != ValidationReason.OK:
+            return balance
+
+        fill_index = _first_index_at_or_below(self._klines.low, kline_index, self._kline_count, limit_price)
+        fill_time = max(time, int(self._klines.open_time[fill_index])) if fill_index is not None else None
+        self._open_order = (len(self._times) - 1, fill_time)
+        # the limit order locks its quote amount until it is filled
+        return balance - cost
+
+    def __fill(self, balance: float) -> float:
+        assert self._open_order is not None
+        row, fill_time = self._open_order
+        assert fill_time is not None
+        self._open_order = None
+        self._filled[row] = True
+        kline_index = self._kline_indexes[row]
+        amount = float(self._amounts[kline_index])
+        limit_price = float(self._limit_prices[kline_index])
+        fill_price = min(limit_price, float(self._klines.open[kline_index]))
+        # the bot invests right after the fill if the next investment time already passed
+        assert self._next_time is not None
+        self._next_time = max(self._next_time, fill_time)
+        return balance + amount * (limit_price - fill_price)
+
+
+def _first_index_at_or_below(values: np.ndarray, start: int, end: int, limit: float) -> Optional[int]:
+    """
+    Returns the first index in [start, end) with values[index] <= limit or None.
+    Searches in growing chunks, most orders fill within a few klines.
+    """
+    chunk_size = 64
+    while start < end:
+        stop = min(end, start + chunk_size)
+        hits = np.flatnonzero(values[start:stop] <= limit)
+        if len(hits) > 0:
+            return start + int(hits[0])
+        start = stop
+        chunk_size *= 2
+    return None
+
+
+def _order_columns(rules: SymbolRules, quote_amount: Decimal, prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized calculate_investment_order: the amount is rounded to the step size,
+    the price is rounded to 10 and then to the tick size.
+    """
+    amounts = float(quote_amount) / prices
+    if rules.step_size is not None:
+        step_size = float(rules.step_size)
+        amounts = np.rint(amounts / step_size) * step_size
+    limit_prices = np.rint(prices / 10) * 10
+    if rules.tick_size is not None:
+        tick_size = float(rules.tick_size)
+        limit_prices = np.rint(limit_prices / tick_size) * tick_size
+    return limit_prices, amounts
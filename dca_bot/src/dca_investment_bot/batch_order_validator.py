@@ -0,0 +1,153 @@
+from decimal import Decimal
+from enum import IntEnum
+from typing import Any
+from typing import Dict
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+import numpy as np
+
+from dca_investment_bot.symbol_rules import SymbolRules
+
+"""
+Validates many candidate orders at once, e.g. to size a new set of strategies.
+Uses the same checks as the OrderValidator but works on columns of
+symbols, amounts and prices and returns a reason code per order
+instead of logging and notifying every failure.
+
+Amounts and prices are floats, so step sizes are checked with a small tolerance.
+Requires numpy (pip install .[analytics]).
+"""
+
+# allowed deviation from a multiple of the tick/step size, in units of the step size
+STEP_TOLERANCE = 1e-6
+
+
+class ValidationReason(IntEnum):
+    OK = 0
+    UNKNOWN_SYMBOL = 1
+    NO_BALANCE = 2
+    NOT_ENOUGH_BALANCE = 3
+    NO_PRICE_FILTER = 4
+    PRICE_OUT_OF_RANGE = 5
+    PRICE_TICK_SIZE = 6
+    NO_LOT_FILTER = 7
+    AMOUNT_OUT_OF_RANGE = 8
+    AMOUNT_STEP_SIZE = 9
+    NO_NOTIONAL_FILTER = 10
+    NOTIONAL_OUT_OF_RANGE = 11
+
+
+def _to_float(value: Optional[Decimal], default: float) -> float:
+    return float(value) if value is not None else default
+
+
+class BatchOrderValidator:
+    @staticmethod
+    def validate(
+        symbols: Union[Sequence[str], "np.ndarray[Any, Any]"],
+        amounts: Union[Sequence[float], "np.ndarray[Any, Any]"],
+        prices: Union[Sequence[float], "np.ndarray[Any, Any]"],
+        symbol_rules: Mapping[str, SymbolRules],
+        quote_balances: Mapping[str, Union[Decimal, float]],
+    ) -> "np.ndarray[Any, Any]":
+        """
+        Returns an int8 array with the ValidationReason of every order.
+        symbol_rules maps the symbols to their rules, quote_balances maps the quote assets to the free balance.
+        The reason is the first check that failed, in the same order as OrderValidator.check_order_possible.
+        """
+        symbol_column = np.asarray(symbols)
+        amount_column = np.asarray(amounts, dtype=np.float64)
+        price_column = np.asarray(prices, dtype=np.float64)
+        if not (len(symbol_column) == len(amount_column) == len(price_column)):
+            raise ValueError("symbols, amounts and prices must have the same length")
+
+        reasons = np.zeros(len(symbol_column), dtype=np.int8)
+        if len(symbol_column) == 0:
+            return reasons
+
+        # the rules are looked up once per symbol and broadcast to all orders of that symbol
+        unique_symbols, inverse = np.unique(symbol_column, return_inverse=True)
+        columns = BatchOrderValidator.__rule_columns(unique_symbols, symbol_rules, quote_balances)
+        rows: Dict[str, "np.ndarray[Any, Any]"] = {name: column[inverse] for name, column in columns.items()}
+
+        notional = amount_column * price_column
+        price_steps = np.divide(
+            price_column, rows["tick_size"], out=np.zeros_like(price_column), where=rows["tick_size"] > 0
+        )
+        amount_steps = np.divide(
+            amount_column, rows["step_size"], out=np.zeros_like(amount_column), where=rows["step_size"] > 0
+        )
+
+        # ordered by priority, the first failed check wins
+        checks = [
+            (ValidationReason.UNKNOWN_SYMBOL, ~rows["known"]),
+            (ValidationReason.NO_BALANCE, np.isnan(rows["quote_balance"])),
+            (ValidationReason.NOT_ENOUGH_BALANCE, rows["quote_balance"] < amount_column),
+            (ValidationReason.NO_PRICE_FILTER, ~rows["has_price_filter"]),
+            (
+                ValidationReason.PRICE_OUT_OF_RANGE,
+                (price_column < rows["min_price"]) | (price_column > rows["max_price"]),
+            ),
+            (ValidationReason.PRICE_TICK_SIZE, np.abs(price_steps - np.rint(price_steps)) > STEP_TOLERANCE),
+            (ValidationReason.NO_LOT_FILTER, ~rows["has_lot_filter"]),
+            (
+                ValidationReason.AMOUNT_OUT_OF_RANGE,
+                (amount_column < rows["min_qty"]) | (amount_column > rows["max_qty"]),
+            ),
+            (ValidationReason.AMOUNT_STEP_SIZE, np.abs(amount_steps - np.rint(amount_steps)) > STEP_TOLERANCE),
+            (ValidationReason.NO_NOTIONAL_FILTER, ~rows["has_notional_filter"]),
+            (
+                ValidationReason.NOTIONAL_OUT_OF_RANGE,
+                (notional < rows["min_notional"]) | (notional > rows["max_notional"]),
+            ),
+        ]
+        # apply the lowest priority first so higher priority checks overwrite it
+        for reason, failed in reversed(checks):
+            reasons[failed] = reason
+        return reasons
+
+    @staticmethod
+    def __rule_columns(
+        unique_symbols: "np.ndarray[Any, Any]",
+        symbol_rules: Mapping[str, SymbolRules],
+        quote_balances: Mapping[str, Union[Decimal, float]],
+    ) -> Dict[str, "np.ndarray[Any, Any]"]:
+        count = len(unique_symbols)
+        columns: Dict[str, "np.ndarray[Any, Any]"] = {
+            "known": np.zeros(count, dtype=bool),
+            "quote_balance": np.full(count, np.nan),
+            "has_price_filter": np.zeros(count, dtype=bool),
+            "min_price": np.full(count, -np.inf),
+            "max_price": np.full(count, np.inf),
+            "tick_size": np.zeros(count),
+            "has_lot_filter": np.zeros(count, dtype=bool),
+            "min_qty": np.full(count, -np.inf),
+            "max_qty": np.full(count, np.inf),
+            "step_size": np.zeros(count),
+            "has_notional_filter": np.zeros(count, dtype=bool),
+            "min_notional": np.full(count, -np.inf),
+            "max_notional": np.full(count, np.inf),
+        }
+        for index, symbol in enumerate(unique_symbols):
+            rules = symbol_rules.get(str(symbol))
+            if rules is None:
+                continue
+            columns["known"][index] = True
+            balance = quote_balances.get(rules.quote_asset)
+            if balance is not None:
+                columns["quote_balance"][index] = float(balance)
+            columns["has_price_filter"][index] = rules.has_price_filter
+            columns["min_price"][index] = _to_float(rules.min_price, -np.inf)
+            columns["max_price"][index] = _to_float(rules.max_price, np.inf)
+            columns["tick_size"][index] = _to_float(rules.tick_size, 0)
+            columns["has_lot_filter"][index] = rules.has_lot_filter
+            columns["min_qty"][index] = _to_float(rules.min_qty, -np.inf)
+            columns["max_qty"][index] = _to_float(rules.max_qty, np.inf)
+            columns["step_size"][index] = _to_float(rules.step_size, 0)
+            columns["has_notional_filter"][index] = rules.has_notional_filter
+            columns["min_notional"][index] = _to_float(rules.min_notional, -np.inf)
+            columns["max_notional"][index] = _to_float(rules.max_notional, np.inf)
+        return columns
@@ -0,0 +1,396 @@
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from decimal import getcontext
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from binance.enums import ORDER_STATUS_FILLED
+from binance.enums import ORDER_TYPE_LIMIT
+from binance.enums import SIDE_BUY
+from binance.enums import TIME_IN_FORCE_GTC
+
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
+from dca_investment_bot.clock import VirtualClock
+from dca_investment_bot.config_manager import ConfigManager
+from dca_investment_bot.DCAInvester import DCAInvester
+from dca_investment_bot.dca_investment_parameter import DCAInvestmentParameter
+from dca_investment_bot.exchange_simulator import MatchingEngine
+from dca_investment_bot.exchange_simulator import SimulatedClient
+from dca_investment_bot.exchange_simulator import SimulatedSymbol
+from dca_investment_bot.market_snapshot import MarketSnapshotFetcher
+from dca_investment_bot.order_fulfilled_checker_thread import OrderFulfilledChecker
+from dca_investment_bot.order_list_manager import OrderListManager
+from dca_investment_bot.order_poll_schedule import MAX_POLL_INTERVAL
+from dca_investment_bot.order_validator import OrderValidator
+from dca_investment_bot.trading_bot import TradingBot
+
+"""
+Benchmarks of the hot paths of the bot:
+- main_loop_cycle: one cycle of the main loop (check_due_strategies) in which every strategy invests
+- check_order_possible: validation of one order against the symbol rules
+- order_list_manager_load / order_list_manager_store: reading and writing the order file
+- binance_order_construction / binance_order_formatting: BinanceOrder from a binance json object and back
+- order_checker_status_iteration / order_checker_poll_iteration: one iteration of the OrderFulfilledChecker
+  that requests the status of every order or polls the open orders per symbol
+
+The bot talks to a SimulatedClient (no network, no api key), so the timings include the matching engine
+but no network latency. Only the benchmarked call is timed, the setup of every repetition is not.
+
+The results are written to a json file, compare_results reports the benchmarks that got slower than a baseline:
+python -m dca_investment_bot.benchmark --output benchmark.json --baseline benchmark_before.json
+The exit code is 1 if a benchmark regressed.
+"""
+
+DEFAULT_STRATEGY_COUNTS = [10, 100, 1000]
+DEFAULT_ORDER_COUNTS = [10000, 100000, 1000000]
+DEFAULT_REPEAT = 5
+# a benchmark regressed if its fastest run is this much slower than in the baseline
+DEFAULT_REGRESSION_TOLERANCE = 0.2
+
+BENCHMARK_START_TIME = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+BENCHMARK_QUOTE_ASSET = "USDT"
+BENCHMARK_PRICE = Decimal("1000")
+
+
+def measure(
+    function: Callable[[], Any],
+    repeat: int = DEFAULT_REPEAT,
+    setup: Optional[Callable[[], Any]] = None,
+    teardown: Optional[Callable[[], Any]] = None,
+    operations: int = 1,
+) -> Dict[str, Any]:
+    """
+    Runs setup, function and teardown repeat times and returns the timings of function in seconds.
+    operations is the number of operations one call of function does, e.g. the number of orders.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        try:
+            started_at = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started_at)
+        finally:
+            if teardown is not None:
+                teardown()
+    return {
+        "repeat": repeat,
+        "operations": operations,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "max": max(timings),
+        "per_operation": min(timings) / operations,
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = DEFAULT_REGRESSION_TOLERANCE
+) -> List[str]:
+    """
+    Compares the fastest runs of the benchmarks both result files contain.
+    Returns a message for every benchmark that got more than tolerance (0.2 = 20%) slower.
+    """
+    regressions = []
+    baseline_benchmarks = baseline["benchmarks"]
+    for name, result in current["benchmarks"].items():
+        if name not in baseline_benchmarks:
+            continue
+        before = baseline_benchmarks[name]["min"]
+        after = result["min"]
+        if after > before * (1 + tolerance):
+            regressions.append(f"{name}: {before:.6f}s -> {after:.6f}s ({(after / before - 1) * 100:+.0f}%)")
+    return regressions
+
+
+def run_benchmarks(
+    strategy_counts: Sequence[int] = DEFAULT_STRATEGY_COUNTS,
+    order_counts: Sequence[int] = DEFAULT_ORDER_COUNTS,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict[str, Any]:
+    """
+    Runs all benchmarks and returns the results (see write_results).
+    The order files are written to a temporary directory.
+    """
+    # same precision as the main thread of the bot
+    getcontext().prec = 8
+    benchmarks: Dict[str, Dict[str, Any]] = {}
+    directory = tempfile.mkdtemp(prefix="dca_benchmark_")
+    try:
+        for strategy_count in strategy_counts:
+            benchmarks[f"main_loop_cycle[{strategy_count}]"] = benchmark_main_loop_cycle(
+                strategy_count, repeat, directory
+            )
+            benchmarks[f"order_checker_status_iteration[{strategy_count}]"] = benchmark_order_checker_iteration(
+                strategy_count, repeat, directory, poll_open_orders=False
+            )
+            benchmarks[f"order_checker_poll_iteration[{strategy_count}]"] = benchmark_order_checker_iteration(
+                strategy_count, repeat, directory, poll_open_orders=True
+            )
+        benchmarks["check_order_possible"] = benchmark_check_order_possible(repeat)
+        benchmarks["binance_order_construction"] = benchmark_binance_order_construction(repeat)
+        benchmarks["binance_order_formatting"] = benchmark_binance_order_formatting(repeat)
+        for order_count in order_counts:
+            benchmarks.update(benchmark_order_list_manager(order_count, repeat, directory))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": benchmarks,
+    }
+
+
+def write_results(results: Dict[str, Any], filepath: str) -> None:
+    with open(filepath, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def read_results(filepath: str) -> Dict[str, Any]:
+    with open(filepath) as f:
+        results: Dict[str, Any] = json.load(f)
+    return results
+
+
+def benchmark_main_loop_cycle(strategy_count: int, repeat: int, directory: str) -> Dict[str, Any]:
+    """
+    One main loop cycle in which strategy_count strategies of different symbols are due and invest.
+    Every repetition starts without orders.
+    """
+    state: Dict[str, _BenchmarkInvester] = {}
+
+    def setup() -> None:
+        invester = _BenchmarkInvester(create_engine(strategy_count))
+        invester.order_list_manager = OrderListManager(os.path.join(directory, "main_loop_orders.json"))
+        invester.bot = invester.create_trading_bot()
+        invester.bot.connect()
+        invester.market_snapshot_fetcher = MarketSnapshotFetcher(invester.bot)
+        strategies = [
+            DCAInvestmentParameter(
+                {
+                    "symbol": symbol,
+                    "investment_amount_quoteasset": 100,
+                    "interval": "1d",
+                    "investment_time": "00:00",
+                    "start_date": "2021-01-01",
+                },
+                invester.clock,
+            )
+            for symbol in invester.engine.symbols()
+        ]
+        invester.schedule_investment_strategies(strategies, 3600)
+        state["invester"] = invester
+
+    def teardown() -> None:
+        state["invester"].bot.close_all()
+
+    return measure(
+        lambda: state["invester"].check_due_strategies(3600),
+        repeat,
+        setup=setup,
+        teardown=teardown,
+        operations=strategy_count,
+    )
+
+
+def benchmark_order_checker_iteration(
+    order_count: int, repeat: int, directory: str, poll_open_orders: bool
+) -> Dict[str, Any]:
+    """
+    One iteration of the OrderFulfilledChecker with order_count resting orders, 10 orders per symbol.
+    Without poll_open_orders the status of every order is requested,
+    with poll_open_orders the open orders of every symbol are requested (all symbols are due).
+    """
+    clock = VirtualClock(BENCHMARK_START_TIME)
+    engine = create_engine(max(1, order_count // 10), time_function=clock.time)
+    bot = create_trading_bot(engine, clock)
+    bot.connect()
+    order_list_manager = OrderListManager(os.path.join(directory, "checker_orders.json"))
+    symbols = engine.symbols()
+    for index in range(order_count):
+        # far below the price, so the orders never fill
+        order_list_manager.add_new_order(
+            bot.create_limit_buy_order(symbols[index % len(symbols)], BENCHMARK_PRICE / 2, Decimal("0.1"))
+        )
+    checker = OrderFulfilledChecker(
+        order_list_manager,
+        on_order_filled_callback=None,
+        get_order_status_callback=bot.get_order_status,
+        get_open_orders_callback=bot.get_orders if poll_open_orders else None,
+        clock=clock,
+    )
+    try:
+        return measure(
+            checker.check_unfulfilled_orders,
+            repeat,
+            # every symbol is due to be polled again
+            setup=lambda: clock.advance(MAX_POLL_INTERVAL),
+            operations=order_count,
+        )
+    finally:
+        bot.close_all()
+
+
+def benchmark_check_order_possible(repeat: int, calls: int = 10000) -> Dict[str, Any]:
+    engine = create_engine(1)
+    bot = create_trading_bot(engine)
+    bot.connect()
+    try:
+        symbol = engine.symbols()[0]
+        symbol_rules = bot.get_symbol_rules(symbol)
+        quote_balance = Decimal("1000000")
+        amount = Decimal("0.1")
+
+        def check_orders() -> None:
+            for _ in range(calls):
+                OrderValidator.check_order_possible(symbol_rules, quote_balance, symbol, amount, BENCHMARK_PRICE)
+
+        return measure(check_orders, repeat, operations=calls)
+    finally:
+        bot.close_all()
+
+
+def benchmark_binance_order_construction(repeat: int, count: int = 10000) -> Dict[str, Any]:
+    order_objects = create_order_objects(count)
+    return measure(lambda: [BinanceOrder(o) for o in order_objects], repeat, operations=count)
+
+
+def benchmark_binance_order_formatting(repeat: int, count: int = 10000) -> Dict[str, Any]:
+    """
+    Formats the orders like the order file (asDict) and the logs and notifications (to_info_string).
+    """
+    orders = [BinanceOrder(o) for o in create_order_objects(count)]
+
+    def format_orders() -> None:
+        for order in orders:
+            order.asDict()
+            order.to_info_string()
+
+    return measure(format_orders, repeat, operations=count)
+
+
+def benchmark_order_list_manager(order_count: int, repeat: int, directory: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Loads and stores an order file with order_count fulfilled orders.
+    """
+    order_filepath = os.path.join(directory, f"orders_{order_count}.json")
+    with open(order_filepath, "w") as f:
+        json.dump(create_order_objects(order_count), f)
+    state: Dict[str, OrderListManager] = {}
+
+    def load() -> None:
+        state["order_list_manager"] = OrderListManager(order_filepath)
+        state["order_list_manager"].load_fulfilled_from_file()
+
+    results = {f"order_list_manager_load[{order_count}]": measure(load, repeat, operations=order_count)}
+    results[f"order_list_manager_store[{order_count}]"] = measure(
+        state["order_list_manager"].store_orders_to_file, repeat, operations=order_count
+    )
+    os.remove(order_filepath)
+    return results
+
+
+def create_engine(
+    symbol_count: int, time_function: Callable[[], float] = lambda: BENCHMARK_START_TIME
+) -> MatchingEngine:
+    symbols = [
+        SimulatedSymbol(f"COIN{i}{BENCHMARK_QUOTE_ASSET}", f"COIN{i}", BENCHMARK_QUOTE_ASSET, BENCHMARK_PRICE)
+        for i in range(symbol_count)
+    ]
+    return MatchingEngine(symbols, {BENCHMARK_QUOTE_ASSET: "1000000000"}, time_function=time_function)
+
+
+def create_trading_bot(engine: MatchingEngine, clock: Clock = SYSTEM_CLOCK) -> TradingBot:
+    # the weight limit of binance would make the benchmarks measure the waits of the limiter
+    return TradingBot(request_weight_limit=sys.maxsize, client=SimulatedClient(engine), clock=clock)
+
+
+def create_order_objects(count: int) -> List[Dict[str, Any]]:
+    """
+    Returns count filled limit buy orders as returned by binance.
+    """
+    order_time = int(BENCHMARK_START_TIME * 1000)
+    return [
+        {
+            "symbol": f"COIN{i % 100}{BENCHMARK_QUOTE_ASSET}",
+            "orderId": i + 1,
+            "orderListId": -1,
+            "clientOrderId": f"benchmark{i}",
+            "price": "1000.00000000",
+            "origQty": "0.10000000",
+            "executedQty": "0.10000000",
+            "cummulativeQuoteQty": "100.00000000",
+            "status": ORDER_STATUS_FILLED,
+            "timeInForce": TIME_IN_FORCE_GTC,
+            "type": ORDER_TYPE_LIMIT,
+            "side": SIDE_BUY,
+            "stopPrice": "0.00000000",
+            "icebergQty": "0.00000000",
+            "time": order_time + i * 60000,
+            "updateTime": order_time + i * 60000,
+            "isWorking": True,
+            "origQuoteOrderQty": "0.00000000",
+        }
+        for i in range(count)
+    ]
+
+
+class _BenchmarkInvester(DCAInvester):
+    def __init__(self, engine: MatchingEngine) -> None:
+        config_manager = ConfigManager()
+        config_manager.use_testnet = True
+        config_manager.max_concurrent_requests = 5
+        super().__init__(config_manager)
+        self.engine = engine
+
+    def create_trading_bot(self) -> TradingBot:
+        return create_trading_bot(self.engine, self.clock)
+
+
+def main() -> None:
+    import argparse
+
+    from dca_investment_bot.logger import init_logger
+
+    parser = argparse.ArgumentParser(description="Benchmarks the hot paths of the DCA bot")
+    parser.add_argument("--output", default="benchmark.json", help="json file the results are written to")
+    parser.add_argument("--baseline", help="results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_REGRESSION_TOLERANCE)
+    parser.add_argument("--strategies", type=int, nargs="+", default=DEFAULT_STRATEGY_COUNTS)
+    parser.add_argument("--orders", type=int, nargs="+", default=DEFAULT_ORDER_COUNTS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--log-level", default="WARNING", help="log level of the bot during the benchmarks")
+    args = parser.parse_args()
+
+    init_logger(args.log_level, "benchmark.log")
+    results = run_benchmarks(args.strategies, args.orders, args.repeat)
+    write_results(results, args.output)
+    for name, result in results["benchmarks"].items():
+        print(f"{name:45} {result['min']:12.6f}s {result['per_operation'] * 1e6:12.2f}us/op")
+
+    if args.baseline is not None:
+        regressions = compare_results(read_results(args.baseline), results, args.tolerance)
+        for regression in regressions:
+            print("Regression:", regression)
+        if len(regressions) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
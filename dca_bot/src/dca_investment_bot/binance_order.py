@@ -3,87 +3,120 @@ import typing
 from decimal import Decimal
 from typing import Any
 from typing import Optional
+from typing import Tuple
 
 
 class BinanceOrder:
     """
     Used to represent a Binance json order object
+
+    Uses __slots__ to keep large order histories small in memory.
+    The numeric fields are kept as the strings returned by binance and are only
+    converted to Decimal when needed (e.g. price_decimal), the result is cached.
+    Orders are treated as immutable after creation.
+    Two orders are equal if they have the same symbol and orderId (binance order ids are unique per symbol).
     """
 
+    __slots__ = (
+        "symbol",
+        "orderId",
+        "orderListId",
+        "clientOrderId",
+        "transactTime",
+        "price",
+        "origQty",
+        "executedQty",
+        "cummulativeQuoteQty",
+        "status",
+        "timeInForce",
+        "type",
+        "side",
+        "fills",
+        "stopPrice",
+        "icebergQty",
+        "time",
+        "updateTime",
+        "isWorking",
+        "origQuoteOrderQty",
+        # lazily decoded numeric fields, unset until first access
+        "_price_decimal",
+        "_orig_qty_decimal",
+        "_executed_qty_decimal",
+        "_cummulative_quote_qty_decimal",
+    )
+    _price_decimal: Optional[Decimal]
+    _orig_qty_decimal: Optional[Decimal]
+    _executed_qty_decimal: Optional[Decimal]
+    _cummulative_quote_qty_decimal: Optional[Decimal]
+
     def __init__(self, binance_order_object: typing.Dict[str, typing.Any]):
-        self.symbol: Optional[str] = binance_order_object.get("symbol")  # "BTCUSDT",
-        self.orderId: Optional[str] = binance_order_object.get("orderId")  # 28,
-        self.orderListId: Optional[str] = binance_order_object.get("orderListId")  # -1, //Unless OCO, value will be -1
-        self.clientOrderId: Optional[str] = binance_order_object.get("clientOrderId")  # "6gCrw2kRUAF9CvJDGP16IP",
-        self.transactTime: Optional[str] = binance_order_object.get("transactTime")  # 1507725176595,
-        self.price: Optional[str] = binance_order_object.get("price")  # "0.00000000",
-        self.origQty: Optional[str] = binance_order_object.get("origQty")  # "10.00000000",
-        self.executedQty: Optional[str] = binance_order_object.get("executedQty")  # "10.00000000",
-        self.cummulativeQuoteQty: Optional[str] = binance_order_object.get("cummulativeQuoteQty")  # "10.00000000",
-        self.status: Optional[str] = binance_order_object.get("status")  # "FILLED",
-        self.timeInForce: Optional[str] = binance_order_object.get("timeInForce")  # "GTC",
-        self.type: Optional[str] = binance_order_object.get("type")  # "MARKET",
-        self.side: Optional[str] = binance_order_object.get("side")  # "SELL"
-        self.fills: Optional[str] = binance_order_object.get("fills")
-        self.stopPrice: Optional[str] = binance_order_object.get("stopPrice")  # "0.00000000",
-        self.icebergQty: Optional[str] = binance_order_object.get("icebergQty")  # "0.00000000",
-        self.time: Optional[str] = binance_order_object.get("time")  # 1636591592916,
-        self.updateTime: Optional[str] = binance_order_object.get("updateTime")  # 1636591592916,
-        self.isWorking: Optional[str] = binance_order_object.get("isWorking")  # true,
-        self.origQuoteOrderQty: Optional[str] = binance_order_object.get("origQuoteOrderQty")  # "0.00000000"
-
-    # TODO: Check if this is a correct override of the hash method
+        get = binance_order_object.get
+        self.symbol: Optional[str] = get("symbol")  # "BTCUSDT",
+        self.orderId: Optional[str] = get("orderId")  # 28,
+        self.orderListId: Optional[str] = get("orderListId")  # -1, //Unless OCO, value will be -1
+        self.clientOrderId: Optional[str] = get("clientOrderId")  # "6gCrw2kRUAF9CvJDGP16IP",
+        self.transactTime: Optional[str] = get("transactTime")  # 1507725176595,
+        self.price: Optional[str] = get("price")  # "0.00000000",
+        self.origQty: Optional[str] = get("origQty")  # "10.00000000",
+        self.executedQty: Optional[str] = get("executedQty")  # "10.00000000",
+        self.cummulativeQuoteQty: Optional[str] = get("cummulativeQuoteQty")  # "10.00000000",
+        self.status: Optional[str] = get("status")  # "FILLED",
+        self.timeInForce: Optional[str] = get("timeInForce")  # "GTC",
+        self.type: Optional[str] = get("type")  # "MARKET",
+        self.side: Optional[str] = get("side")  # "SELL"
+        self.fills: Optional[str] = get("fills")
+        self.stopPrice: Optional[str] = get("stopPrice")  # "0.00000000",
+        self.icebergQty: Optional[str] = get("icebergQty")  # "0.00000000",
+        self.time: Optional[str] = get("time")  # 1636591592916,
+        self.updateTime: Optional[str] = get("updateTime")  # 1636591592916,
+        self.isWorking: Optional[str] = get("isWorking")  # true,
+        self.origQuoteOrderQty: Optional[str] = get("origQuoteOrderQty")  # "0.00000000"
+
+    def key(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Returns (symbol, orderId), binance order ids are only unique per symbol.
+        """
+        return (self.symbol, self.orderId)
+
     def __hash__(self):
-        return hash(
-            (
-                self.symbol,
-                self.orderId,
-                self.orderListId,
-                self.clientOrderId,
-                self.transactTime,
-                self.price,
-                self.origQty,
-                self.executedQty,
-                self.cummulativeQuoteQty,
-                self.status,
-                self.timeInForce,
-                self.type,
-                self.side,
-                self.fills,
-                self.stopPrice,
-                self.icebergQty,
-                self.time,
-                self.updateTime,
-                self.isWorking,
-                self.origQuoteOrderQty,
-            )
-        )
+        return hash(self.key())
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, BinanceOrder):
             return NotImplemented
-        return (
-            self.symbol == other.symbol
-            and (self.orderId == other.orderId)
-            and (self.orderListId == other.orderListId)
-            and (self.clientOrderId == other.clientOrderId)
-            and (self.transactTime == other.transactTime)
-            and (self.price == other.price)
-            and (self.origQty == other.origQty)
-            and (self.executedQty == other.executedQty)
-            and (self.cummulativeQuoteQty == other.cummulativeQuoteQty)
-            and (self.status == other.status)
-            and (self.timeInForce == other.timeInForce)
-            and (self.type == other.type)
-            and (self.side == other.side)
-            and (self.fills == other.fills)
-            and (self.stopPrice == other.stopPrice)
-            and (self.icebergQty == other.icebergQty)
-            and (self.time == other.time)
-            and (self.updateTime == other.updateTime)
-            and (self.isWorking == other.isWorking)
-            and (self.origQuoteOrderQty == other.origQuoteOrderQty)
-        )
+        return self.key() == other.key()
+
+    @property
+    def price_decimal(self) -> Optional[Decimal]:
+        try:
+            return self._price_decimal
+        except AttributeError:
+            self._price_decimal = _to_decimal(self.price)
+            return self._price_decimal
+
+    @property
+    def orig_qty_decimal(self) -> Optional[Decimal]:
+        try:
+            return self._orig_qty_decimal
+        except AttributeError:
+            self._orig_qty_decimal = _to_decimal(self.origQty)
+            return self._orig_qty_decimal
+
+    @property
+    def executed_qty_decimal(self) -> Optional[Decimal]:
+        try:
+            return self._executed_qty_decimal
+        except AttributeError:
+            self._executed_qty_decimal = _to_decimal(self.executedQty)
+            return self._executed_qty_decimal
+
+    @property
+    def cummulative_quote_qty_decimal(self) -> Optional[Decimal]:
+        try:
+            return self._cummulative_quote_qty_decimal
+        except AttributeError:
+            self._cummulative_quote_qty_decimal = _to_decimal(self.cummulativeQuoteQty)
+            return self._cummulative_quote_qty_decimal
 
     def __str__(self) -> str:
         return str(self.asDict())
@@ -94,13 +127,13 @@ class BinanceOrder:
         order_type = self.type
         side = self.side
         symbol = self.symbol
-        price = Decimal(-1)
-        if self.price is not None:
-            price = Decimal(self.price)
+        price = self.price_decimal
+        if price is None:
+            price = Decimal(-1)
 
-        quantity = Decimal(-1)
-        if self.origQty is not None:
-            quantity = Decimal(self.origQty)
+        quantity = self.orig_qty_decimal
+        if quantity is None:
+            quantity = Decimal(-1)
 
         date = self.time
         if date is not None:
@@ -134,3 +167,7 @@ class BinanceOrder:
             "isWorking": self.isWorking,
             "origQuoteOrderQty": self.origQuoteOrderQty,
         }
+
+
+def _to_decimal(value: Optional[str]) -> Optional[Decimal]:
+    return Decimal(value) if value is not None else None
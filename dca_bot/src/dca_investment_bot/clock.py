@@ -0,0 +1,171 @@
+import asyncio
+import datetime
+import threading
+import time
+from typing import Dict
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+"""
+Time source of the bot.
+Everything that reads the current time or waits (main loop, scheduler, order checker,
+price and account caches) uses a Clock instead of the time module,
+so the bot can run with virtual time (e.g. paper trading, see paper_trading.py).
+
+Timestamps are unix timestamps in seconds, datetimes are naive local times
+unless the clock has a timezone.
+"""
+
+# how often a waiting thread of the VirtualClock checks for events set by threads that don't use the clock
+VIRTUAL_WAIT_POLL_INTERVAL = 0.01
+
+
+class Clock:
+    """
+    The system clock.
+    """
+
+    def __init__(self, tz: Optional[datetime.tzinfo] = None) -> None:
+        """
+        tz is the timezone of the datetimes, None uses naive local times.
+        """
+        self.tz = tz
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        """
+        Use this to measure durations.
+        """
+        return time.monotonic()
+
+    def now(self) -> datetime.datetime:
+        return self.fromtimestamp(self.time())
+
+    def fromtimestamp(self, timestamp: float) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(timestamp, tz=self.tz)
+
+    def timestamp(self, date_time: datetime.datetime) -> float:
+        """
+        Returns the timestamp of the datetime, naive datetimes are in the timezone of the clock.
+        """
+        if date_time.tzinfo is None and self.tz is not None:
+            date_time = date_time.replace(tzinfo=self.tz)
+        return date_time.timestamp()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        """
+        Sleeps without blocking the event loop.
+        """
+        await asyncio.sleep(seconds)
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the event is set or timeout seconds passed.
+        Returns True if the event is set.
+        """
+        return event.wait(timeout)
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class VirtualClock(Clock):
+    """
+    A clock whose time only moves when all threads using it are waiting.
+    Instead of blocking, the time jumps to the earliest end of a wait,
+    so months of waiting pass in a few milliseconds.
+
+    Every thread that waited on the clock once (or called attach) takes part until it exits.
+    While one of them is busy (e.g. the main loop fetching market data) the time stands still,
+    threads that never wait on the clock (e.g. thread pools) don't hold back the time.
+    """
+
+    def __init__(self, start_time: float, tz: Optional[datetime.tzinfo] = None) -> None:
+        super().__init__(tz)
+        self._now = float(start_time)
+        self._condition = threading.Condition(threading.RLock())
+        self._participants: Set[threading.Thread] = set()
+        # thread -> (end of the wait or None, event or None)
+        self._waiting: Dict[threading.Thread, Tuple[Optional[float], Optional[threading.Event]]] = {}
+
+    def time(self) -> float:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def attach(self) -> None:
+        """
+        Makes the current thread take part before its first wait,
+        the time stands still until it waits (or exits).
+        """
+        with self._condition:
+            self._participants.add(threading.current_thread())
+
+    def advance(self, seconds: float) -> None:
+        """
+        Moves the time forward without waiting, e.g. to drive the clock from a test.
+        """
+        with self._condition:
+            self.__set_time(self._now + seconds)
+
+    def sleep(self, seconds: float) -> None:
+        self.__wait(None, seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        # the event loop thread would block all other coroutines while waiting for the time to move
+        raise NotImplementedError("The VirtualClock can not be used on an asyncio event loop")
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        return self.__wait(event, timeout)
+
+    def __wait(self, event: Optional[threading.Event], timeout: Optional[float]) -> bool:
+        thread = threading.current_thread()
+        with self._condition:
+            end_time = self._now + max(0.0, timeout) if timeout is not None else None
+            self._participants.add(thread)
+            self._waiting[thread] = (end_time, event)
+            # other waiting threads may be able to move the time now
+            self._condition.notify_all()
+            try:
+                while True:
+                    if event is not None and event.is_set():
+                        return True
+                    if end_time is not None and self._now >= end_time:
+                        return False
+                    if not self.__advance_if_idle():
+                        self._condition.wait(VIRTUAL_WAIT_POLL_INTERVAL)
+            finally:
+                del self._waiting[thread]
+                self._condition.notify_all()
+
+    def __advance_if_idle(self) -> bool:
+        """
+        Moves the time to the earliest end of a wait if every participating thread is waiting.
+        Returns True if the time moved.
+        """
+        self._participants = {thread for thread in self._participants if thread.is_alive()}
+        if any(thread not in self._waiting for thread in self._participants):
+            return False
+        end_times = []
+        for end_time, event in self._waiting.values():
+            if (event is not None and event.is_set()) or (end_time is not None and end_time <= self._now):
+                # that thread has to continue before the time moves on
+                return False
+            if end_time is not None:
+                end_times.append(end_time)
+        if len(end_times) == 0:
+            return False
+        self.__set_time(min(end_times))
+        return True
+
+    def __set_time(self, new_time: float) -> None:
+        if new_time > self._now:
+            self._now = new_time
+            self._condition.notify_all()
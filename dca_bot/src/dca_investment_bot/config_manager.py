@@ -24,7 +24,16 @@ current Options.json:
     "CHECK_INTERVAL" : 1800,
     "SYNC_FULFILLED_ORDERS_TO_FIREBASE" : false,
     "USE_FIREBASE" : false,
-    "FIREBASE_PROJECT_ID" : ""
+    "FIREBASE_PROJECT_ID" : "",
+    "MAX_CONCURRENT_REQUESTS" : 5,
+    "REQUEST_WEIGHT_LIMIT" : 1200,
+    "PRICE_MAX_AGE" : 10,
+    "USE_ASYNCIO" : false,
+    "EXCHANGE_INFO_TTL" : 86400,
+    "USE_USER_DATA_STREAM" : false,
+    "USE_ORDER_JOURNAL" : false,
+    "USE_ORDER_DATABASE" : false,
+    "API_URL" : ""
 }
 """
 
@@ -38,6 +47,15 @@ class ConfigManager:
     KEY_SYNC_FULFILLED_ORDERS_TO_FIREBASE = "SYNC_FULFILLED_ORDERS_TO_FIREBASE"
     KEY_USE_FIREBASE = "USE_FIREBASE"
     KEY_FIREBASE_PROJECT_ID = "FIREBASE_PROJECT_ID"
+    KEY_MAX_CONCURRENT_REQUESTS = "MAX_CONCURRENT_REQUESTS"
+    KEY_REQUEST_WEIGHT_LIMIT = "REQUEST_WEIGHT_LIMIT"
+    KEY_PRICE_MAX_AGE = "PRICE_MAX_AGE"
+    KEY_USE_ASYNCIO = "USE_ASYNCIO"
+    KEY_EXCHANGE_INFO_TTL = "EXCHANGE_INFO_TTL"
+    KEY_USE_USER_DATA_STREAM = "USE_USER_DATA_STREAM"
+    KEY_USE_ORDER_JOURNAL = "USE_ORDER_JOURNAL"
+    KEY_USE_ORDER_DATABASE = "USE_ORDER_DATABASE"
+    KEY_API_URL = "API_URL"
 
     def __init__(self) -> None:
         self.debug_tag = "[ConfigManager]"
@@ -48,6 +66,15 @@ class ConfigManager:
         self.sync_fulfilled_orders_to_firebase: Union[bool, None] = None
         self.use_firebase: Union[bool, None] = None
         self.firebase_project_id: Union[str, None] = None
+        self.max_concurrent_requests: Union[int, None] = None
+        self.request_weight_limit: Union[int, None] = None
+        self.price_max_age: Union[int, None] = None
+        self.use_asyncio: Union[bool, None] = None
+        self.exchange_info_ttl: Union[int, None] = None
+        self.use_user_data_stream: Union[bool, None] = None
+        self.use_order_journal: Union[bool, None] = None
+        self.use_order_database: Union[bool, None] = None
+        self.api_url: Union[str, None] = None
 
     def __validate_value(
         self,
@@ -139,3 +166,12 @@ class ConfigManager:
             )
             self.use_firebase = self.__validate_value(data, self.KEY_USE_FIREBASE, bool, False)
             self.firebase_project_id = self.__validate_value(data, self.KEY_FIREBASE_PROJECT_ID, str, "")
+            self.max_concurrent_requests = self.__validate_value(data, self.KEY_MAX_CONCURRENT_REQUESTS, int, 5)
+            self.request_weight_limit = self.__validate_value(data, self.KEY_REQUEST_WEIGHT_LIMIT, int, 1200)
+            self.price_max_age = self.__validate_value(data, self.KEY_PRICE_MAX_AGE, int, 10)
+            self.use_asyncio = self.__validate_value(data, self.KEY_USE_ASYNCIO, bool, False)
+            self.exchange_info_ttl = self.__validate_value(data, self.KEY_EXCHANGE_INFO_TTL, int, 86400)
+            self.use_user_data_stream = self.__validate_value(data, self.KEY_USE_USER_DATA_STREAM, bool, False)
+            self.use_order_journal = self.__validate_value(data, self.KEY_USE_ORDER_JOURNAL, bool, False)
+            self.use_order_database = self.__validate_value(data, self.KEY_USE_ORDER_DATABASE, bool, False)
+            self.api_url = self.__validate_value(data, self.KEY_API_URL, str, "")
@@ -1,7 +1,8 @@
 import datetime
-import time
-from typing import Optional
+from typing import Any
 
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
 from dca_investment_bot.logger import LOG_CRITICAL_AND_NOTIFY
 
 
@@ -25,14 +26,21 @@ class DCAInvestmentParameter:
         "investment_time": "12:00",
         "start_date": "2021-11-01"
     }
+    The start date is midnight in the timezone of the clock.
     """
 
-    def __init__(self, parameter_object):
-        self.symbol: Optional[str] = None
-        self.investment_amount_quoteasset: Optional[str] = None
-        self.interval: Optional[str] = None
-        self.investment_time: Optional[str] = None
-        self.start_date: Optional[str] = None
+    def __init__(self, parameter_object, clock: Clock = SYSTEM_CLOCK):
+        self._clock = clock
+        # set by load_from_json, which raises if a key is missing
+        self.symbol: str
+        # the value from the json object (a number or a string)
+        self.investment_amount_quoteasset: Any
+        # in seconds
+        self.interval: int
+        # in seconds after midnight
+        self.investment_time: int
+        # timestamp in seconds
+        self.start_date: float
         self.load_from_json(parameter_object)
 
     def parse_interval_to_seconds(self, interval):
@@ -67,13 +75,27 @@ class DCAInvestmentParameter:
 
     def date_to_seconds(self, date):
         try:
-            return time.mktime(datetime.datetime.strptime(date, "%Y-%m-%d").timetuple())
+            return self._clock.timestamp(datetime.datetime.strptime(date, "%Y-%m-%d"))
         except (OverflowError, ValueError, TypeError):
             raise InvalidParameterFormat(
                 f"Start date uses invalid format. \
                     YYYY-MM-DD expected but {date} was given"
             )
 
+    def next_investment_timestamp(self, last_investment_timestamp: float) -> float:
+        """
+        Returns the time of the investment after the one at last_investment_timestamp (seconds):
+        midnight of the day of the last investment + interval, at investment_time.
+        """
+        time_of_last_investment = self._clock.fromtimestamp(last_investment_timestamp)
+        time_of_last_investment_midnight = time_of_last_investment.replace(hour=0, minute=0, second=0, microsecond=0)
+        hours = self.investment_time // 3600
+        minutes = (self.investment_time % 3600) // 60
+        next_investment_time = (time_of_last_investment_midnight + datetime.timedelta(seconds=self.interval)).replace(
+            hour=hours, minute=minutes, second=0, microsecond=0
+        )
+        return self._clock.timestamp(next_investment_time)
+
     # method to print details
     def print_details(self):
         print("DCA Investment:")
@@ -4,3 +4,23 @@ class KillProcessException(Exception):
 
 class NoCallbackDefinedException(Exception):
     pass
+
+
+class UnknownSymbolException(Exception):
+    """
+    The exchange does not know the symbol (e.g. a typo in the strategy or a delisted symbol).
+    """
+
+    def __init__(self, symbol: str) -> None:
+        super().__init__(f"Unknown symbol {symbol}")
+        self.symbol = symbol
+
+
+class PriceNotAvailableException(Exception):
+    """
+    The price of the symbol was not returned by the exchange (e.g. the symbol was delisted).
+    """
+
+    def __init__(self, symbol: str) -> None:
+        super().__init__(f"No price available for symbol {symbol}")
+        self.symbol = symbol
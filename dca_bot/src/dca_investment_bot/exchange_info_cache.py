@@ -0,0 +1,230 @@
+import json
+import os
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
+from dca_investment_bot.exceptions import UnknownSymbolException
+from dca_investment_bot.logger import LOG_DEBUG
+from dca_investment_bot.logger import LOG_INFO
+from dca_investment_bot.logger import LOG_WARNING
+
+"""
+Caches the symbol infos (filters, assets, precision) of all symbols.
+All symbols are loaded with a single exchangeInfo request and stored on disk,
+so a restart within the TTL does not need any exchangeInfo request.
+Listeners are notified with the symbols whose info changed on a refresh.
+A lookup of an unknown symbol refreshes the cache at most once per miss_refresh_interval,
+so a misconfigured symbol does not fetch the whole exchange info on every lookup.
+"""
+
+# increase when the format of the cache file changes, older files are ignored
+EXCHANGE_INFO_CACHE_VERSION = 1
+DEFAULT_EXCHANGE_INFO_TTL = 24 * 60 * 60
+DEFAULT_MISS_REFRESH_INTERVAL = 5 * 60
+
+
+class ExchangeInfoCache:
+    def __init__(
+        self,
+        fetch_exchange_info: Optional[Callable[[], Dict[str, Any]]] = None,
+        filepath: Optional[str] = None,
+        ttl_seconds: float = DEFAULT_EXCHANGE_INFO_TTL,
+        clock: Clock = SYSTEM_CLOCK,
+        miss_refresh_interval: float = DEFAULT_MISS_REFRESH_INTERVAL,
+    ) -> None:
+        """
+        fetch_exchange_info is called to refresh the cache and has to return the exchangeInfo response.
+        Without it (e.g. when it is fetched asynchronously), the cache
+        has to be refreshed with update() when needs_refresh() returns True.
+        The cache is not stored on disk if filepath is None.
+        An unknown symbol only triggers a refresh if the last one is older than miss_refresh_interval seconds.
+        """
+        self._debug_tag = "[ExchangeInfoCache]"
+        self._fetch_exchange_info = fetch_exchange_info
+        self._filepath = filepath
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._miss_refresh_interval = miss_refresh_interval
+        self._symbol_infos: Dict[str, Dict[str, Any]] = {}
+        # wall clock time, stored in the cache file
+        self._fetched_at: Optional[float] = None
+        self._listeners: List[Callable[[List[str]], None]] = []
+        self._lock = threading.RLock()
+
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_refresh_event = threading.Event()
+
+    def load(self) -> None:
+        """
+        Loads the cache from disk and fetches the exchange info if the file is missing or outdated.
+        """
+        with self._lock:
+            if not self.load_from_file() or self.is_outdated():
+                self.refresh()
+
+    def load_from_file(self) -> bool:
+        """
+        Loads the cache file, returns False if there is no usable file.
+        """
+        if self._filepath is None or not os.path.exists(self._filepath):
+            return False
+        try:
+            with open(self._filepath) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            LOG_WARNING(self._debug_tag, f"Could not read exchange info cache {self._filepath}: {e}")
+            return False
+
+        if data.get("version") != EXCHANGE_INFO_CACHE_VERSION:
+            LOG_INFO(self._debug_tag, "Exchange info cache has an old version, ignoring it")
+            return False
+
+        with self._lock:
+            self._symbol_infos = data["symbols"]
+            self._fetched_at = data["fetched_at"]
+        LOG_DEBUG(self._debug_tag, f"Loaded {len(self._symbol_infos)} symbols from {self._filepath}")
+        return True
+
+    def store_to_file(self) -> None:
+        if self._filepath is None:
+            return
+        with self._lock:
+            data = {
+                "version": EXCHANGE_INFO_CACHE_VERSION,
+                "fetched_at": self._fetched_at,
+                "symbols": self._symbol_infos,
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(self._filepath)), exist_ok=True)
+        # write to a temporary file first so a crash does not leave a broken cache
+        tmp_filepath = self._filepath + ".tmp"
+        with open(tmp_filepath, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_filepath, self._filepath)
+
+    def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
+        """
+        Returns the symbol info, raises UnknownSymbolException if the exchange does not know the symbol.
+        Unknown symbols trigger a refresh in case the symbol was listed after the last refresh (see needs_refresh).
+        """
+        with self._lock:
+            if self._fetch_exchange_info is not None and self.needs_refresh(symbol):
+                self.refresh()
+            symbol_info = self._symbol_infos.get(symbol)
+        if symbol_info is None:
+            raise UnknownSymbolException(symbol)
+        return symbol_info
+
+    def get_cached_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the symbol info without refreshing the cache.
+        """
+        with self._lock:
+            return self._symbol_infos.get(symbol)
+
+    def needs_refresh(self, symbol: Optional[str] = None) -> bool:
+        """
+        Returns True if the cache is outdated, or does not know the symbol
+        and the last refresh is older than miss_refresh_interval.
+        """
+        with self._lock:
+            if self.is_outdated():
+                return True
+            return (
+                symbol is not None and symbol not in self._symbol_infos and self.__age() >= self._miss_refresh_interval
+            )
+
+    def is_outdated(self) -> bool:
+        with self._lock:
+            return self._fetched_at is None or self.__age() > self._ttl_seconds
+
+    def __age(self) -> float:
+        # seconds since the last refresh, the cache is outdated if it was never fetched
+        if self._fetched_at is None:
+            return float("inf")
+        return self._clock.time() - self._fetched_at
+
+    def refresh(self) -> None:
+        """
+        Fetches the exchange info and replaces the cache.
+        """
+        if self._fetch_exchange_info is None:
+            raise Exception("Exchange info cache is outdated and no fetch function is set")
+        self.update(self._fetch_exchange_info())
+
+    def update(self, exchange_info: Dict[str, Any]) -> None:
+        """
+        Replaces the cache with the symbols of the given exchangeInfo response,
+        stores it on disk and notifies the listeners about changed symbols.
+        """
+        symbol_infos = {info["symbol"]: info for info in exchange_info.get("symbols", [])}
+        with self._lock:
+            changed_symbols = [
+                symbol
+                for symbol, info in self._symbol_infos.items()
+                if symbol not in symbol_infos or symbol_infos[symbol]["filters"] != info["filters"]
+            ]
+            self._symbol_infos = symbol_infos
+            self._fetched_at = self._clock.time()
+            listeners = list(self._listeners)
+        LOG_DEBUG(self._debug_tag, f"Fetched exchange info for {len(symbol_infos)} symbols")
+
+        try:
+            self.store_to_file()
+        except OSError as e:
+            LOG_WARNING(self._debug_tag, f"Could not store exchange info cache {self._filepath}: {e}")
+
+        if len(changed_symbols) > 0:
+            LOG_INFO(self._debug_tag, f"Symbol infos changed for: {', '.join(changed_symbols)}")
+            for listener in listeners:
+                listener(changed_symbols)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._fetched_at = None
+
+    def add_invalidation_listener(self, listener: Callable[[List[str]], None]) -> None:
+        """
+        listener is called with the symbols whose info changed or that were removed.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_invalidation_listener(self, listener: Callable[[List[str]], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def start_background_refresh(self, check_interval: float = 60) -> None:
+        """
+        Starts a daemon thread that refreshes the cache once it is older than the TTL.
+        """
+        if self._refresh_thread is not None:
+            return
+        self._stop_refresh_event.clear()
+        self._refresh_thread = threading.Thread(
+            target=self.__background_refresh, args=(check_interval,), name="ExchangeInfoRefresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self) -> None:
+        if self._refresh_thread is None:
+            return
+        self._stop_refresh_event.set()
+        self._refresh_thread.join()
+        self._refresh_thread = None
+
+    def __background_refresh(self, check_interval: float) -> None:
+        while not self._stop_refresh_event.wait(check_interval):
+            if not self.is_outdated():
+                continue
+            try:
+                self.refresh()
+            except Exception as e:
+                # the old symbol infos are still usable, try again on the next check
+                LOG_WARNING(self._debug_tag, f"Background refresh of exchange info failed: {e}")
@@ -0,0 +1,684 @@
+import decimal
+import functools
+import itertools
+import json
+import threading
+import time
+import uuid
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
+from binance.enums import ORDER_STATUS_CANCELED
+from binance.enums import ORDER_STATUS_FILLED
+from binance.enums import ORDER_STATUS_NEW
+from binance.enums import ORDER_TYPE_LIMIT
+from binance.enums import ORDER_TYPE_MARKET
+from binance.enums import SIDE_BUY
+from binance.enums import SIDE_SELL
+from binance.exceptions import BinanceAPIException
+
+from dca_investment_bot.request_weight_limiter import DEFAULT_REQUEST_WEIGHT_LIMIT
+from dca_investment_bot.request_weight_limiter import ENDPOINT_WEIGHTS
+
+"""
+A local stand-in for the binance spot REST api to run the bot offline (API_URL in config.json).
+
+The MatchingEngine keeps balances and limit orders of a single account. Orders fill
+when the price of their symbol (set with set_price, e.g. from a price feed or kline replay)
+reaches the limit price. The ExchangeSimulator serves the engine over http on localhost
+with the endpoints used by the TradingBot and returns the used request weight
+in the X-MBX-USED-WEIGHT headers like binance, exceeding the limit returns http 429
+with the seconds until the next minute in the Retry-After header.
+
+Signatures are not checked and the user data stream only supports listen keys (no websocket).
+The SimulatedClient calls the engine directly instead of over http, e.g. for paper trading.
+"""
+
+WEIGHT_HEADER = "X-MBX-USED-WEIGHT"
+WEIGHT_HEADER_1M = "X-MBX-USED-WEIGHT-1M"
+
+# (method, endpoint) -> request weight
+ROUTE_WEIGHTS: Dict[Tuple[str, str], int] = {
+    ("GET", "ping"): 1,
+    ("GET", "time"): 1,
+    ("GET", "exchangeInfo"): ENDPOINT_WEIGHTS["exchangeInfo"],
+    ("GET", "avgPrice"): ENDPOINT_WEIGHTS["avgPrice"],
+    ("GET", "ticker/price"): ENDPOINT_WEIGHTS["tickerPrice"],
+    ("GET", "account"): ENDPOINT_WEIGHTS["account"],
+    ("GET", "order"): ENDPOINT_WEIGHTS["order_get"],
+    ("POST", "order"): ENDPOINT_WEIGHTS["order_post"],
+    ("DELETE", "order"): ENDPOINT_WEIGHTS["order_delete"],
+    ("GET", "openOrders"): ENDPOINT_WEIGHTS["openOrders"],
+    ("POST", "userDataStream"): ENDPOINT_WEIGHTS["userDataStream"],
+    ("PUT", "userDataStream"): ENDPOINT_WEIGHTS["userDataStream"],
+    ("DELETE", "userDataStream"): ENDPOINT_WEIGHTS["userDataStream"],
+}
+
+T = TypeVar("T")
+
+
+def _exact(method: Callable[..., T]) -> Callable[..., T]:
+    # the bot lowers the decimal precision of its thread, balances need full precision
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        with decimal.localcontext() as context:
+            context.prec = 28
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+def _format(value: Decimal) -> str:
+    return f"{value:.8f}"
+
+
+class SimulatorError(Exception):
+    """
+    An error response of the api, same codes as binance.
+    """
+
+    def __init__(self, status: int, code: int, msg: str) -> None:
+        super().__init__(msg)
+        self.status = status
+        self.code = code
+        self.msg = msg
+
+
+class SimulatedSymbol:
+    def __init__(
+        self,
+        symbol: str,
+        base_asset: str,
+        quote_asset: str,
+        price: Union[str, Decimal],
+        tick_size: str = "0.01",
+        step_size: str = "0.00001",
+        min_notional: str = "10",
+    ) -> None:
+        self.symbol = symbol
+        self.base_asset = base_asset
+        self.quote_asset = quote_asset
+        self.price = Decimal(price)
+        self.tick_size = Decimal(tick_size)
+        self.step_size = Decimal(step_size)
+        self.min_notional = Decimal(min_notional)
+
+    def symbol_info(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "status": "TRADING",
+            "baseAsset": self.base_asset,
+            "baseAssetPrecision": 8,
+            "quoteAsset": self.quote_asset,
+            "quotePrecision": 8,
+            "orderTypes": [ORDER_TYPE_LIMIT, ORDER_TYPE_MARKET],
+            "isSpotTradingAllowed": True,
+            "filters": [
+                {
+                    "filterType": "PRICE_FILTER",
+                    "minPrice": _format(self.tick_size),
+                    "maxPrice": "1000000.00000000",
+                    "tickSize": _format(self.tick_size),
+                },
+                {
+                    "filterType": "LOT_SIZE",
+                    "minQty": _format(self.step_size),
+                    "maxQty": "9000.00000000",
+                    "stepSize": _format(self.step_size),
+                },
+                {"filterType": "MIN_NOTIONAL", "minNotional": _format(self.min_notional), "applyToMarket": True},
+            ],
+        }
+
+
+class MatchingEngine:
+    def __init__(
+        self,
+        symbols: Iterable[SimulatedSymbol],
+        balances: Mapping[str, Union[str, Decimal]],
+        time_function: Callable[[], float] = time.time,
+    ) -> None:
+        self._symbols: Dict[str, SimulatedSymbol] = {s.symbol: s for s in symbols}
+        self._free: Dict[str, Decimal] = {asset: Decimal(balance) for asset, balance in balances.items()}
+        self._locked: Dict[str, Decimal] = {}
+        self._orders: Dict[int, Dict[str, Any]] = {}
+        self._open_order_ids: Dict[str, List[int]] = {}
+        self._order_ids = itertools.count(1)
+        self._time_function = time_function
+        self._fill_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.RLock()
+
+    def add_fill_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        listener is called with a copy of every order that gets filled,
+        including orders that fill when they are created. Keep it short, it is called while the engine is locked.
+        """
+        with self._lock:
+            self._fill_listeners.append(listener)
+
+    def now_ms(self) -> int:
+        return int(self._time_function() * 1000)
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols.keys())
+
+    def exchange_info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "timezone": "UTC",
+                "serverTime": self.now_ms(),
+                "rateLimits": [
+                    {
+                        "rateLimitType": "REQUEST_WEIGHT",
+                        "interval": "MINUTE",
+                        "intervalNum": 1,
+                        "limit": DEFAULT_REQUEST_WEIGHT_LIMIT,
+                    }
+                ],
+                "symbols": [s.symbol_info() for s in self._symbols.values()],
+            }
+
+    def get_price(self, symbol: str) -> Decimal:
+        with self._lock:
+            return self.__symbol(symbol).price
+
+    @_exact
+    def set_price(self, symbol: str, price: Union[str, Decimal]) -> List[Dict[str, Any]]:
+        """
+        Updates the price of the symbol and fills the orders whose limit price was reached.
+        Returns the filled orders.
+        """
+        with self._lock:
+            simulated_symbol = self.__symbol(symbol)
+            simulated_symbol.price = Decimal(price)
+            filled_orders = []
+            for order_id in list(self._open_order_ids.get(symbol, [])):
+                order = self._orders[order_id]
+                if self.__limit_reached(order, simulated_symbol.price):
+                    self.__fill(order, Decimal(order["price"]))
+                    filled_orders.append(dict(order))
+            return filled_orders
+
+    def set_prices(self, prices: Mapping[str, Union[str, Decimal]]) -> List[Dict[str, Any]]:
+        filled_orders = []
+        for symbol, price in prices.items():
+            filled_orders += self.set_price(symbol, price)
+        return filled_orders
+
+    @_exact
+    def create_order(self, params: Mapping[str, str]) -> Dict[str, Any]:
+        with self._lock:
+            simulated_symbol = self.__symbol(params.get("symbol", ""))
+            side = params.get("side")
+            order_type = params.get("type")
+            if side not in (SIDE_BUY, SIDE_SELL):
+                raise SimulatorError(
+                    400, -1102, "Mandatory parameter 'side' was not sent, was empty/null, or malformed."
+                )
+            if order_type not in (ORDER_TYPE_LIMIT, ORDER_TYPE_MARKET):
+                raise SimulatorError(400, -1116, "Invalid orderType.")
+            try:
+                quantity = Decimal(params["quantity"])
+                price = Decimal(params["price"]) if order_type == ORDER_TYPE_LIMIT else simulated_symbol.price
+            except (KeyError, decimal.InvalidOperation):
+                raise SimulatorError(400, -1102, "Mandatory parameter was not sent, was empty/null, or malformed.")
+            self.__check_filters(simulated_symbol, quantity, price)
+
+            # lock the balance the order needs
+            if side == SIDE_BUY:
+                locked_asset, locked_amount = simulated_symbol.quote_asset, quantity * price
+            else:
+                locked_asset, locked_amount = simulated_symbol.base_asset, quantity
+            if self._free.get(locked_asset, Decimal(0)) < locked_amount:
+                raise SimulatorError(400, -2010, "Account has insufficient balance for requested action.")
+            self._free[locked_asset] = self._free.get(locked_asset, Decimal(0)) - locked_amount
+            self._locked[locked_asset] = self._locked.get(locked_asset, Decimal(0)) + locked_amount
+
+            now = self.now_ms()
+            order_id = next(self._order_ids)
+            order: Dict[str, Any] = {
+                "symbol": simulated_symbol.symbol,
+                "orderId": order_id,
+                "orderListId": -1,
+                "clientOrderId": params.get("newClientOrderId") or uuid.uuid4().hex[:22],
+                "transactTime": now,
+                "price": _format(price),
+                "origQty": _format(quantity),
+                "executedQty": _format(Decimal(0)),
+                "cummulativeQuoteQty": _format(Decimal(0)),
+                "status": ORDER_STATUS_NEW,
+                "timeInForce": params.get("timeInForce", "GTC"),
+                "type": order_type,
+                "side": side,
+                "stopPrice": _format(Decimal(0)),
+                "icebergQty": _format(Decimal(0)),
+                "time": now,
+                "updateTime": now,
+                "isWorking": True,
+                "origQuoteOrderQty": _format(Decimal(0)),
+            }
+            self._orders[order_id] = order
+            self._open_order_ids.setdefault(simulated_symbol.symbol, []).append(order_id)
+
+            # orders that cross the market fill immediately at the market price
+            if order_type == ORDER_TYPE_MARKET or self.__limit_reached(order, simulated_symbol.price):
+                self.__fill(order, simulated_symbol.price)
+            response = dict(order)
+            del response["time"], response["updateTime"], response["isWorking"], response["stopPrice"]
+            del response["icebergQty"], response["origQuoteOrderQty"]
+            response["fills"] = order.get("fills", [])
+            return response
+
+    def get_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        with self._lock:
+            order = self.__order(symbol, order_id)
+            order = dict(order)
+            order.pop("fills", None)
+            order.pop("transactTime", None)
+            return order
+
+    @_exact
+    def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        with self._lock:
+            order = self.__order(symbol, order_id)
+            if order["status"] != ORDER_STATUS_NEW:
+                raise SimulatorError(400, -2011, "Unknown order sent.")
+            simulated_symbol = self._symbols[symbol]
+            if order["side"] == SIDE_BUY:
+                self.__unlock(simulated_symbol.quote_asset, Decimal(order["origQty"]) * Decimal(order["price"]))
+            else:
+                self.__unlock(simulated_symbol.base_asset, Decimal(order["origQty"]))
+            order["status"] = ORDER_STATUS_CANCELED
+            order["isWorking"] = False
+            order["updateTime"] = self.now_ms()
+            self._open_order_ids[symbol].remove(order_id)
+            response = self.get_order(symbol, order_id)
+            response["origClientOrderId"] = response["clientOrderId"]
+            return response
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            symbols = [symbol] if symbol is not None else list(self._open_order_ids.keys())
+            return [self.get_order(s, order_id) for s in symbols for order_id in self._open_order_ids.get(s, [])]
+
+    def account(self) -> Dict[str, Any]:
+        with self._lock:
+            assets = sorted(set(self._free.keys()) | set(self._locked.keys()))
+            return {
+                "makerCommission": 0,
+                "takerCommission": 0,
+                "canTrade": True,
+                "canWithdraw": True,
+                "canDeposit": True,
+                "updateTime": self.now_ms(),
+                "accountType": "SPOT",
+                "balances": [
+                    {
+                        "asset": asset,
+                        "free": _format(self._free.get(asset, Decimal(0))),
+                        "locked": _format(self._locked.get(asset, Decimal(0))),
+                    }
+                    for asset in assets
+                ],
+                "permissions": ["SPOT"],
+            }
+
+    def balance(self, asset: str) -> Tuple[Decimal, Decimal]:
+        """
+        Returns the free and locked balance of the asset.
+        """
+        with self._lock:
+            return self._free.get(asset, Decimal(0)), self._locked.get(asset, Decimal(0))
+
+    def __symbol(self, symbol: str) -> SimulatedSymbol:
+        simulated_symbol = self._symbols.get(symbol)
+        if simulated_symbol is None:
+            raise SimulatorError(400, -1121, "Invalid symbol.")
+        return simulated_symbol
+
+    def __order(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        order = self._orders.get(int(order_id))
+        if order is None or order["symbol"] != symbol:
+            raise SimulatorError(400, -2013, "Order does not exist.")
+        return order
+
+    @staticmethod
+    def __limit_reached(order: Dict[str, Any], price: Decimal) -> bool:
+        limit = Decimal(order["price"])
+        return price <= limit if order["side"] == SIDE_BUY else price >= limit
+
+    def __check_filters(self, simulated_symbol: SimulatedSymbol, quantity: Decimal, price: Decimal) -> None:
+        if price <= 0 or price % simulated_symbol.tick_size != 0:
+            raise SimulatorError(400, -1013, "Filter failure: PRICE_FILTER")
+        if quantity <= 0 or quantity % simulated_symbol.step_size != 0:
+            raise SimulatorError(400, -1013, "Filter failure: LOT_SIZE")
+        if quantity * price < simulated_symbol.min_notional:
+            raise SimulatorError(400, -1013, "Filter failure: MIN_NOTIONAL")
+
+    def __fill(self, order: Dict[str, Any], fill_price: Decimal) -> None:
+        simulated_symbol = self._symbols[order["symbol"]]
+        quantity = Decimal(order["origQty"])
+        quote_quantity = quantity * fill_price
+        if order["side"] == SIDE_BUY:
+            # the limit price was locked, the difference to the fill price is returned
+            self.__unlock(simulated_symbol.quote_asset, quantity * Decimal(order["price"]))
+            self._free[simulated_symbol.quote_asset] -= quote_quantity
+            self._free[simulated_symbol.base_asset] = self._free.get(simulated_symbol.base_asset, Decimal(0)) + quantity
+        else:
+            self.__unlock(simulated_symbol.base_asset, quantity)
+            self._free[simulated_symbol.base_asset] -= quantity
+            self._free[simulated_symbol.quote_asset] = (
+                self._free.get(simulated_symbol.quote_asset, Decimal(0)) + quote_quantity
+            )
+        order["status"] = ORDER_STATUS_FILLED
+        order["executedQty"] = _format(quantity)
+        order["cummulativeQuoteQty"] = _format(quote_quantity)
+        order["isWorking"] = False
+        order["updateTime"] = self.now_ms()
+        order["fills"] = [
+            {
+                "price": _format(fill_price),
+                "qty": _format(quantity),
+                "commission": _format(Decimal(0)),
+                "commissionAsset": simulated_symbol.quote_asset,
+                "tradeId": order["orderId"],
+            }
+        ]
+        self._open_order_ids[order["symbol"]].remove(order["orderId"])
+        for listener in self._fill_listeners:
+            listener(dict(order))
+
+    def __unlock(self, asset: str, amount: Decimal) -> None:
+        self._locked[asset] = self._locked.get(asset, Decimal(0)) - amount
+        self._free[asset] = self._free.get(asset, Decimal(0)) + amount
+
+
+class SimulatedClient:
+    """
+    Provides the methods of the python-binance client used by the TradingBot on top of a MatchingEngine,
+    pass it as client to the TradingBot. Errors are raised as BinanceAPIException like the real client.
+    Requests are not weighted.
+    """
+
+    def __init__(self, engine: MatchingEngine) -> None:
+        self.engine = engine
+
+    def ping(self) -> Dict[str, Any]:
+        return {}
+
+    def get_server_time(self) -> Dict[str, Any]:
+        return {"serverTime": self.engine.now_ms()}
+
+    def get_exchange_info(self) -> Dict[str, Any]:
+        return self.engine.exchange_info()
+
+    def get_avg_price(self, **params: Any) -> Dict[str, Any]:
+        return {"mins": 5, "price": _format(self.__call(self.engine.get_price, params.get("symbol", "")))}
+
+    def get_symbol_ticker(self, **params: Any) -> Any:
+        if "symbol" in params:
+            return {"symbol": params["symbol"], "price": _format(self.__call(self.engine.get_price, params["symbol"]))}
+        symbols = json.loads(params["symbols"]) if "symbols" in params else self.engine.symbols()
+        return [{"symbol": s, "price": _format(self.__call(self.engine.get_price, s))} for s in symbols]
+
+    def get_account(self, **params: Any) -> Dict[str, Any]:
+        return self.engine.account()
+
+    def create_order(self, **params: Any) -> Dict[str, Any]:
+        return self.__call(self.engine.create_order, params)
+
+    def get_order(self, **params: Any) -> Dict[str, Any]:
+        return self.__call(self.engine.get_order, params.get("symbol", ""), int(params.get("orderId", 0)))
+
+    def cancel_order(self, **params: Any) -> Dict[str, Any]:
+        return self.__call(self.engine.cancel_order, params.get("symbol", ""), int(params.get("orderId", 0)))
+
+    def get_open_orders(self, **params: Any) -> List[Dict[str, Any]]:
+        return self.engine.open_orders(params.get("symbol"))
+
+    def stream_get_listen_key(self) -> str:
+        return uuid.uuid4().hex
+
+    def stream_keepalive(self, listenKey: str) -> Dict[str, Any]:
+        return {}
+
+    def stream_close(self, listenKey: str) -> Dict[str, Any]:
+        return {}
+
+    @staticmethod
+    def __call(method: Callable[..., T], *args: Any) -> T:
+        try:
+            return method(*args)
+        except SimulatorError as e:
+            raise BinanceAPIException(None, e.status, json.dumps({"code": e.code, "msg": e.msg}))
+
+
+class ExchangeSimulator:
+    """
+    Serves a MatchingEngine over http, point the bot to url (API_URL in config.json).
+    """
+
+    def __init__(
+        self,
+        engine: MatchingEngine,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        weight_limit: int = DEFAULT_REQUEST_WEIGHT_LIMIT,
+    ) -> None:
+        """
+        port 0 picks a free port.
+        """
+        self.engine = engine
+        self._weight_limit = weight_limit
+        self._weight_lock = threading.Lock()
+        self._weight_minute = 0
+        self._used_weight = 0
+        self._request_counts: Dict[Tuple[str, str], int] = {}
+        self._listen_keys: Dict[str, float] = {}
+        self._host = host
+        self._server = ThreadingHTTPServer((host, port), _create_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        # the port of the server, port 0 is only known after binding
+        return f"http://{self._host}:{self._server.server_port}/api"
+
+    def start(self) -> "ExchangeSimulator":
+        # a short poll interval makes stop() return quickly
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), name="ExchangeSimulator", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ExchangeSimulator":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def used_weight(self) -> int:
+        with self._weight_lock:
+            self.__reset_weight_if_new_minute()
+            return self._used_weight
+
+    def request_counts(self) -> Dict[Tuple[str, str], int]:
+        """
+        Returns the number of requests per (method, endpoint).
+        """
+        with self._weight_lock:
+            return dict(self._request_counts)
+
+    def handle(self, method: str, path: str, params: Dict[str, str]) -> Tuple[int, Any, int]:
+        """
+        Returns the http status, the json response and the used weight of the current minute.
+        """
+        endpoint = path.split("/api/", 1)[-1]
+        # strip the api version, e.g. v3/order -> order
+        endpoint = endpoint.split("/", 1)[1] if "/" in endpoint else endpoint
+        route = (method, endpoint)
+        weight = ROUTE_WEIGHTS.get(route, 1)
+        with self._weight_lock:
+            self.__reset_weight_if_new_minute()
+            self._request_counts[route] = self._request_counts.get(route, 0) + 1
+            self._used_weight += weight
+            used_weight = self._used_weight
+        if used_weight > self._weight_limit:
+            return 429, {"code": -1003, "msg": "Too much request weight used; please use the websocket."}, used_weight
+        try:
+            return 200, self.__dispatch(route, params), used_weight
+        except SimulatorError as e:
+            return e.status, {"code": e.code, "msg": e.msg}, used_weight
+
+    def __dispatch(self, route: Tuple[str, str], params: Dict[str, str]) -> Any:
+        engine = self.engine
+        method, endpoint = route
+        if route == ("GET", "ping"):
+            return {}
+        if route == ("GET", "time"):
+            return {"serverTime": engine.now_ms()}
+        if route == ("GET", "exchangeInfo"):
+            return engine.exchange_info()
+        if route == ("GET", "avgPrice"):
+            return {"mins": 5, "price": _format(engine.get_price(params.get("symbol", "")))}
+        if route == ("GET", "ticker/price"):
+            if "symbol" in params:
+                return {"symbol": params["symbol"], "price": _format(engine.get_price(params["symbol"]))}
+            symbols = json.loads(params["symbols"]) if "symbols" in params else engine.symbols()
+            return [{"symbol": s, "price": _format(engine.get_price(s))} for s in symbols]
+        if route == ("GET", "account"):
+            return engine.account()
+        if route == ("POST", "order"):
+            return engine.create_order(params)
+        if route == ("GET", "order"):
+            return engine.get_order(params.get("symbol", ""), int(params.get("orderId", 0)))
+        if route == ("DELETE", "order"):
+            return engine.cancel_order(params.get("symbol", ""), int(params.get("orderId", 0)))
+        if route == ("GET", "openOrders"):
+            return engine.open_orders(params.get("symbol"))
+        if endpoint == "userDataStream":
+            return self.__user_data_stream(method, params)
+        raise SimulatorError(404, -1000, f"Unknown endpoint {method} {endpoint}")
+
+    def __user_data_stream(self, method: str, params: Dict[str, str]) -> Dict[str, Any]:
+        if method == "POST":
+            listen_key = uuid.uuid4().hex
+            self._listen_keys[listen_key] = time.time()
+            return {"listenKey": listen_key}
+        if params.get("listenKey") not in self._listen_keys:
+            raise SimulatorError(400, -1125, "This listenKey does not exist.")
+        if method == "DELETE":
+            del self._listen_keys[params["listenKey"]]
+        else:
+            self._listen_keys[params["listenKey"]] = time.time()
+        return {}
+
+    def __reset_weight_if_new_minute(self) -> None:
+        # binance counts the weight per clock minute
+        minute = int(time.time() // 60)
+        if minute != self._weight_minute:
+            self._weight_minute = minute
+            self._used_weight = 0
+
+
+def _create_handler(simulator: ExchangeSimulator) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            self.__handle("GET")
+
+        def do_POST(self) -> None:
+            self.__handle("POST")
+
+        def do_PUT(self) -> None:
+            self.__handle("PUT")
+
+        def do_DELETE(self) -> None:
+            self.__handle("DELETE")
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def __handle(self, method: str) -> None:
+            url = urlsplit(self.path)
+            params = dict(parse_qsl(url.query))
+            content_length = int(self.headers.get("Content-Length") or 0)
+            if content_length > 0:
+                params.update(parse_qsl(self.rfile.read(content_length).decode()))
+            status, response, used_weight = simulator.handle(method, url.path, params)
+            body = json.dumps(response).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header(WEIGHT_HEADER, str(used_weight))
+            self.send_header(WEIGHT_HEADER_1M, str(used_weight))
+            if status == 429:
+                self.send_header("Retry-After", str(60 - int(time.time()) % 60))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def main() -> None:
+    """
+    Runs the simulator until it is interrupted, e.g.
+    python -m dca_investment_bot.exchange_simulator --port 8080 --symbol BTCUSDT:BTC:USDT:20000 --balance USDT=1000
+    Prices move by a random walk every --price-interval seconds.
+    """
+    import argparse
+    import random
+
+    parser = argparse.ArgumentParser(description="Local stand-in for the binance spot api")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--symbol", action="append", default=[], help="SYMBOL:BASE:QUOTE:PRICE")
+    parser.add_argument("--balance", action="append", default=[], help="ASSET=AMOUNT")
+    parser.add_argument("--price-interval", type=float, default=1.0)
+    parser.add_argument("--volatility", type=float, default=0.001, help="relative price change per step")
+    args = parser.parse_args()
+
+    symbol_specs = args.symbol or ["BTCUSDT:BTC:USDT:20000", "ETHUSDT:ETH:USDT:1500"]
+    symbols = [SimulatedSymbol(*spec.split(":")) for spec in symbol_specs]
+    balances = dict(balance.split("=") for balance in (args.balance or ["USDT=10000"]))
+    engine = MatchingEngine(symbols, balances)
+    with ExchangeSimulator(engine, port=args.port) as simulator:
+        print(f"Exchange simulator running at {simulator.url}")
+        try:
+            while True:
+                time.sleep(args.price_interval)
+                for symbol in symbols:
+                    with decimal.localcontext() as context:
+                        context.prec = 28
+                        change = Decimal(str(1 + random.gauss(0, args.volatility)))
+                        price = (engine.get_price(symbol.symbol) * change).quantize(symbol.tick_size)
+                    for order in engine.set_price(symbol.symbol, price):
+                        print(f"Filled order {order['orderId']} {order['symbol']} at {order['price']}")
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import asyncio
+import random
+import time
+import typing
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from binance.exceptions import BinanceAPIException
+from requests.adapters import HTTPAdapter
+
+from dca_investment_bot.logger import LOG_WARNING
+
+"""
+Transport layer below the python-binance clients of the TradingBot and AsyncTradingBot.
+
+The keep-alive connections of the client session are pooled (DEFAULT_POOL_SIZE), so the threads
+of the bot don't open a new TLS connection for every request.
+Every request gets the (connect, read) timeout of its endpoint (ENDPOINT_TIMEOUTS).
+
+Idempotent requests are retried after network errors and server errors (5xx) with a
+jittered exponential backoff, a short network blip is then bridged within milliseconds.
+Placing and canceling orders is never retried, a lost response doesn't mean the order was not placed.
+"""
+
+T = TypeVar("T")
+
+# network errors after which a request can be sent again (ReadTimeout is no ConnectionError)
+NETWORK_ERRORS: Tuple[typing.Type[BaseException], ...] = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+ASYNC_NETWORK_ERRORS: Tuple[typing.Type[BaseException], ...] = (
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError,
+)
+
+# endpoints (see ENDPOINT_WEIGHTS) whose request must not be sent twice
+NON_IDEMPOTENT_ENDPOINTS = frozenset(["order_post", "order_delete"])
+
+# threads sharing the client session: main loop, order checker, exchange info refresh,
+# user data stream keepalive and the workers of the MarketSnapshotFetcher
+DEFAULT_POOL_SIZE = 16
+
+# (connect, read) timeout in seconds of the api paths, the default is used for all others
+DEFAULT_TIMEOUT = (3.05, 5.0)
+ENDPOINT_TIMEOUTS: typing.Dict[str, Tuple[float, float]] = {
+    # several MB on the mainnet
+    "exchangeInfo": (3.05, 30.0),
+    # a timed out order can't be retried, so the response gets more time
+    "order": (3.05, 10.0),
+}
+
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF_BASE = 0.05
+DEFAULT_BACKOFF_MAX = 15.0
+
+
+class EndpointTimeoutAdapter(HTTPAdapter):
+    """
+    Pooled HTTPAdapter that sets the timeout of the endpoint for every request.
+    python-binance always passes its REQUEST_TIMEOUT, it is replaced.
+    """
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Optional[Union[float, Tuple[Optional[float], Optional[float]]]] = None,
+        verify: Union[bool, str] = True,
+        cert: Optional[Union[str, Tuple[str, str]]] = None,
+        proxies: Optional[Dict[str, str]] = None,
+    ) -> requests.Response:
+        return super().send(
+            request,
+            stream=stream,
+            timeout=endpoint_timeout(request.url or ""),
+            verify=verify,
+            cert=cert,
+            proxies=proxies,
+        )
+
+
+class HttpTransport:
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        retries: int = DEFAULT_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        retries is the number of times an idempotent request is sent again,
+        the backoff before retry n is random between 0 and min(backoff_max, backoff_base * 2**n).
+        """
+        self._debug_tag = "[HttpTransport]"
+        self._pool_size = pool_size
+        self._retries = retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._sleep = sleep
+
+    def mount(self, session: requests.Session) -> None:
+        """
+        Replaces the adapters of the session (e.g. client.session of the python-binance Client).
+        """
+        adapter = EndpointTimeoutAdapter(pool_connections=2, pool_maxsize=self._pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns the seconds to wait before the attempt (0 is the first retry), with full jitter
+        so the threads of the bot don't retry at the same time.
+        """
+        return random.uniform(0, min(self._backoff_max, self._backoff_base * 2**attempt))
+
+    def call(self, endpoint: str, request: Callable[[], T]) -> T:
+        """
+        Returns the result of request, retried on transient errors if the endpoint is idempotent.
+        """
+        attempt = 0
+        while True:
+            try:
+                return request()
+            except (*NETWORK_ERRORS, BinanceAPIException) as e:
+                if not self.__should_retry(endpoint, attempt, e):
+                    raise
+                delay = self.backoff(attempt)
+                LOG_WARNING(self._debug_tag, f"Request {endpoint} failed, retrying in {delay:.3f}s:", e)
+                self._sleep(delay)
+            attempt += 1
+
+    async def call_async(self, endpoint: str, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Same as call() for the coroutines of the AsyncTradingBot.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await request()
+            except (*ASYNC_NETWORK_ERRORS, BinanceAPIException) as e:
+                if not self.__should_retry(endpoint, attempt, e):
+                    raise
+                delay = self.backoff(attempt)
+                LOG_WARNING(self._debug_tag, f"Request {endpoint} failed, retrying in {delay:.3f}s:", e)
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    def __should_retry(self, endpoint: str, attempt: int, error: BaseException) -> bool:
+        if endpoint in NON_IDEMPOTENT_ENDPOINTS or attempt >= self._retries:
+            return False
+        if isinstance(error, BinanceAPIException):
+            # client errors (e.g. 429 or a rejected order) are not transient
+            status_code: int = error.status_code
+            return status_code >= 500
+        return True
+
+
+def endpoint_timeout(url: str) -> Tuple[float, float]:
+    """
+    Returns the timeout of the api path of the url (e.g. "order" for https://api.binance.com/api/v3/order).
+    """
+    api_path = urlsplit(url).path.partition("/v3/")[2]
+    return ENDPOINT_TIMEOUTS.get(api_path, DEFAULT_TIMEOUT)
@@ -0,0 +1,95 @@
+import heapq
+import itertools
+import threading
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
+from dca_investment_bot.dca_investment_parameter import DCAInvestmentParameter
+
+"""
+Keeps track of the next due time of every DCA investment strategy.
+The strategies are stored in a min-heap so the main loop can sleep until
+the earliest due time or until an external event (e.g. an order got filled
+or the config changed) wakes it up.
+"""
+
+
+class InvestmentScheduler:
+    def __init__(self, clock: Clock = SYSTEM_CLOCK) -> None:
+        self._debug_tag = "[InvestmentScheduler]"
+        self._clock = clock
+        # entries are (due_timestamp, sequence, strategy), the sequence keeps the ordering stable
+        self._heap: List[Tuple[float, int, DCAInvestmentParameter]] = []
+        self._sequence = itertools.count()
+        # current due timestamp per strategy, used to skip outdated heap entries
+        self._due_timestamps: Dict[int, float] = {}
+        self._wakeup_event = threading.Event()
+
+    def schedule(self, strategy: DCAInvestmentParameter, due_timestamp: float) -> None:
+        """
+        Schedules (or reschedules) the strategy at the given unix timestamp.
+        """
+        self._due_timestamps[id(strategy)] = due_timestamp
+        heapq.heappush(self._heap, (due_timestamp, next(self._sequence), strategy))
+
+    def unschedule_all(self) -> None:
+        """
+        Removes all scheduled strategies.
+        """
+        self._heap = []
+        self._due_timestamps = {}
+
+    def next_due_timestamp(self) -> Optional[float]:
+        """
+        Returns the earliest due timestamp or None if no strategy is scheduled.
+        """
+        self.__drop_outdated_entries()
+        if len(self._heap) == 0:
+            return None
+        return self._heap[0][0]
+
+    def pop_due_strategies(self, now_timestamp: float) -> List[DCAInvestmentParameter]:
+        """
+        Removes and returns all strategies that are due at the given timestamp.
+        """
+        due_strategies = []
+        self.__drop_outdated_entries()
+        while len(self._heap) > 0 and self._heap[0][0] <= now_timestamp:
+            _, _, strategy = heapq.heappop(self._heap)
+            del self._due_timestamps[id(strategy)]
+            due_strategies.append(strategy)
+            self.__drop_outdated_entries()
+        return due_strategies
+
+    def wait_until_next_due(self, now_timestamp: float, max_wait: float) -> bool:
+        """
+        Blocks until the next strategy is due, max_wait seconds passed or notify() is called.
+        Returns True if the wait was interrupted by notify().
+        """
+        wait_time = max_wait
+        next_due = self.next_due_timestamp()
+        if next_due is not None:
+            wait_time = min(max_wait, max(0.0, next_due - now_timestamp))
+
+        woken_up = self._clock.wait(self._wakeup_event, wait_time)
+        self._wakeup_event.clear()
+        return woken_up
+
+    def notify(self) -> None:
+        """
+        Wakes up the waiting main loop, e.g. after an order got filled.
+        Can be called from any thread.
+        """
+        self._wakeup_event.set()
+
+    def __drop_outdated_entries(self) -> None:
+        # entries that were rescheduled stay in the heap until they reach the top
+        while len(self._heap) > 0:
+            due_timestamp, _, strategy = self._heap[0]
+            if self._due_timestamps.get(id(strategy)) == due_timestamp:
+                return
+            heapq.heappop(self._heap)
@@ -0,0 +1,415 @@
+import datetime
+import gc
+import json
+import math
+import os
+import sys
+import threading
+import time
+from decimal import Decimal
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from binance.enums import ORDER_STATUS_FILLED
+from binance.enums import ORDER_TYPE_LIMIT
+from binance.enums import SIDE_BUY
+from binance.enums import TIME_IN_FORCE_GTC
+
+from dca_investment_bot.clock import VirtualClock
+from dca_investment_bot.config_manager import ConfigManager
+from dca_investment_bot.exchange_simulator import MatchingEngine
+from dca_investment_bot.exchange_simulator import SimulatedClient
+from dca_investment_bot.exchange_simulator import SimulatedSymbol
+from dca_investment_bot.order_fulfilled_checker_thread import OrderFulfilledChecker
+from dca_investment_bot.paper_trading import PaperTradingInvester
+from dca_investment_bot.paths import Paths
+from dca_investment_bot.request_weight_limiter import DEFAULT_REQUEST_WEIGHT_LIMIT
+from dca_investment_bot.request_weight_limiter import ENDPOINT_WEIGHTS
+
+"""
+Load test: how many strategies one bot process handles before a cycle of the main loop
+takes longer than the check interval.
+
+For every strategy count a directory with a synthetic dca_investment_parameter.json
+and order history (history_days daily investments per strategy) is generated.
+The unchanged DCAInvester main loop then runs days days of virtual time against a MatchingEngine
+(see paper_trading.py). All strategies invest at the same time of day, so every day
+has one cycle in which all strategies are due (the worst case).
+
+The virtual time stands still while the main loop is busy, so the measured cycle latency
+is the wall time the bot needs, without network latency.
+Reported per strategy count: cycle latency percentiles, requests and request weight per cycle,
+CPU time and the growth of the peak memory (resident set size) of the process.
+The simulated exchange has no request weight limit, the time a cycle would need at least
+with the configured limit (request_weight_limit per minute) is reported separately.
+
+python -m dca_investment_bot.load_test --strategies 10 100 1000 10000 --output load_test.json
+"""
+
+DEFAULT_STRATEGY_COUNTS = [10, 100, 1000, 10000]
+DEFAULT_HISTORY_DAYS = 30
+DEFAULT_DAYS = 7
+DEFAULT_CHECK_INTERVAL = 3600
+
+LOAD_TEST_START_TIME = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+LOAD_TEST_INVESTMENT_TIME = 12 * 60 * 60
+LOAD_TEST_QUOTE_ASSET = "USDT"
+LOAD_TEST_PRICE = Decimal("1000")
+DAY = 24 * 60 * 60
+
+# endpoint (see ENDPOINT_WEIGHTS) of the client methods used by the bot
+CLIENT_METHOD_ENDPOINTS = {
+    "get_exchange_info": "exchangeInfo",
+    "get_avg_price": "avgPrice",
+    "get_symbol_ticker": "tickerPrice",
+    "get_account": "account",
+    "get_order": "order_get",
+    "create_order": "order_post",
+    "cancel_order": "order_delete",
+    "get_open_orders": "openOrders",
+}
+
+
+class RequestCountingClient:
+    """
+    Forwards every call to the client and counts the requests and their weight,
+    the requests of the order checker separately.
+    """
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+        self._lock = threading.Lock()
+        self.main_loop_requests = 0
+        self.main_loop_weight = 0
+        self.checker_requests = 0
+        self.checker_weight = 0
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        weight = ENDPOINT_WEIGHTS.get(CLIENT_METHOD_ENDPOINTS.get(name, ""), 1)
+
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            with self._lock:
+                if isinstance(threading.current_thread(), OrderFulfilledChecker):
+                    self.checker_requests += 1
+                    self.checker_weight += weight
+                else:
+                    # the main thread and its market snapshot thread pool
+                    self.main_loop_requests += 1
+                    self.main_loop_weight += weight
+            return attribute(*args, **kwargs)
+
+        return counted
+
+
+class LoadTestInvester(PaperTradingInvester):
+    """
+    Measures every cycle of the main loop in which strategies were due.
+    """
+
+    def __init__(self, config_manager: ConfigManager, engine: MatchingEngine, clock: VirtualClock, end_time: float):
+        super().__init__(config_manager, engine, clock, end_time)
+        self._debug_tag = "[LoadTest]"
+        self.client = RequestCountingClient(SimulatedClient(engine))
+        # one dict per cycle (strategies, latency, cpu_seconds, requests, weight)
+        self.cycles: List[Dict[str, Any]] = []
+
+    def create_client(self) -> Any:
+        return self.client
+
+    def check_due_strategies(self, check_interval: int) -> int:
+        requests_before = self.client.main_loop_requests
+        weight_before = self.client.main_loop_weight
+        cpu_before = time.process_time()
+        started_at = time.perf_counter()
+        checked_strategies = super().check_due_strategies(check_interval)
+        latency = time.perf_counter() - started_at
+        if checked_strategies > 0:
+            self.cycles.append(
+                {
+                    "strategies": checked_strategies,
+                    "latency": latency,
+                    "cpu_seconds": time.process_time() - cpu_before,
+                    "requests": self.client.main_loop_requests - requests_before,
+                    "weight": self.client.main_loop_weight - weight_before,
+                }
+            )
+        return checked_strategies
+
+
+def run_load_tests(
+    strategy_counts: Sequence[int] = DEFAULT_STRATEGY_COUNTS,
+    history_days: int = DEFAULT_HISTORY_DAYS,
+    days: int = DEFAULT_DAYS,
+    check_interval: int = DEFAULT_CHECK_INTERVAL,
+    request_weight_limit: int = DEFAULT_REQUEST_WEIGHT_LIMIT,
+    directory: str = "load_test",
+) -> Dict[str, Any]:
+    """
+    Runs a load test for every strategy count (smallest first) in a subdirectory of directory.
+    Returns the results of all runs and the capacity (see capacity).
+    """
+    runs = []
+    for strategy_count in sorted(strategy_counts):
+        run_directory = os.path.join(directory, f"strategies_{strategy_count}")
+        runs.append(
+            run_load_test(strategy_count, run_directory, history_days, days, check_interval, request_weight_limit)
+        )
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "check_interval": check_interval,
+        "request_weight_limit": request_weight_limit,
+        "runs": runs,
+        "capacity": capacity(runs, check_interval),
+    }
+
+
+def run_load_test(
+    strategy_count: int,
+    directory: str,
+    history_days: int = DEFAULT_HISTORY_DAYS,
+    days: int = DEFAULT_DAYS,
+    check_interval: int = DEFAULT_CHECK_INTERVAL,
+    request_weight_limit: int = DEFAULT_REQUEST_WEIGHT_LIMIT,
+) -> Dict[str, Any]:
+    """
+    Generates the configs and order history in directory and runs the bot with strategy_count strategies
+    for days days. The bot uses directory as working directory (the paths of Paths are relative).
+    """
+    symbols = [f"COIN{i}{LOAD_TEST_QUOTE_ASSET}" for i in range(strategy_count)]
+    os.makedirs(directory, exist_ok=True)
+    previous_directory = os.getcwd()
+    os.chdir(directory)
+    try:
+        write_strategies(Paths.dca_file_path, symbols)
+        write_order_history(Paths.order_filepath, symbols, history_days)
+
+        gc.collect()
+        max_rss_before = max_rss_mb()
+        cpu_before = time.process_time()
+        started_at = time.perf_counter()
+
+        clock = VirtualClock(LOAD_TEST_START_TIME, tz=datetime.timezone.utc)
+        engine = MatchingEngine(
+            [
+                SimulatedSymbol(symbol, symbol[: -len(LOAD_TEST_QUOTE_ASSET)], LOAD_TEST_QUOTE_ASSET, LOAD_TEST_PRICE)
+                for symbol in symbols
+            ],
+            {LOAD_TEST_QUOTE_ASSET: str(strategy_count * days * 1000)},
+            time_function=clock.time,
+        )
+        invester = LoadTestInvester(
+            create_config_manager(check_interval, request_weight_limit),
+            engine,
+            clock,
+            LOAD_TEST_START_TIME + days * DAY,
+        )
+        invester.run()
+
+        wall_seconds = time.perf_counter() - started_at
+        cpu_seconds = time.process_time() - cpu_before
+        max_rss_after = max_rss_mb()
+    finally:
+        os.chdir(previous_directory)
+
+    latencies = [cycle["latency"] for cycle in invester.cycles]
+    requests = [cycle["requests"] for cycle in invester.cycles]
+    max_weight = max((cycle["weight"] for cycle in invester.cycles), default=None)
+    return {
+        "strategies": strategy_count,
+        "history_orders": strategy_count * history_days,
+        "days": days,
+        "filled_orders": len(invester.engine_fills),
+        "cycles": len(invester.cycles),
+        "max_strategies_per_cycle": max((cycle["strategies"] for cycle in invester.cycles), default=0),
+        "cycle_latency": {
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies, default=None),
+        },
+        "requests_per_cycle": {
+            "mean": sum(requests) / len(requests) if len(requests) > 0 else None,
+            "max": max(requests, default=None),
+        },
+        "max_weight_per_cycle": max_weight,
+        # the request weight limit is per minute
+        "min_cycle_seconds_at_weight_limit": max_weight * 60 / request_weight_limit if max_weight is not None else None,
+        "checker_requests": invester.client.checker_requests,
+        "checker_weight": invester.client.checker_weight,
+        "cycle_cpu_seconds": sum(cycle["cpu_seconds"] for cycle in invester.cycles),
+        "cpu_seconds": cpu_seconds,
+        "wall_seconds": wall_seconds,
+        "max_rss_mb": max_rss_after,
+        "max_rss_growth_mb": (
+            max_rss_after - max_rss_before if max_rss_after is not None and max_rss_before is not None else None
+        ),
+    }
+
+
+def capacity(runs: List[Dict[str, Any]], check_interval: int) -> Dict[str, Any]:
+    """
+    Returns the largest tested strategy count whose slowest cycle fits into the check interval,
+    once by cycle latency and once also waiting for the request weight limit.
+    """
+    measured_runs = [run for run in runs if run["cycles"] > 0]
+    fitting_latency = [run["strategies"] for run in measured_runs if run["cycle_latency"]["max"] <= check_interval]
+    fitting_weight = [
+        run["strategies"]
+        for run in measured_runs
+        if max(run["cycle_latency"]["max"], run["min_cycle_seconds_at_weight_limit"]) <= check_interval
+    ]
+    return {
+        "max_strategies_by_latency": max(fitting_latency, default=None),
+        "max_strategies_by_latency_and_weight_limit": max(fitting_weight, default=None),
+    }
+
+
+def percentile(values: Sequence[float], percent: float) -> Optional[float]:
+    """
+    Nearest-rank percentile, None for no values.
+    """
+    if len(values) == 0:
+        return None
+    sorted_values = sorted(values)
+    rank = max(1, math.ceil(len(sorted_values) * percent / 100))
+    return sorted_values[rank - 1]
+
+
+def max_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of the process in MB, None if the platform does not report it (windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macos, kilobytes on linux
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def create_config_manager(check_interval: int, request_weight_limit: int) -> ConfigManager:
+    config_manager = ConfigManager()
+    config_manager.use_testnet = True
+    config_manager.check_interval = check_interval
+    config_manager.sync_fulfilled_orders_to_firebase = False
+    config_manager.use_firebase = False
+    config_manager.max_concurrent_requests = 5
+    config_manager.request_weight_limit = request_weight_limit
+    config_manager.price_max_age = 10
+    config_manager.exchange_info_ttl = 86400
+    config_manager.use_user_data_stream = False
+    config_manager.use_order_journal = True
+    config_manager.use_order_database = False
+    config_manager.api_url = ""
+    return config_manager
+
+
+def write_strategies(filepath: str, symbols: Sequence[str]) -> None:
+    """
+    Writes a daily strategy for every symbol, all strategies invest at the same time.
+    """
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    investment_time = f"{LOAD_TEST_INVESTMENT_TIME // 3600:02d}:{LOAD_TEST_INVESTMENT_TIME % 3600 // 60:02d}"
+    start_date = datetime.datetime.fromtimestamp(LOAD_TEST_START_TIME, tz=datetime.timezone.utc)
+    with open(filepath, "w") as f:
+        json.dump(
+            [
+                {
+                    "symbol": symbol,
+                    "investment_amount_quoteasset": 100,
+                    "interval": "1d",
+                    "investment_time": investment_time,
+                    "start_date": (start_date - datetime.timedelta(days=365)).strftime("%Y-%m-%d"),
+                }
+                for symbol in symbols
+            ],
+            f,
+        )
+
+
+def write_order_history(filepath: str, symbols: Sequence[str], history_days: int) -> None:
+    """
+    Writes one filled order per symbol and day for the history_days days before the start.
+    The last investment was the day before the start, so every strategy is due on the first day.
+    """
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    orders = []
+    order_id = 1
+    for day in range(history_days, 0, -1):
+        order_time = int((LOAD_TEST_START_TIME - day * DAY + LOAD_TEST_INVESTMENT_TIME) * 1000)
+        for symbol in symbols:
+            orders.append(
+                {
+                    "symbol": symbol,
+                    "orderId": order_id,
+                    "orderListId": -1,
+                    "clientOrderId": f"history{order_id}",
+                    "price": "1000.00000000",
+                    "origQty": "0.10000000",
+                    "executedQty": "0.10000000",
+                    "cummulativeQuoteQty": "100.00000000",
+                    "status": ORDER_STATUS_FILLED,
+                    "timeInForce": TIME_IN_FORCE_GTC,
+                    "type": ORDER_TYPE_LIMIT,
+                    "side": SIDE_BUY,
+                    "stopPrice": "0.00000000",
+                    "icebergQty": "0.00000000",
+                    "time": order_time,
+                    "updateTime": order_time,
+                    "isWorking": True,
+                    "origQuoteOrderQty": "0.00000000",
+                }
+            )
+            order_id += 1
+    with open(filepath, "w") as f:
+        json.dump(orders, f)
+
+
+def main() -> None:
+    import argparse
+
+    from dca_investment_bot.logger import init_logger
+
+    parser = argparse.ArgumentParser(description="Measures how many strategies the DCA bot handles")
+    parser.add_argument("--strategies", type=int, nargs="+", default=DEFAULT_STRATEGY_COUNTS)
+    parser.add_argument("--history-days", type=int, default=DEFAULT_HISTORY_DAYS)
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="virtual days every run lasts")
+    parser.add_argument("--check-interval", type=int, default=DEFAULT_CHECK_INTERVAL)
+    parser.add_argument("--request-weight-limit", type=int, default=DEFAULT_REQUEST_WEIGHT_LIMIT)
+    parser.add_argument("--directory", default="load_test", help="the generated configs and orders are stored here")
+    parser.add_argument("--output", default="load_test.json", help="json file the results are written to")
+    parser.add_argument("--log-level", default="WARNING", help="log level of the bot during the load test")
+    args = parser.parse_args()
+
+    init_logger(args.log_level, "load_test.log")
+    results = run_load_tests(
+        args.strategies, args.history_days, args.days, args.check_interval, args.request_weight_limit, args.directory
+    )
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    for run in results["runs"]:
+        latency = run["cycle_latency"]
+        if run["cycles"] == 0:
+            print(f"{run['strategies']:6} strategies: no strategy was due")
+            continue
+        memory = f", max rss {run['max_rss_mb']:.0f} MB" if run["max_rss_mb"] is not None else ""
+        print(
+            f"{run['strategies']:6} strategies: {run['cycles']} cycles, "
+            f"latency p50 {latency['p50']:.3f}s p99 {latency['p99']:.3f}s max {latency['max']:.3f}s, "
+            f"{run['requests_per_cycle']['max']} requests (weight {run['max_weight_per_cycle']}) per cycle, "
+            f"{run['cpu_seconds']:.1f}s cpu{memory}"
+        )
+    print("Capacity:", results["capacity"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 import os
 import traceback
 from logging import basicConfig
+from logging import DEBUG
 from logging import ERROR
 from logging import getLevelName
 from logging import getLogger
+from logging import INFO
 from logging import Logger
 from logging import StreamHandler
 from logging.handlers import TimedRotatingFileHandler
@@ -73,7 +75,7 @@ def log_to_error_file(*args):
 def LOG_INFO(*args):
     if not logger_initialized:
         log_to_error_file(*args)
-    else:
+    elif logger.isEnabledFor(INFO):
         logger.info(__concat_args(*args))
 
 
@@ -104,10 +106,24 @@ def LOG_WARNING_AND_NOTIFY(*args):
         global_vars.firebaseMessager.push_notification("Warning!", __concat_args(*args))
 
 
+def is_debug_enabled() -> bool:
+    """
+    Use this to skip building expensive debug messages when DEBUG is off.
+    """
+    return not logger_initialized or logger.isEnabledFor(DEBUG)
+
+
+def is_info_enabled() -> bool:
+    """
+    Use this to skip building expensive info messages when INFO is off.
+    """
+    return not logger_initialized or logger.isEnabledFor(INFO)
+
+
 def LOG_DEBUG(*args):
     if not logger_initialized:
         log_to_error_file(*args)
-    else:
+    elif logger.isEnabledFor(DEBUG):
         logger.debug(__concat_args(*args))
 
 
@@ -0,0 +1,212 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any
+from typing import Awaitable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+
+from dca_investment_bot.async_trading_bot import AsyncTradingBot
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.exceptions import PriceNotAvailableException
+from dca_investment_bot.exceptions import UnknownSymbolException
+from dca_investment_bot.logger import LOG_DEBUG
+from dca_investment_bot.logger import LOG_ERROR_AND_NOTIFY
+from dca_investment_bot.request_weight_limiter import PRIORITY_LOW
+from dca_investment_bot.trading_bot import TradingBot
+
+"""
+Fetches the market and account data of multiple symbols in parallel.
+The requests are made with a bounded thread pool (or bounded number of
+coroutines for the AsyncTradingBot), the request weight limit is
+enforced by the RequestWeightLimiter of the bot.
+The open orders are only logged, so they are requested with a low priority.
+Symbols the exchange does not know or returns no price for are left out of the result,
+so one misconfigured symbol does not stop the strategies of the other symbols.
+"""
+
+
+class MarketSnapshot:
+    """
+    Market and account data of a symbol at the time of the investment check
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        symbol_info: Dict[str, Any],
+        avg_price: Decimal,
+        base_balance: Optional[Decimal],
+        quote_balance: Optional[Decimal],
+        open_orders: List[BinanceOrder],
+    ) -> None:
+        self.symbol = symbol
+        self.symbol_info = symbol_info
+        self.base_asset: str = symbol_info["baseAsset"]
+        self.quote_asset: str = symbol_info["quoteAsset"]
+        self.avg_price = avg_price
+        self.base_balance = base_balance
+        self.quote_balance = quote_balance
+        self.open_orders = open_orders
+
+
+class MarketSnapshotFetcher:
+    def __init__(self, bot: TradingBot, max_workers: int = 5) -> None:
+        self._debug_tag = "[MarketSnapshotFetcher]"
+        self._bot = bot
+        self._max_workers = max(1, max_workers)
+
+    def fetch(self, symbols: List[str]) -> Dict[str, MarketSnapshot]:
+        """
+        Fetches a MarketSnapshot for every symbol, symbols without symbol info or price are left out.
+        Exceptions raised by a request (e.g. ReadTimeout) are re-raised.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if len(symbols) == 0:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="MarketSnapshot") as executor:
+            # symbol info is needed to know the assets, it is usually cached
+            symbol_info_futures = {symbol: executor.submit(self._bot.get_symbol_info, symbol) for symbol in symbols}
+            symbol_infos = {}
+            for symbol, future in symbol_info_futures.items():
+                try:
+                    symbol_infos[symbol] = future.result()
+                except UnknownSymbolException as e:
+                    self.__log_skipped_symbol(e)
+            symbols = [symbol for symbol in symbols if symbol in symbol_infos]
+
+            assets = set()
+            for symbol_info in symbol_infos.values():
+                assets.add(symbol_info["baseAsset"])
+                assets.add(symbol_info["quoteAsset"])
+
+            # every remaining request is independent, so all of them are made at the same time
+            # all prices are fetched with a single request
+            prices_future = executor.submit(self.__get_prices, symbols)
+            open_order_futures = {
+                symbol: executor.submit(self._bot.get_orders, symbol, PRIORITY_LOW) for symbol in symbols
+            }
+            # all balances are served from a single account snapshot
+            balances_future = executor.submit(self.__get_balances, assets)
+
+            balances = balances_future.result()
+            prices = prices_future.result()
+            snapshots = {}
+            for symbol in symbols:
+                if symbol not in prices:
+                    continue
+                symbol_info = symbol_infos[symbol]
+                snapshots[symbol] = MarketSnapshot(
+                    symbol=symbol,
+                    symbol_info=symbol_info,
+                    avg_price=prices[symbol],
+                    base_balance=balances[symbol_info["baseAsset"]],
+                    quote_balance=balances[symbol_info["quoteAsset"]],
+                    open_orders=open_order_futures[symbol].result(),
+                )
+
+        LOG_DEBUG(self._debug_tag, f"Fetched market data for {len(symbols)} symbols and {len(assets)} assets")
+        return snapshots
+
+    def __get_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        prices = {}
+        for symbol in symbols:
+            try:
+                prices[symbol] = self._bot.get_avg_price(symbol)
+            except PriceNotAvailableException as e:
+                self.__log_skipped_symbol(e)
+        return prices
+
+    def __log_skipped_symbol(self, error: Exception) -> None:
+        LOG_ERROR_AND_NOTIFY(self._debug_tag, f"{error}, skipping the strategies of the symbol")
+
+    def __get_balances(self, assets: Set[str]) -> Dict[str, Optional[Decimal]]:
+        return {asset: self._bot.get_asset_balance(asset) for asset in assets}
+
+
+class AsyncMarketSnapshotFetcher:
+    """
+    Same as MarketSnapshotFetcher but uses the AsyncTradingBot.
+    At most max_concurrent_requests requests are in flight at the same time.
+    """
+
+    def __init__(self, bot: AsyncTradingBot, max_concurrent_requests: int = 5) -> None:
+        self._debug_tag = "[AsyncMarketSnapshotFetcher]"
+        self._bot = bot
+        self._max_concurrent_requests = max(1, max_concurrent_requests)
+
+    async def fetch(self, symbols: List[str]) -> Dict[str, MarketSnapshot]:
+        symbols = list(dict.fromkeys(symbols))
+        if len(symbols) == 0:
+            return {}
+
+        semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+
+        async def limited(coroutine: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await coroutine
+
+        async def get_symbol_info(symbol: str) -> Optional[Dict[str, Any]]:
+            try:
+                symbol_info: Dict[str, Any] = await limited(self._bot.get_symbol_info(symbol))
+                return symbol_info
+            except UnknownSymbolException as e:
+                self.__log_skipped_symbol(e)
+                return None
+
+        # symbol info is needed to know the assets, it is usually cached
+        symbol_info_list = await asyncio.gather(*[get_symbol_info(symbol) for symbol in symbols])
+        symbol_infos = {symbol: info for symbol, info in zip(symbols, symbol_info_list) if info is not None}
+        symbols = [symbol for symbol in symbols if symbol in symbol_infos]
+        if len(symbols) == 0:
+            return {}
+
+        assets = set()
+        for symbol_info in symbol_infos.values():
+            assets.add(symbol_info["baseAsset"])
+            assets.add(symbol_info["quoteAsset"])
+
+        async def get_avg_price(symbol: str) -> Optional[Decimal]:
+            try:
+                return await self._bot.get_avg_price(symbol)
+            except PriceNotAvailableException as e:
+                self.__log_skipped_symbol(e)
+                return None
+
+        # prices and balances are fetched with a single request each, the first lookup triggers it
+        prices_and_balances = asyncio.gather(
+            limited(self._bot.get_avg_price(symbols[0])),
+            limited(self._bot.get_asset_balance(next(iter(assets)))),
+            return_exceptions=True,
+        )
+        open_order_list = await asyncio.gather(
+            *[limited(self._bot.get_orders(symbol, PRIORITY_LOW)) for symbol in symbols]
+        )
+        for result in await prices_and_balances:
+            # the price of a single symbol may be missing, it is logged below
+            if isinstance(result, Exception) and not isinstance(result, PriceNotAvailableException):
+                raise result
+
+        snapshots = {}
+        for symbol, open_orders in zip(symbols, open_order_list):
+            avg_price = await get_avg_price(symbol)
+            if avg_price is None:
+                continue
+            symbol_info = symbol_infos[symbol]
+            snapshots[symbol] = MarketSnapshot(
+                symbol=symbol,
+                symbol_info=symbol_info,
+                avg_price=avg_price,
+                base_balance=await self._bot.get_asset_balance(symbol_info["baseAsset"]),
+                quote_balance=await self._bot.get_asset_balance(symbol_info["quoteAsset"]),
+                open_orders=open_orders,
+            )
+
+        LOG_DEBUG(self._debug_tag, f"Fetched market data for {len(symbols)} symbols and {len(assets)} assets")
+        return snapshots
+
+    def __log_skipped_symbol(self, error: Exception) -> None:
+        LOG_ERROR_AND_NOTIFY(self._debug_tag, f"{error}, skipping the strategies of the symbol")
@@ -1,9 +1,14 @@
+import asyncio
 import threading
-import time
+from typing import Dict
+from typing import List
 
 from binance.enums import ORDER_STATUS_FILLED
 
 import dca_investment_bot.global_vars as global_vars
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
 from dca_investment_bot.exceptions import KillProcessException
 from dca_investment_bot.exceptions import NoCallbackDefinedException
 from dca_investment_bot.logger import log_and_raise_exeption
@@ -13,15 +18,18 @@ from dca_investment_bot.logger import LOG_ERROR_AND_NOTIFY
 from dca_investment_bot.logger import LOG_INFO
 from dca_investment_bot.logger import LOG_WARNING_AND_NOTIFY
 from dca_investment_bot.order_list_manager import OrderListManager
-
-# TODO: maybe implement mutex using threading.Lock()
-# mutex = threading.Lock()
+from dca_investment_bot.order_poll_schedule import MIN_POLL_INTERVAL
+from dca_investment_bot.order_poll_schedule import OrderPollSchedule
+from dca_investment_bot.request_weight_limiter import ENDPOINT_WEIGHTS
 
 """
 This class is responsible for checking if an order is fulfilled.
 If it is, it will call the callback function.
 """
 
+# seconds between two status requests of all unfulfilled orders without get_open_orders_callback
+STATUS_POLL_INTERVAL = 5
+
 
 class OrderFulfilledChecker(threading.Thread):
     def __init__(
@@ -29,43 +37,49 @@ class OrderFulfilledChecker(threading.Thread):
         order_manager: OrderListManager,
         on_order_filled_callback,
         get_order_status_callback,
+        get_open_orders_callback=None,
+        clock: Clock = SYSTEM_CLOCK,
     ) -> None:
+        """
+        If get_open_orders_callback is set, the orders are polled per symbol
+        (see __poll_due_symbols), otherwise the status of every order is requested every STATUS_POLL_INTERVAL seconds.
+        """
         super().__init__()
 
         self._debug_tag = "[Thread - Fullfilled Order Checker]"
         self._order_manager = order_manager
         self._on_order_filled_callback = on_order_filled_callback
         self._get_order_status_callback = get_order_status_callback
+        self._get_open_orders_callback = get_open_orders_callback
+        self._poll_schedule = OrderPollSchedule()
+        self._clock = clock
         self._thread_running = False
+        # interrupts the wait between two polls when the checker is stopped
+        self._wakeup_event = threading.Event()
 
     def stop_and_join(self):
-        self._thread_running = False
+        self.stop()
         self.join()
 
+    def stop(self):
+        """
+        Stops the checker, also used when it runs as coroutine (see run_async).
+        """
+        self._thread_running = False
+        self._wakeup_event.set()
+
     def run(self) -> None:
         self._thread_running = True
         # check continuously unfullfilled orders and wait for them to be fullfilled
         try:
             while self._thread_running:
-                time.sleep(5)
-
-                for order in self._order_manager.unfulfilled_orders():
-                    binance_order = self.__get_order_status(order.symbol, order.orderId)
-
-                    if binance_order is None:
-                        continue
-
-                    # TODO: check cases where order is just partially filled
-                    if binance_order.status == ORDER_STATUS_FILLED:
-                        self.__on_order_filled(binance_order)
-
-                        self._order_manager.unfulfilled_orders().remove(order)
-                        self._order_manager.fulfilled_orders().append(binance_order)
-                        LOG_INFO(self._debug_tag, "Order fully filled:", binance_order)
-                        self._order_manager.store_orders_to_file()
-
-                        if global_vars.firebaseStorage is not None:
-                            global_vars.firebaseStorage.set_fulfilled_orders(self._order_manager.fulfilled_orders())
+                if self._get_open_orders_callback is not None:
+                    wait_time = self.__seconds_until_next_poll()
+                else:
+                    wait_time = STATUS_POLL_INTERVAL
+                if self._clock.wait(self._wakeup_event, wait_time):
+                    continue
+                self.check_unfulfilled_orders()
         except (KillProcessException, KeyboardInterrupt) as e:
             # this should not happen since it is called
             # in a seperate thread but just in case
@@ -81,7 +95,108 @@ class OrderFulfilledChecker(threading.Thread):
             log_and_raise_exeption(e, self._debug_tag)
         LOG_DEBUG(self._debug_tag, "Order listener stopped")
 
-    def __get_order_status(self, symbol, order_id):
+    def check_unfulfilled_orders(self) -> None:
+        """
+        One iteration of the checker: requests the status of the unfulfilled orders and handles the filled ones.
+        """
+        if self._get_open_orders_callback is not None:
+            self.__poll_due_symbols()
+            return
+        # iterate over a copy since filled orders are removed from the list
+        for order in list(self._order_manager.unfulfilled_orders()):
+            binance_order = self._get_order_status(order.symbol, order.orderId)
+            self._handle_order_status(order, binance_order)
+
+    async def run_async(self) -> None:
+        """
+        Same as run() but runs as coroutine on the event loop instead of in a separate thread.
+        get_order_status_callback has to be a coroutine function,
+        the status of all unfulfilled orders is requested at the same time.
+        """
+        self._thread_running = True
+        try:
+            while self._thread_running:
+                await self._clock.sleep_async(STATUS_POLL_INTERVAL)
+
+                orders = list(self._order_manager.unfulfilled_orders())
+                if self._get_order_status_callback is None:
+                    self._get_order_status(None, None)
+                binance_orders = await asyncio.gather(
+                    *[self._get_order_status_callback(order.symbol, order.orderId) for order in orders]
+                )
+                for order, binance_order in zip(orders, binance_orders):
+                    self._handle_order_status(order, binance_order)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOG_ERROR_AND_NOTIFY(self._debug_tag, "Error while checking unfullfilled orders:", e)
+            LOG_ERROR_AND_NOTIFY(self._debug_tag, "Order listener stopped")
+            log_and_raise_exeption(e, self._debug_tag)
+        LOG_DEBUG(self._debug_tag, "Order listener stopped")
+
+    def __seconds_until_next_poll(self) -> float:
+        # wake up at least every MIN_POLL_INTERVAL seconds to pick up new orders
+        next_poll_timestamp = self._poll_schedule.next_poll_timestamp()
+        if next_poll_timestamp is None:
+            return MIN_POLL_INTERVAL
+        return min(MIN_POLL_INTERVAL, max(0, next_poll_timestamp - self._clock.time()))
+
+    def __poll_due_symbols(self) -> None:
+        """
+        Polls the orders of all due symbols with one open orders request per symbol.
+        Only orders that are not open anymore are requested individually.
+        """
+        now = self._clock.time()
+        orders_by_symbol: Dict[str, List[BinanceOrder]] = {}
+        for order in self._order_manager.unfulfilled_orders():
+            if order.symbol is not None:
+                orders_by_symbol.setdefault(order.symbol, []).append(order)
+        youngest_order_ages = {
+            symbol: min(self.__order_age(order, now) for order in orders) for symbol, orders in orders_by_symbol.items()
+        }
+        self._poll_schedule.sync(youngest_order_ages, now)
+
+        for symbol in self._poll_schedule.pop_due_symbols(now):
+            orders = orders_by_symbol[symbol]
+            if len(orders) * ENDPOINT_WEIGHTS["order_get"] <= ENDPOINT_WEIGHTS["openOrders"]:
+                # requesting the few orders directly uses less request weight
+                closed_orders = orders
+            else:
+                open_orders = self._get_open_orders_callback(symbol)
+                if open_orders is None:
+                    # request failed, the symbol is scheduled again on the next sync
+                    continue
+                open_order_ids = {open_order.orderId for open_order in open_orders}
+                closed_orders = [order for order in orders if order.orderId not in open_order_ids]
+
+            for order in closed_orders:
+                self._handle_order_status(order, self._get_order_status(order.symbol, order.orderId))
+            self._poll_schedule.schedule(symbol, now, youngest_order_ages[symbol])
+
+    @staticmethod
+    def __order_age(order: BinanceOrder, now: float) -> float:
+        order_time = order.time if order.time is not None else order.transactTime
+        if order_time is None:
+            return 0
+        return max(0, now - float(order_time) / 1000)
+
+    def _handle_order_status(self, order, binance_order) -> None:
+        if binance_order is None:
+            return
+
+        # TODO: check cases where order is just partially filled
+        if binance_order.status == ORDER_STATUS_FILLED:
+            if not self._order_manager.mark_order_filled(order, binance_order):
+                # already handled, e.g. by the reconciliation after a reconnect
+                return
+            self.__on_order_filled(binance_order)
+            LOG_INFO(self._debug_tag, "Order fully filled:", binance_order)
+            self._order_manager.store_orders_to_file()
+
+            if global_vars.firebaseStorage is not None:
+                global_vars.firebaseStorage.set_fulfilled_orders(self._order_manager.fulfilled_orders())
+
+    def _get_order_status(self, symbol, order_id):
         if self._get_order_status_callback is not None:
             return self._get_order_status_callback(symbol, order_id)
         else:
@@ -0,0 +1,215 @@
+import json
+import os
+from decimal import Decimal
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+import numpy as np
+from binance.enums import SIDE_BUY
+from binance.enums import SIDE_SELL
+
+from dca_investment_bot.binance_order import BinanceOrder
+
+"""
+Exports the fulfilled orders into a columnar format for analysis outside the bot.
+Every column is a .npy file in one directory, so it can be memory mapped
+and analysed with numpy without creating BinanceOrder objects:
+
+    history = load_order_history("orders/history")
+    btc = history.symbol_mask("BTCUSDT")
+    invested = history.to_float("quote_qty")[btc].sum()
+
+- timestamps are int64 milliseconds
+- prices and quantities are int64 fixed-point numbers with FIXED_POINT_DECIMALS decimals
+- symbols are dictionary encoded: symbol_code indexes into history.symbols
+- side is 0 for BUY and 1 for SELL
+
+With pyarrow installed the same columns can be written to a parquet file.
+Requires numpy (pip install .[analytics]).
+"""
+
+ORDER_HISTORY_FORMAT_VERSION = 1
+# binance uses at most 8 decimals for prices and quantities
+FIXED_POINT_DECIMALS = 8
+FIXED_POINT_SCALE = 10**FIXED_POINT_DECIMALS
+METADATA_FILENAME = "metadata.json"
+
+SIDE_CODES = {SIDE_BUY: 0, SIDE_SELL: 1}
+SIDES = [SIDE_BUY, SIDE_SELL]
+
+INT64_COLUMNS = ("order_id", "time", "update_time", "price", "orig_qty", "executed_qty", "quote_qty")
+FIXED_POINT_COLUMNS = ("price", "orig_qty", "executed_qty", "quote_qty")
+COLUMNS = INT64_COLUMNS + ("symbol_code", "side")
+
+
+class OrderHistory:
+    """
+    Columns of the fulfilled orders, sorted by time.
+    """
+
+    def __init__(self, symbols: List[str], columns: Dict[str, np.ndarray]) -> None:
+        self.symbols = symbols
+        self.order_id: np.ndarray = columns["order_id"]
+        self.time: np.ndarray = columns["time"]
+        self.update_time: np.ndarray = columns["update_time"]
+        self.symbol_code: np.ndarray = columns["symbol_code"]
+        self.side: np.ndarray = columns["side"]
+        self.price: np.ndarray = columns["price"]
+        self.orig_qty: np.ndarray = columns["orig_qty"]
+        self.executed_qty: np.ndarray = columns["executed_qty"]
+        self.quote_qty: np.ndarray = columns["quote_qty"]
+
+    def __len__(self) -> int:
+        return len(self.order_id)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    def symbol_mask(self, symbol: str) -> np.ndarray:
+        """
+        Returns a boolean array that selects the orders of the symbol.
+        """
+        if symbol not in self.symbols:
+            return np.zeros(len(self), dtype=bool)
+        mask: np.ndarray = self.symbol_code == self.symbols.index(symbol)
+        return mask
+
+    def side_mask(self, side: str) -> np.ndarray:
+        mask: np.ndarray = self.side == SIDE_CODES[side]
+        return mask
+
+    def to_float(self, column: str) -> np.ndarray:
+        """
+        Returns a fixed-point column as float64.
+        """
+        if column not in FIXED_POINT_COLUMNS:
+            raise ValueError(f"{column} is not a fixed-point column")
+        values: np.ndarray = getattr(self, column) / FIXED_POINT_SCALE
+        return values
+
+    @classmethod
+    def from_orders(cls, orders: Iterable[BinanceOrder]) -> "OrderHistory":
+        orders = sorted(orders, key=_order_time)
+        symbols: List[str] = []
+        symbol_codes: Dict[str, int] = {}
+        for order in orders:
+            symbol = _order_symbol(order)
+            if symbol not in symbol_codes:
+                symbol_codes[symbol] = len(symbols)
+                symbols.append(symbol)
+
+        columns: Dict[str, np.ndarray] = {
+            "order_id": np.array([int(o.orderId or 0) for o in orders], dtype=np.int64),
+            "time": np.array([_order_time(o) for o in orders], dtype=np.int64),
+            "update_time": np.array(
+                [int(o.updateTime) if o.updateTime is not None else _order_time(o) for o in orders], dtype=np.int64
+            ),
+            "symbol_code": np.array([symbol_codes[_order_symbol(o)] for o in orders], dtype=np.int32),
+            "side": np.array([SIDE_CODES.get(o.side, -1) for o in orders], dtype=np.int8),
+            "price": _fixed_point_column([o.price for o in orders]),
+            "orig_qty": _fixed_point_column([o.origQty for o in orders]),
+            "executed_qty": _fixed_point_column([o.executedQty for o in orders]),
+            "quote_qty": _fixed_point_column([o.cummulativeQuoteQty for o in orders]),
+        }
+        return cls(symbols, columns)
+
+
+def export_order_history(orders: Iterable[BinanceOrder], directory: str) -> OrderHistory:
+    """
+    Writes the orders as one .npy file per column and a metadata.json into the directory.
+    """
+    history = OrderHistory.from_orders(orders)
+    os.makedirs(directory, exist_ok=True)
+    for name, column in history.columns().items():
+        # write to a temporary file first so readers never see a half written column
+        tmp_filepath = os.path.join(directory, name + ".tmp.npy")
+        np.save(tmp_filepath, column)
+        os.replace(tmp_filepath, os.path.join(directory, name + ".npy"))
+    metadata = {
+        "version": ORDER_HISTORY_FORMAT_VERSION,
+        "fixed_point_decimals": FIXED_POINT_DECIMALS,
+        "count": len(history),
+        "symbols": history.symbols,
+        "sides": SIDES,
+    }
+    tmp_filepath = os.path.join(directory, METADATA_FILENAME + ".tmp")
+    with open(tmp_filepath, "w") as f:
+        json.dump(metadata, f, indent=4)
+    os.replace(tmp_filepath, os.path.join(directory, METADATA_FILENAME))
+    return history
+
+
+def load_order_history(directory: str, mmap: bool = True) -> OrderHistory:
+    """
+    Reads an exported order history, with mmap the columns are memory mapped (read-only) instead of copied.
+    """
+    with open(os.path.join(directory, METADATA_FILENAME)) as f:
+        metadata = json.load(f)
+    if metadata.get("version") != ORDER_HISTORY_FORMAT_VERSION:
+        raise ValueError(f"Unsupported order history version: {metadata.get('version')}")
+    columns = {
+        name: np.load(os.path.join(directory, name + ".npy"), mmap_mode="r" if mmap else None) for name in COLUMNS
+    }
+    return OrderHistory(metadata["symbols"], columns)
+
+
+def export_order_history_parquet(orders: Iterable[BinanceOrder], filepath: str) -> OrderHistory:
+    """
+    Writes the orders to a parquet file, the symbol column is dictionary encoded.
+    Requires pyarrow (pip install .[arrow]).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    history = OrderHistory.from_orders(orders)
+    arrays = [pa.array(getattr(history, name)) for name in INT64_COLUMNS]
+    arrays.append(pa.DictionaryArray.from_arrays(pa.array(history.symbol_code), pa.array(history.symbols, pa.string())))
+    arrays.append(pa.array(history.side))
+    table = pa.Table.from_arrays(arrays, names=list(INT64_COLUMNS) + ["symbol", "side"])
+    table = table.replace_schema_metadata({"fixed_point_decimals": str(FIXED_POINT_DECIMALS)})
+    pq.write_table(table, filepath)
+    return history
+
+
+def load_order_history_parquet(filepath: str) -> OrderHistory:
+    """
+    Reads an order history written by export_order_history_parquet.
+    Requires pyarrow (pip install .[arrow]).
+    """
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(filepath, memory_map=True, read_dictionary=["symbol"])
+    # every row group has its own dictionary
+    symbol_column = table.column("symbol").unify_dictionaries().combine_chunks()
+    columns = {name: table.column(name).to_numpy() for name in INT64_COLUMNS}
+    columns["symbol_code"] = symbol_column.indices.to_numpy().astype(np.int32)
+    columns["side"] = table.column("side").to_numpy()
+    return OrderHistory(symbol_column.dictionary.to_pylist(), columns)
+
+
+def _order_symbol(order: BinanceOrder) -> str:
+    return order.symbol or ""
+
+
+def _fixed_point_column(values: List[Optional[str]]) -> np.ndarray:
+    return np.array([_to_fixed_point(v) for v in values], dtype=np.int64)
+
+
+def _to_fixed_point(value: Optional[str]) -> int:
+    """
+    Converts a decimal string like "0.00100000" to an integer with FIXED_POINT_DECIMALS decimals
+    without creating a Decimal, more decimals are cut off.
+    """
+    if value is None:
+        return 0
+    value = str(value)
+    if "e" in value or "E" in value:
+        return int(Decimal(value).scaleb(FIXED_POINT_DECIMALS).to_integral_value())
+    integer, _, fraction = value.partition(".")
+    return int(integer + fraction[:FIXED_POINT_DECIMALS].ljust(FIXED_POINT_DECIMALS, "0"))
+
+
+def _order_time(order: BinanceOrder) -> int:
+    return int(order.time) if order.time is not None else 0
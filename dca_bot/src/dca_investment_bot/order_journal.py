@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import time
+import typing
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from dca_investment_bot.logger import LOG_WARNING
+
+"""
+Append-only journal of order events (one json object per line).
+Appending an event costs the same regardless of the size of the order history.
+Writes are flushed immediately but fsync'ed in batches: at most every
+fsync_interval seconds or after fsync_batch_size events.
+"""
+
+EVENT_ORDER_FILLED = "ORDER_FILLED"
+
+
+class OrderJournal:
+    def __init__(self, journal_filepath: str, fsync_interval: float = 1.0, fsync_batch_size: int = 100) -> None:
+        self._debug_tag = "[OrderJournal]"
+        self._journal_filepath = journal_filepath
+        self._fsync_interval = fsync_interval
+        self._fsync_batch_size = fsync_batch_size
+        self._lock = threading.Lock()
+        self._file: Optional[typing.TextIO] = None
+        self._event_count = 0
+        self._unsynced_events = 0
+        self._last_fsync = time.monotonic()
+
+        self._stop_event = threading.Event()
+        self._fsync_thread: Optional[threading.Thread] = None
+
+    def read_events(self) -> List[Dict[str, Any]]:
+        """
+        Returns all events of the journal.
+        An incomplete last line (e.g. the process crashed while writing) is skipped.
+        """
+        events: List[Dict[str, Any]] = []
+        if not os.path.isfile(self._journal_filepath):
+            return events
+        with open(self._journal_filepath) as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if len(line) == 0:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    LOG_WARNING(self._debug_tag, f"Skipping broken journal entry at line {line_number}")
+        with self._lock:
+            self._event_count = len(events)
+        return events
+
+    def append(self, event_type: str, data: Dict[str, Any]) -> None:
+        line = json.dumps({"type": event_type, "data": data}, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            f = self.__open()
+            f.write(line + "\n")
+            f.flush()
+            self._event_count += 1
+            self._unsynced_events += 1
+            if (
+                self._unsynced_events >= self._fsync_batch_size
+                or time.monotonic() - self._last_fsync >= self._fsync_interval
+            ):
+                self.__fsync()
+            self.__start_fsync_thread()
+
+    def event_count(self) -> int:
+        """
+        Returns the number of events since the last truncate.
+        """
+        with self._lock:
+            return self._event_count
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._file is not None and self._unsynced_events > 0:
+                self.__fsync()
+
+    def truncate(self) -> None:
+        """
+        Removes all events, call this after the events were written to a snapshot.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(self._journal_filepath, "w") as f:
+                f.flush()
+                os.fsync(f.fileno())
+            self._event_count = 0
+            self._unsynced_events = 0
+
+    def close(self) -> None:
+        self._stop_event.set()
+        if self._fsync_thread is not None:
+            self._fsync_thread.join()
+            self._fsync_thread = None
+        with self._lock:
+            if self._file is not None:
+                if self._unsynced_events > 0:
+                    self.__fsync()
+                self._file.close()
+                self._file = None
+
+    def __open(self) -> typing.TextIO:
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self._journal_filepath)), exist_ok=True)
+            self._file = open(self._journal_filepath, "a")
+        return self._file
+
+    def __fsync(self) -> None:
+        assert self._file is not None
+        os.fsync(self._file.fileno())
+        self._unsynced_events = 0
+        self._last_fsync = time.monotonic()
+
+    def __start_fsync_thread(self) -> None:
+        # makes sure events written shortly after the last fsync are synced within fsync_interval
+        if self._fsync_thread is not None or self._stop_event.is_set():
+            return
+        self._fsync_thread = threading.Thread(target=self.__fsync_loop, name="OrderJournalFsync", daemon=True)
+        self._fsync_thread.start()
+
+    def __fsync_loop(self) -> None:
+        while not self._stop_event.wait(self._fsync_interval):
+            self.sync()
@@ -1,58 +1,337 @@
+import bisect
+import datetime
 import json
 import os
+import threading
 import typing
+from decimal import Decimal
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from binance.enums import SIDE_BUY
 
 from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.logger import LOG_DEBUG
 from dca_investment_bot.logger import LOG_INFO
+from dca_investment_bot.order_journal import EVENT_ORDER_FILLED
+from dca_investment_bot.order_journal import OrderJournal
+from dca_investment_bot.order_repository import SQLiteOrderRepository
 
 """
 Manages the fulfilled, unfufilled orders.
 Reads them from a file, and writes them to a file.
+Keeps indexes by symbol, side and time so lookups don't need to scan the whole history.
+
+Shared by the main loop and the order checker thread, all methods are thread-safe.
+The unfulfilled orders are copy-on-write: the list returned by unfulfilled_orders()
+is never modified, changes replace the list. The fulfilled orders only grow,
+so they are appended in place and fulfilled_orders() returns a copy.
+
+With a journal, every fill is appended to the journal instead of rewriting the order file.
+The order file is then only a snapshot that is rewritten (compacted) once
+the journal contains compact_after events.
+
+With a database the fulfilled orders are stored in SQLite and not loaded into memory,
+lookups on the fulfilled orders are queries on its indexes. An existing order file
+(and journal) is imported once into an empty database.
 """
 
+DEFAULT_COMPACT_AFTER = 1000
+
 
 class OrderListManager:
-    def __init__(self, order_filepath: str) -> None:
+    def __init__(
+        self,
+        order_filepath: str,
+        journal_filepath: Optional[str] = None,
+        compact_after: int = DEFAULT_COMPACT_AFTER,
+        database_filepath: Optional[str] = None,
+    ) -> None:
         self._debug_tag = "[OrderListManager]"
+        self._repository = SQLiteOrderRepository(database_filepath) if database_filepath is not None else None
+        self._journal = OrderJournal(journal_filepath) if journal_filepath is not None else None
+        self._compact_after = compact_after
         self._unfulfilled_orders: typing.List[BinanceOrder] = []
         self._fulfilled_orders: typing.List[BinanceOrder] = []
         self._order_filepath = order_filepath
+        # protects the lists and indexes, notified whenever an order got filled
+        self._lock = threading.RLock()
+        self._order_filled = threading.Condition(self._lock)
+        # only one thread writes the file at a time
+        self._file_lock = threading.Lock()
+
+        # indexes, updated on add_new_order, mark_order_filled and load_fulfilled_from_file
+        self._fulfilled_by_symbol_side: Dict[Tuple[Optional[str], Optional[str]], typing.List[BinanceOrder]] = {}
+        self._unfulfilled_by_symbol: Dict[Optional[str], typing.List[BinanceOrder]] = {}
+        self._last_fill_time: Dict[Optional[str], int] = {}
+        # fulfilled orders sorted by time and their times (for bisect)
+        self._fulfilled_by_time: typing.List[BinanceOrder] = []
+        self._fulfilled_times: typing.List[int] = []
+        # (symbol, orderId) -> fulfilled order, order ids are only unique per symbol
+        self._fulfilled_by_key: Dict[Tuple[Optional[str], Optional[str]], BinanceOrder] = {}
         self.__create_path()
 
     def load_fulfilled_from_file(self) -> None:
         """
-        Loads the orders from the file.
+        Loads the orders from the file and replays the journal.
+        With a database nothing is loaded, the order file is only imported if the database is empty.
         """
+        if self._repository is not None:
+            if self._repository.is_empty():
+                self.__import_into_repository()
+            return
+        fulfilled_orders = self.__read_order_file()
+        with self._lock:
+            self._fulfilled_orders = fulfilled_orders
+            self.__rebuild_fulfilled_indexes()
+
+    def __read_order_file(self) -> typing.List[BinanceOrder]:
+        fulfilled_orders = []
         if os.path.isfile(self._order_filepath):
             with open(self._order_filepath) as f:
                 json_orders = json.load(f)
-                self._fulfilled_orders = [BinanceOrder(o) for o in json_orders]
-        else:
-            self._fulfilled_orders = []
+                fulfilled_orders = [BinanceOrder(o) for o in json_orders]
+        if self._journal is not None:
+            fulfilled_orders += self.__replay_journal(fulfilled_orders)
+        return fulfilled_orders
+
+    def __import_into_repository(self) -> None:
+        assert self._repository is not None
+        fulfilled_orders = self.__read_order_file()
+        if len(fulfilled_orders) > 0:
+            self._repository.add_fulfilled_orders(fulfilled_orders)
+            LOG_INFO(self._debug_tag, f"Imported {len(fulfilled_orders)} orders into the order database")
 
     def store_orders_to_file(self) -> None:
         """
         Stores the orders to the file.
+        With a journal the fills are already stored, the order file is only
+        rewritten if the journal needs to be compacted.
+        With a database the fills are already committed, nothing is written.
+        """
+        if self._repository is not None:
+            return
+        if self._journal is not None:
+            if self._journal.event_count() >= self._compact_after:
+                self.compact()
+            return
+        self.__write_snapshot(self.fulfilled_orders())
+
+    def compact(self) -> None:
+        """
+        Writes all fulfilled orders to the order file and clears the journal.
         """
-        with open(self._order_filepath, "w") as f:
-            json_orders = [o.asDict() for o in self._fulfilled_orders]
-            json.dump(json_orders, f, indent=4, ensure_ascii=False)
+        if self._repository is not None:
+            return
+        with self._lock:
+            self.__write_snapshot(list(self._fulfilled_orders))
+            if self._journal is not None:
+                self._journal.truncate()
+        LOG_DEBUG(self._debug_tag, "Compacted order journal")
+
+    def close(self) -> None:
+        """
+        Makes sure all journaled fills are written to disk and closes the database.
+        """
+        if self._journal is not None:
+            self._journal.close()
+        if self._repository is not None:
+            self._repository.close()
+
+    def __replay_journal(self, snapshot_orders: typing.List[BinanceOrder]) -> typing.List[BinanceOrder]:
+        assert self._journal is not None
+        # fills can be in the snapshot and the journal if the process stopped during compaction
+        # order ids are only unique per symbol
+        known_orders = {o.key() for o in snapshot_orders}
+        replayed_orders = []
+        for event in self._journal.read_events():
+            if event.get("type") != EVENT_ORDER_FILLED:
+                continue
+            order = BinanceOrder(event["data"])
+            if order.key() in known_orders:
+                continue
+            known_orders.add(order.key())
+            replayed_orders.append(order)
+        return replayed_orders
+
+    def __write_snapshot(self, fulfilled_orders: typing.List[BinanceOrder]) -> None:
+        json_orders = [o.asDict() for o in fulfilled_orders]
+        with self._file_lock:
+            # write to a temporary file first so a crash does not leave a broken order file
+            tmp_filepath = self._order_filepath + ".tmp"
+            with open(tmp_filepath, "w") as f:
+                json.dump(json_orders, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_filepath, self._order_filepath)
 
     def __create_path(self):
         if not os.path.exists(self._order_filepath):
             os.makedirs(os.path.dirname(self._order_filepath), exist_ok=True)
 
     def unfulfilled_orders(self) -> typing.List[BinanceOrder]:
-        return self._unfulfilled_orders
+        """
+        Returns a snapshot of the unfulfilled orders, don't modify it.
+        """
+        with self._lock:
+            return self._unfulfilled_orders
 
     def fulfilled_orders(self) -> typing.List[BinanceOrder]:
-        return self._fulfilled_orders
+        """
+        Returns a copy of the fulfilled orders.
+        """
+        if self._repository is not None:
+            return self._repository.fulfilled_orders()
+        with self._lock:
+            return list(self._fulfilled_orders)
 
     def add_new_order(self, new_order: BinanceOrder) -> None:
         """
         Adds a new order to the list of unfulfilled orders.
         """
-        self._unfulfilled_orders.append(new_order)
+        with self._lock:
+            self._unfulfilled_orders = self._unfulfilled_orders + [new_order]
+            self._unfulfilled_by_symbol[new_order.symbol] = self._unfulfilled_by_symbol.get(new_order.symbol, []) + [
+                new_order
+            ]
+
+    def mark_order_filled(self, order: BinanceOrder, filled_order: BinanceOrder) -> bool:
+        """
+        Moves the order from the unfulfilled orders to the fulfilled orders.
+        filled_order is the updated order returned by binance.
+        Returns False if the order is not unfulfilled (e.g. another thread already marked it filled).
+        """
+        with self._lock:
+            if not any(o is order for o in self._unfulfilled_orders):
+                return False
+            self._unfulfilled_orders = [o for o in self._unfulfilled_orders if o is not order]
+            unfulfilled_for_symbol = [o for o in self._unfulfilled_by_symbol.get(order.symbol, []) if o is not order]
+            if len(unfulfilled_for_symbol) == 0:
+                self._unfulfilled_by_symbol.pop(order.symbol, None)
+            else:
+                self._unfulfilled_by_symbol[order.symbol] = unfulfilled_for_symbol
+
+            if self._repository is not None:
+                self._repository.add_fulfilled_order(filled_order)
+                # only the fills of this session are kept in memory for wait_for_order_filled
+                self._fulfilled_by_key[filled_order.key()] = filled_order
+            else:
+                self._fulfilled_orders.append(filled_order)
+                self.__index_fulfilled_order(filled_order)
+            if self._journal is not None and self._repository is None:
+                self._journal.append(EVENT_ORDER_FILLED, filled_order.asDict())
+            self._order_filled.notify_all()
+        return True
+
+    def wait_for_order_filled(self, symbol: str, order_id, timeout: Optional[float] = None) -> Optional[BinanceOrder]:
+        """
+        Blocks until the order of the symbol with the given id is filled.
+        Returns the filled order or None if the timeout expired.
+        """
+        key = (symbol, order_id)
+        with self._order_filled:
+            self._order_filled.wait_for(lambda: key in self._fulfilled_by_key, timeout)
+            return self._fulfilled_by_key.get(key)
+
+    def get_last_order_for_symbol(self, symbol: str, side: str = SIDE_BUY) -> Optional[BinanceOrder]:
+        """
+        Returns the last fulfilled order for the symbol and side or None if there is none.
+        """
+        if self._repository is not None:
+            return self._repository.get_last_order(symbol, side)
+        with self._lock:
+            orders = self._fulfilled_by_symbol_side.get((symbol, side))
+            if not orders:
+                return None
+            return orders[-1]
+
+    def open_orders_for_symbol(self, symbol: str, side: Optional[str] = None) -> typing.List[BinanceOrder]:
+        """
+        Returns the unfulfilled orders for the symbol, optionally filtered by side.
+        """
+        with self._lock:
+            orders = self._unfulfilled_by_symbol.get(symbol, [])
+        if side is None:
+            return list(orders)
+        return [o for o in orders if o.side == side]
+
+    def orders_in_time_range(
+        self, start_time: int, end_time: int, symbol: Optional[str] = None
+    ) -> typing.List[BinanceOrder]:
+        """
+        Returns the fulfilled orders with start_time <= time < end_time (timestamps in milliseconds).
+        """
+        if self._repository is not None:
+            return self._repository.orders_in_time_range(start_time, end_time, symbol)
+        with self._lock:
+            start_index = bisect.bisect_left(self._fulfilled_times, start_time)
+            end_index = bisect.bisect_left(self._fulfilled_times, end_time)
+            orders = self._fulfilled_by_time[start_index:end_index]
+        if symbol is None:
+            return orders
+        return [o for o in orders if o.symbol == symbol]
+
+    def get_last_fill_time(self, symbol: str) -> Optional[int]:
+        """
+        Returns the time (in milliseconds) of the latest fulfilled order for the symbol.
+        """
+        if self._repository is not None:
+            return self._repository.get_last_fill_time(symbol)
+        with self._lock:
+            return self._last_fill_time.get(symbol)
+
+    def monthly_totals(self, side: str = SIDE_BUY, symbol: Optional[str] = None) -> typing.List[Dict[str, Any]]:
+        """
+        Returns the executed base and quote amounts of the fulfilled orders per month (UTC) and symbol.
+        """
+        if self._repository is not None:
+            return self._repository.monthly_totals(side, symbol)
+        totals: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        with self._lock:
+            orders = list(self._fulfilled_by_time)
+        for order in orders:
+            if order.side != side or (symbol is not None and order.symbol != symbol):
+                continue
+            month = datetime.datetime.fromtimestamp(self.__order_time(order) / 1000, tz=datetime.timezone.utc).strftime(
+                "%Y-%m"
+            )
+            entry = totals.setdefault(
+                (month, order.symbol),
+                {"month": month, "symbol": order.symbol, "base_total": Decimal(0), "quote_total": Decimal(0)},
+            )
+            entry["base_total"] += order.executed_qty_decimal or 0
+            entry["quote_total"] += order.cummulative_quote_qty_decimal or 0
+        return [totals[key] for key in sorted(totals)]
+
+    def __rebuild_fulfilled_indexes(self) -> None:
+        self._fulfilled_by_symbol_side = {}
+        self._last_fill_time = {}
+        self._fulfilled_by_time = []
+        self._fulfilled_times = []
+        self._fulfilled_by_key = {}
+        for order in self._fulfilled_orders:
+            self.__index_fulfilled_order(order)
+
+    def __index_fulfilled_order(self, order: BinanceOrder) -> None:
+        self._fulfilled_by_symbol_side.setdefault((order.symbol, order.side), []).append(order)
+        if order.orderId is not None:
+            self._fulfilled_by_key[order.key()] = order
+
+        order_time = self.__order_time(order)
+        fill_time = int(order.updateTime) if order.updateTime is not None else order_time
+        if fill_time >= self._last_fill_time.get(order.symbol, 0):
+            self._last_fill_time[order.symbol] = fill_time
+
+        # orders are usually added in chronological order, so this is mostly an append
+        index = bisect.bisect_right(self._fulfilled_times, order_time)
+        self._fulfilled_times.insert(index, order_time)
+        self._fulfilled_by_time.insert(index, order)
+
+    @staticmethod
+    def __order_time(order: BinanceOrder) -> int:
+        return int(order.time) if order.time is not None else 0
 
     def print_orders(self, orders: typing.List[BinanceOrder]) -> None:
         """
@@ -0,0 +1,73 @@
+import heapq
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+"""
+Decides when the orders of a symbol are polled next.
+Symbols with fresh orders are polled often, symbols that only have
+old resting limit orders are polled less often (up to max_interval).
+"""
+
+MIN_POLL_INTERVAL = 5
+MAX_POLL_INTERVAL = 120
+# the poll interval is this fraction of the age of the youngest order of the symbol
+POLL_INTERVAL_AGE_FACTOR = 0.1
+
+
+class OrderPollSchedule:
+    def __init__(
+        self,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+        age_factor: float = POLL_INTERVAL_AGE_FACTOR,
+    ) -> None:
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._age_factor = age_factor
+        # entries are (next_poll_timestamp, symbol), outdated entries are skipped
+        self._heap: List[Tuple[float, str]] = []
+        self._next_poll: Dict[str, float] = {}
+
+    def poll_interval(self, youngest_order_age: float) -> float:
+        return min(self._max_interval, max(self._min_interval, youngest_order_age * self._age_factor))
+
+    def sync(self, youngest_order_ages: Dict[str, float], now_timestamp: float) -> None:
+        """
+        Updates the schedule with the age of the youngest unfulfilled order of every symbol.
+        New symbols are added, symbols without orders are removed and symbols
+        with a new order are polled earlier if needed.
+        """
+        for symbol in list(self._next_poll.keys()):
+            if symbol not in youngest_order_ages:
+                del self._next_poll[symbol]
+
+        for symbol, age in youngest_order_ages.items():
+            next_poll = now_timestamp + self.poll_interval(age)
+            if symbol not in self._next_poll or next_poll < self._next_poll[symbol]:
+                self.__schedule_at(symbol, next_poll)
+
+    def schedule(self, symbol: str, now_timestamp: float, youngest_order_age: float) -> None:
+        self.__schedule_at(symbol, now_timestamp + self.poll_interval(youngest_order_age))
+
+    def pop_due_symbols(self, now_timestamp: float) -> List[str]:
+        due_symbols = []
+        while len(self._heap) > 0 and self._heap[0][0] <= now_timestamp:
+            timestamp, symbol = heapq.heappop(self._heap)
+            if self._next_poll.get(symbol) != timestamp:
+                continue
+            del self._next_poll[symbol]
+            due_symbols.append(symbol)
+        return due_symbols
+
+    def next_poll_timestamp(self) -> Optional[float]:
+        while len(self._heap) > 0 and self._next_poll.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if len(self._heap) == 0:
+            return None
+        return self._heap[0][0]
+
+    def __schedule_at(self, symbol: str, timestamp: float) -> None:
+        self._next_poll[symbol] = timestamp
+        heapq.heappush(self._heap, (timestamp, symbol))
@@ -0,0 +1,210 @@
+import json
+import os
+import sqlite3
+import threading
+import typing
+from decimal import Decimal
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from dca_investment_bot.binance_order import BinanceOrder
+
+"""
+Stores the fulfilled orders in a SQLite database.
+Lookups like the last buy order of a symbol or the totals per month use indexes,
+so they don't depend on the size of the order history.
+The database uses WAL mode, other tools can read it while the bot is running.
+"""
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    order_id INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT,
+    type TEXT,
+    status TEXT,
+    price TEXT,
+    orig_qty TEXT,
+    executed_qty TEXT,
+    cummulative_quote_qty TEXT,
+    time INTEGER NOT NULL,
+    update_time INTEGER,
+    data TEXT NOT NULL,
+    -- binance order ids are only unique per symbol
+    PRIMARY KEY (symbol, order_id)
+);
+CREATE INDEX IF NOT EXISTS idx_orders_symbol_side_time ON orders (symbol, side, time);
+CREATE INDEX IF NOT EXISTS idx_orders_time ON orders (time);
+CREATE TABLE IF NOT EXISTS fills (
+    symbol TEXT NOT NULL,
+    order_id INTEGER NOT NULL,
+    trade_id INTEGER,
+    price TEXT,
+    qty TEXT,
+    commission TEXT,
+    commission_asset TEXT,
+    FOREIGN KEY (symbol, order_id) REFERENCES orders (symbol, order_id)
+);
+CREATE INDEX IF NOT EXISTS idx_fills_symbol_order_id ON fills (symbol, order_id);
+"""
+
+
+class SQLiteOrderRepository:
+    def __init__(self, database_filepath: str) -> None:
+        self._debug_tag = "[SQLiteOrderRepository]"
+        os.makedirs(os.path.dirname(os.path.abspath(database_filepath)), exist_ok=True)
+        # the connection is shared by the main loop and the order checker thread
+        self._connection = sqlite3.connect(database_filepath, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(SCHEMA)
+            self._connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM orders LIMIT 1").fetchone() is None
+
+    def add_fulfilled_order(self, order: BinanceOrder) -> None:
+        self.add_fulfilled_orders([order])
+
+    def add_fulfilled_orders(self, orders: Iterable[BinanceOrder]) -> None:
+        """
+        Inserts or replaces the orders and their fills in a single transaction.
+        """
+        with self._lock:
+            with self._connection:
+                for order in orders:
+                    order_id = _order_id(order)
+                    data = order.asDict()
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            order_id,
+                            order.symbol,
+                            order.side,
+                            order.type,
+                            order.status,
+                            order.price,
+                            order.origQty,
+                            order.executedQty,
+                            order.cummulativeQuoteQty,
+                            _order_time(order),
+                            int(order.updateTime) if order.updateTime is not None else None,
+                            json.dumps(data, ensure_ascii=False),
+                        ),
+                    )
+                    self._connection.execute(
+                        "DELETE FROM fills WHERE symbol = ? AND order_id = ?", (order.symbol, order_id)
+                    )
+                    fills: List[Dict[str, Any]] = data.get("fills") or []
+                    for fill in fills:
+                        self._connection.execute(
+                            "INSERT INTO fills VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (
+                                order.symbol,
+                                order_id,
+                                fill.get("tradeId"),
+                                fill.get("price"),
+                                fill.get("qty"),
+                                fill.get("commission"),
+                                fill.get("commissionAsset"),
+                            ),
+                        )
+
+    def get_order(self, symbol: str, order_id) -> Optional[BinanceOrder]:
+        return self.__fetch_one("SELECT data FROM orders WHERE symbol = ? AND order_id = ?", (symbol, int(order_id)))
+
+    def get_last_order(self, symbol: str, side: str) -> Optional[BinanceOrder]:
+        return self.__fetch_one(
+            "SELECT data FROM orders WHERE symbol = ? AND side = ? ORDER BY time DESC LIMIT 1", (symbol, side)
+        )
+
+    def get_last_fill_time(self, symbol: str) -> Optional[int]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MAX(COALESCE(update_time, time)) FROM orders WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def orders_in_time_range(self, start_time: int, end_time: int, symbol: Optional[str] = None) -> List[BinanceOrder]:
+        """
+        Returns the orders with start_time <= time < end_time (timestamps in milliseconds), ordered by time.
+        """
+        if symbol is None:
+            return self.__fetch_all(
+                "SELECT data FROM orders WHERE time >= ? AND time < ? ORDER BY time", (start_time, end_time)
+            )
+        return self.__fetch_all(
+            "SELECT data FROM orders WHERE symbol = ? AND time >= ? AND time < ? ORDER BY time",
+            (symbol, start_time, end_time),
+        )
+
+    def fulfilled_orders(self) -> List[BinanceOrder]:
+        return self.__fetch_all("SELECT data FROM orders ORDER BY time", ())
+
+    def monthly_totals(self, side: str, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the executed base and quote amounts per month and symbol.
+        The rows are grouped in SQL and summed as Decimals, like OrderListManager.monthly_totals without a database.
+        """
+        query = (
+            "SELECT strftime('%Y-%m', time / 1000, 'unixepoch') AS month, symbol, executed_qty, cummulative_quote_qty"
+            " FROM orders WHERE side = ?"
+        )
+        parameters: typing.Tuple[Any, ...] = (side,)
+        if symbol is not None:
+            query += " AND symbol = ?"
+            parameters += (symbol,)
+        query += " ORDER BY month, symbol, time"
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        totals: Dict[typing.Tuple[str, str], Dict[str, Any]] = {}
+        for row in rows:
+            entry = totals.setdefault(
+                (row["month"], row["symbol"]),
+                {"month": row["month"], "symbol": row["symbol"], "base_total": Decimal(0), "quote_total": Decimal(0)},
+            )
+            entry["base_total"] += _decimal_or_zero(row["executed_qty"])
+            entry["quote_total"] += _decimal_or_zero(row["cummulative_quote_qty"])
+        return list(totals.values())
+
+    def __fetch_one(self, query: str, parameters: typing.Tuple[Any, ...]) -> Optional[BinanceOrder]:
+        with self._lock:
+            row = self._connection.execute(query, parameters).fetchone()
+        return BinanceOrder(json.loads(row["data"])) if row is not None else None
+
+    def __fetch_all(self, query: str, parameters: typing.Tuple[Any, ...]) -> List[BinanceOrder]:
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        return [BinanceOrder(json.loads(row["data"])) for row in rows]
+
+
+def _order_id(order: BinanceOrder) -> int:
+    if order.orderId is None:
+        raise ValueError(f"Order without orderId: {order.asDict()}")
+    return int(order.orderId)
+
+
+def _order_time(order: BinanceOrder) -> int:
+    if order.time is not None:
+        return int(order.time)
+    if order.transactTime is not None:
+        return int(order.transactTime)
+    return 0
+
+
+def _decimal_or_zero(value: Optional[str]) -> Decimal:
+    return Decimal(value) if value is not None else Decimal(0)
@@ -0,0 +1,298 @@
+import sys
+import threading
+import typing
+from decimal import Decimal
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+from binance.enums import SIDE_BUY
+
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.clock import VirtualClock
+from dca_investment_bot.config_manager import ConfigManager
+from dca_investment_bot.DCAInvester import DCAInvester
+from dca_investment_bot.exceptions import KillProcessException
+from dca_investment_bot.exchange_simulator import MatchingEngine
+from dca_investment_bot.exchange_simulator import SimulatedClient
+from dca_investment_bot.logger import log_and_raise_exeption
+from dca_investment_bot.logger import LOG_CRITICAL_AND_NOTIFY
+from dca_investment_bot.logger import LOG_DEBUG
+from dca_investment_bot.logger import LOG_ERROR_AND_NOTIFY
+from dca_investment_bot.logger import LOG_INFO
+from dca_investment_bot.order_fulfilled_checker_thread import OrderFulfilledChecker
+from dca_investment_bot.order_list_manager import OrderListManager
+from dca_investment_bot.order_poll_schedule import MIN_POLL_INTERVAL
+from dca_investment_bot.trading_bot import TradingBot
+
+if typing.TYPE_CHECKING:
+    from dca_investment_bot.backtester import Klines
+
+"""
+Paper trading: runs the unchanged DCAInvester main loop against a MatchingEngine with virtual time.
+
+The clock only moves when the main loop, the order checker and the price replay are all waiting,
+so a year of investments runs in seconds while every decision (scheduling, should_invest,
+order sizing and validation, fill handling) is made by the same code as in a real run.
+Prices are replayed from klines (see KlinePriceFeed), the engine fills the limit orders
+and pushes the fills to the PaperOrderChecker like the user data stream would.
+
+Differences to a real run:
+- requests are not weighted, the simulated exchange has no request weight limit
+- the exchange info is never stored in the cache file
+- the asyncio backend (USE_ASYNCIO) can not be used with virtual time
+
+Replaying klines requires numpy (pip install .[analytics]).
+"""
+
+
+class KlinePriceFeed:
+    """
+    Replays klines as price changes. At the open time of a kline the price moves to its open price,
+    at its end to its low, high and close, so the limit orders the kline reaches fill at its end.
+    """
+
+    def __init__(self, klines: Mapping[str, "Klines"]) -> None:
+        # (timestamp in seconds, phase, symbol, kline index), the end of a kline comes before the next open
+        self._klines = klines
+        self._events: List[Tuple[float, int, str, int]] = []
+        for symbol, symbol_klines in klines.items():
+            duration = symbol_klines.kline_duration()
+            for index, open_time in enumerate(symbol_klines.open_time.tolist()):
+                self._events.append((open_time / 1000, 1, symbol, index))
+                self._events.append(((open_time + duration) / 1000, 0, symbol, index))
+        self._events.sort()
+
+    def first_prices(self) -> Dict[str, Decimal]:
+        """
+        Returns the open price of the first kline of every symbol.
+        """
+        return {symbol: _to_decimal(klines.open[0]) for symbol, klines in self._klines.items() if len(klines) > 0}
+
+    def steps(self) -> Iterator[Tuple[float, List[Tuple[str, Decimal]]]]:
+        """
+        Yields the timestamps with price changes and the (symbol, price) changes in the order to apply them.
+        """
+        index = 0
+        while index < len(self._events):
+            timestamp = self._events[index][0]
+            prices = []
+            while index < len(self._events) and self._events[index][0] == timestamp:
+                _, phase, symbol, kline_index = self._events[index]
+                klines = self._klines[symbol]
+                if phase == 1:
+                    prices.append((symbol, _to_decimal(klines.open[kline_index])))
+                else:
+                    for column in (klines.low, klines.high, klines.close):
+                        prices.append((symbol, _to_decimal(column[kline_index])))
+                index += 1
+            yield timestamp, prices
+
+
+def _to_decimal(value: float) -> Decimal:
+    return Decimal(repr(float(value)))
+
+
+class PaperOrderChecker(OrderFulfilledChecker):
+    """
+    Gets the fills pushed by the matching engine instead of polling the order status.
+    A fill of an order the main loop did not add yet (orders that fill when they are created)
+    is applied as soon as the order got added.
+    """
+
+    def __init__(
+        self, order_manager: OrderListManager, on_order_filled_callback, get_order_status_callback, clock: VirtualClock
+    ) -> None:
+        super().__init__(order_manager, on_order_filled_callback, get_order_status_callback, clock=clock)
+        self._debug_tag = "[Thread - Paper Order Checker]"
+        # (symbol, orderId) of the json order -> filled order
+        self._pending_fills: Dict[Tuple[str, Any], BinanceOrder] = {}
+        self._pending_fills_lock = threading.Lock()
+
+    def on_fill(self, order: Dict[str, Any]) -> None:
+        """
+        Fill listener of the MatchingEngine.
+        """
+        with self._pending_fills_lock:
+            self._pending_fills[(order["symbol"], order["orderId"])] = BinanceOrder(order)
+        self._wakeup_event.set()
+
+    def run(self) -> None:
+        self._thread_running = True
+        try:
+            while self._thread_running:
+                with self._pending_fills_lock:
+                    has_pending_fills = len(self._pending_fills) > 0
+                # fills of orders that are not added yet are retried after a short time
+                self._clock.wait(self._wakeup_event, MIN_POLL_INTERVAL if has_pending_fills else None)
+                self._wakeup_event.clear()
+                if self._thread_running:
+                    self.__apply_fills()
+        except (KillProcessException, KeyboardInterrupt) as e:
+            LOG_CRITICAL_AND_NOTIFY(self._debug_tag, e)
+        except Exception as e:
+            LOG_ERROR_AND_NOTIFY(self._debug_tag, "Error while applying fills:", e)
+            log_and_raise_exeption(e, self._debug_tag)
+        LOG_DEBUG(self._debug_tag, "Order listener stopped")
+
+    def __apply_fills(self) -> None:
+        with self._pending_fills_lock:
+            pending_fills = list(self._pending_fills.items())
+        for key, binance_order in pending_fills:
+            symbol, order_id = key
+            for order in self._order_manager.open_orders_for_symbol(symbol):
+                if order.orderId == order_id:
+                    with self._pending_fills_lock:
+                        del self._pending_fills[key]
+                    self._handle_order_status(order, binance_order)
+                    break
+
+
+class PaperTradingInvester(DCAInvester):
+    def __init__(
+        self,
+        config_manager: ConfigManager,
+        engine: MatchingEngine,
+        clock: VirtualClock,
+        end_time: float,
+        price_feed: Optional[KlinePriceFeed] = None,
+    ) -> None:
+        """
+        The engine has to use the virtual time (time_function=clock.time).
+        run() returns once the clock reaches end_time, prices are replayed from price_feed until then.
+        """
+        super().__init__(config_manager, clock)
+        self._debug_tag = "[PaperTrading]"
+        self.engine = engine
+        self.virtual_clock = clock
+        self.end_time = end_time
+        self.price_feed = price_feed
+        # every fill of the engine, also the ones the bot does not know about
+        self.engine_fills: List[Dict[str, Any]] = []
+        self.engine.add_fill_listener(self.engine_fills.append)
+        self._replay_stopped = threading.Event()
+
+    def run(self) -> None:
+        # the time must not move before the main loop waits for the first time
+        self.virtual_clock.attach()
+        replay_thread = threading.Thread(target=self.__replay_prices, name="PaperTradingPrices", daemon=True)
+        replay_thread.start()
+        try:
+            super().run()
+        finally:
+            self._replay_stopped.set()
+            replay_thread.join()
+
+    def create_trading_bot(self) -> TradingBot:
+        return TradingBot(
+            use_testnet=self.config_manager.use_testnet,
+            # the simulated exchange has no request weight limit
+            request_weight_limit=sys.maxsize,
+            price_max_age=self.config_manager.price_max_age,
+            exchange_info_ttl=self.config_manager.exchange_info_ttl,
+            client=self.create_client(),
+            clock=self.clock,
+        )
+
+    def create_client(self) -> Any:
+        return SimulatedClient(self.engine)
+
+    def create_order_fulfilled_checker(self) -> OrderFulfilledChecker:
+        checker = PaperOrderChecker(
+            self.order_list_manager,
+            on_order_filled_callback=self.on_order_filled_callback,
+            get_order_status_callback=self.get_order_status_callback,
+            clock=self.virtual_clock,
+        )
+        self.engine.add_fill_listener(checker.on_fill)
+        return checker
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns the filled orders, the quote amount spent on buy orders and the balances of the engine.
+        """
+        invested_quote = sum(
+            (Decimal(order["cummulativeQuoteQty"]) for order in self.engine_fills if order["side"] == SIDE_BUY),
+            Decimal(0),
+        )
+        return {
+            "filled_orders": len(self.engine_fills),
+            "invested_quote": str(invested_quote),
+            "balances": {balance["asset"]: balance["free"] for balance in self.engine.account()["balances"]},
+        }
+
+    def __replay_prices(self) -> None:
+        if self.price_feed is not None:
+            for timestamp, prices in self.price_feed.steps():
+                if timestamp >= self.end_time:
+                    break
+                if self.clock.wait(self._replay_stopped, timestamp - self.clock.time()):
+                    return
+                for symbol, price in prices:
+                    self.engine.set_price(symbol, price)
+        if not self.clock.wait(self._replay_stopped, self.end_time - self.clock.time()):
+            LOG_INFO(self._debug_tag, "End time reached, stopping")
+            self.stop()
+
+
+def main() -> None:
+    """
+    Runs the bot with the configs of the current directory on historical klines, e.g.
+    python -m dca_investment_bot.paper_trading --klines BTCUSDT:BTC:USDT:BTCUSDT-1h.csv --balance USDT=10000
+    --start 2022-01-01 --end 2023-01-01
+    The orders are written to the orders directory like in a real run, so use a separate directory.
+    A log level of WARNING or higher keeps the run fast.
+    """
+    import argparse
+    import datetime
+    import json
+    import os
+
+    from dca_investment_bot.backtester import load_klines
+    from dca_investment_bot.clock import SYSTEM_CLOCK
+    from dca_investment_bot.exchange_simulator import SimulatedSymbol
+    from dca_investment_bot.logger import init_logger
+    from dca_investment_bot.paths import Paths
+
+    parser = argparse.ArgumentParser(description="Runs the DCA bot on historical prices with virtual time")
+    parser.add_argument("--klines", action="append", required=True, help="SYMBOL:BASE:QUOTE:KLINE_FILE")
+    parser.add_argument("--balance", action="append", default=[], help="ASSET=AMOUNT")
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    Paths.init_root_path(os.path.abspath(os.curdir))
+    config_manager = ConfigManager()
+    config_manager.load_and_validate_config()
+    # load_and_validate_config sets the defaults of missing values
+    assert config_manager.log_level is not None and config_manager.log_file is not None
+    init_logger(config_manager.log_level, config_manager.log_file)
+
+    assets: Dict[str, Tuple[str, str]] = {}
+    klines: Dict[str, "Klines"] = {}
+    for spec in args.klines:
+        symbol, base_asset, quote_asset, filepath = spec.split(":", 3)
+        assets[symbol] = (base_asset, quote_asset)
+        klines[symbol] = load_klines(filepath)
+    price_feed = KlinePriceFeed(klines)
+    first_prices = price_feed.first_prices()
+
+    start_time = SYSTEM_CLOCK.timestamp(datetime.datetime.strptime(args.start, "%Y-%m-%d"))
+    end_time = SYSTEM_CLOCK.timestamp(datetime.datetime.strptime(args.end, "%Y-%m-%d"))
+    clock = VirtualClock(start_time)
+    engine = MatchingEngine(
+        [SimulatedSymbol(symbol, *assets[symbol], first_prices[symbol]) for symbol in klines],
+        dict(balance.split("=") for balance in (args.balance or ["USDT=10000"])),
+        time_function=clock.time,
+    )
+    invester = PaperTradingInvester(config_manager, engine, clock, end_time, price_feed)
+    invester.run()
+    print(json.dumps(invester.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import csv
+import itertools
+import os
+import shutil
+import tempfile
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+
+import numpy as np
+
+from dca_investment_bot.backtester import Backtester
+from dca_investment_bot.backtester import KLINE_COLUMNS
+from dca_investment_bot.backtester import Klines
+from dca_investment_bot.backtester import run_backtests
+from dca_investment_bot.dca_investment_parameter import DCAInvestmentParameter
+from dca_investment_bot.symbol_rules import SymbolRules
+
+"""
+Runs backtests for every combination of a parameter grid (interval, investment time,
+amount and symbol set) on a process pool.
+
+The klines are written once as .npy files and memory mapped by every worker,
+so the price history is shared through the page cache instead of being pickled to each worker.
+Only the parameters of a chunk of combinations are sent to the workers
+and only the summaries are sent back, results are streamed as chunks complete.
+The symbols of a combination are backtested side by side and share one quote balance.
+
+Requires numpy (pip install .[analytics]).
+"""
+
+SWEEP_INTERVALS = ["1d", "1w", "2w", "3w", "4w", "1M", "2M"]
+DEFAULT_CHUNK_SIZE = 64
+
+# set in every worker process by _init_worker
+_worker_backtesters: Dict[str, Backtester] = {}
+_worker_quote_balance: Optional[float] = None
+
+
+class SweepTable:
+    """
+    Rows of a parameter sweep, one dict per combination.
+    """
+
+    def __init__(self, rows: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.rows: List[Dict[str, Any]] = rows if rows is not None else []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def append(self, row: Dict[str, Any]) -> None:
+        self.rows.append(row)
+
+    def sorted_by(self, key: str, descending: bool = True) -> "SweepTable":
+        return SweepTable(sorted(self.rows, key=lambda row: row[key], reverse=descending))
+
+    def top(self, count: int, key: str = "return", descending: bool = True) -> List[Dict[str, Any]]:
+        return self.sorted_by(key, descending).rows[:count]
+
+    def to_csv(self, filepath: str) -> None:
+        if len(self.rows) == 0:
+            return
+        with open(filepath, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+
+class ParameterSweep:
+    def __init__(
+        self,
+        klines: Mapping[str, Klines],
+        symbol_infos: Mapping[str, Dict[str, Any]],
+        quote_balance: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        klines and symbol_infos (the symbol info of the exchange info) map the symbols to their data.
+        quote_balance is shared by all symbols of a combination, None for an unlimited balance.
+        max_workers defaults to the number of cpus.
+        """
+        self._klines = klines
+        self._symbol_infos = symbol_infos
+        self._quote_balance = quote_balance
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+
+    @staticmethod
+    def grid(
+        symbol_sets: Sequence[Sequence[str]],
+        intervals: Sequence[str],
+        investment_times: Sequence[str],
+        amounts: Sequence[float],
+        start_date: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns all combinations of the parameters.
+        """
+        return [
+            {
+                "symbols": tuple(symbols),
+                "interval": interval,
+                "investment_time": investment_time,
+                "amount": amount,
+                "start_date": start_date,
+            }
+            for symbols, interval, investment_time, amount in itertools.product(
+                symbol_sets, intervals, investment_times, amounts
+            )
+        ]
+
+    def run(self, combinations: Sequence[Dict[str, Any]]) -> SweepTable:
+        table = SweepTable()
+        for row in self.run_iter(combinations):
+            table.append(row)
+        return table
+
+    def run_iter(self, combinations: Sequence[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the result rows as soon as their chunk is done, not in the order of the combinations.
+        """
+        kline_directory = tempfile.mkdtemp(prefix="dca_sweep_")
+        try:
+            for symbol, klines in self._klines.items():
+                _store_klines(klines, os.path.join(kline_directory, symbol))
+            chunks = [
+                list(combinations[i : i + self._chunk_size]) for i in range(0, len(combinations), self._chunk_size)
+            ]
+            with ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                initializer=_init_worker,
+                initargs=(kline_directory, dict(self._symbol_infos), self._quote_balance),
+            ) as executor:
+                futures = [executor.submit(_run_chunk, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    yield from future.result()
+        finally:
+            shutil.rmtree(kline_directory, ignore_errors=True)
+
+
+def _store_klines(klines: Klines, directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for name in KLINE_COLUMNS:
+        np.save(os.path.join(directory, name + ".npy"), getattr(klines, name))
+
+
+def _open_klines(directory: str) -> Klines:
+    columns = [np.load(os.path.join(directory, name + ".npy"), mmap_mode="r") for name in KLINE_COLUMNS]
+    return Klines(*columns)
+
+
+def _init_worker(kline_directory: str, symbol_infos: Dict[str, Dict[str, Any]], quote_balance: Optional[float]) -> None:
+    global _worker_quote_balance
+    _worker_quote_balance = quote_balance
+    _worker_backtesters.clear()
+    for symbol, symbol_info in symbol_infos.items():
+        symbol_directory = os.path.join(kline_directory, symbol)
+        if os.path.isdir(symbol_directory):
+            _worker_backtesters[symbol] = Backtester(_open_klines(symbol_directory), SymbolRules(symbol_info))
+
+
+def _run_chunk(combinations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [_run_combination(combination) for combination in combinations]
+
+
+def _run_combination(combination: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Backtests every symbol of the set with the same parameters and one shared quote balance and adds up the results.
+    """
+    runs = [
+        (
+            _worker_backtesters[symbol],
+            DCAInvestmentParameter(
+                {
+                    "symbol": symbol,
+                    "investment_amount_quoteasset": combination["amount"],
+                    "interval": combination["interval"],
+                    "investment_time": combination["investment_time"],
+                    "start_date": combination["start_date"],
+                }
+            ),
+        )
+        for symbol in combination["symbols"]
+    ]
+    totals: Dict[str, float] = {"fills": 0, "invested_quote": 0.0, "final_value": 0.0}
+    for result in run_backtests(runs, _worker_quote_balance):
+        totals["fills"] += result.fill_count
+        totals["invested_quote"] += result.invested_quote
+        totals["final_value"] += result.final_value
+
+    pnl = totals["final_value"] - totals["invested_quote"]
+    row = dict(combination)
+    row["symbols"] = ",".join(combination["symbols"])
+    row.update(totals)
+    row["pnl"] = pnl
+    row["return"] = pnl / totals["invested_quote"] if totals["invested_quote"] > 0 else 0.0
+    return row
@@ -27,10 +27,28 @@ class Paths:
     order_filename = "orders.json"
     order_filepath = os.path.join(root_path, orders_directory, order_filename)
 
+    # /orders/orders_journal.jsonl
+    order_journal_filename = "orders_journal.jsonl"
+    order_journal_filepath = os.path.join(root_path, orders_directory, order_journal_filename)
+
+    # /orders/orders.sqlite3
+    order_database_filename = "orders.sqlite3"
+    order_database_filepath = os.path.join(root_path, orders_directory, order_database_filename)
+
     # /configs/dca_investment_parameter.json
     dca_filename = "dca_investment_parameter.json"
     dca_file_path = os.path.join(root_path, config_directory, dca_filename)
 
+    # /cache
+    cache_directory = "cache"
+
+    # /cache/exchange_info.json
+    exchange_info_filename = "exchange_info.json"
+    exchange_info_filepath = os.path.join(root_path, cache_directory, exchange_info_filename)
+    # /cache/exchange_info_testnet.json
+    exchange_info_testnet_filename = "exchange_info_testnet.json"
+    exchange_info_testnet_filepath = os.path.join(root_path, cache_directory, exchange_info_testnet_filename)
+
     # /logs
     logs_directory = "logs"
     default_log_filename = "bot.log"
@@ -0,0 +1,197 @@
+from decimal import Decimal
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+
+import numpy as np
+from binance.enums import SIDE_BUY
+from binance.enums import SIDE_SELL
+
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.order_history_export import FIXED_POINT_SCALE
+from dca_investment_bot.order_history_export import OrderHistory
+from dca_investment_bot.order_history_export import SIDE_CODES
+
+"""
+Computes cost basis, average entry price, invested quote and PnL per symbol
+and for the whole portfolio from the fulfilled orders.
+
+The fills are aggregated per symbol into exact fixed-point sums (see order_history_export),
+new fills are added to the sums instead of recomputing the whole history.
+The sums are int64 arrays and fall back to object arrays of python ints when they could overflow.
+A report combines the sums with the current prices, e.g. from a single batched
+price request (TradingBot.get_prices).
+
+Uses the average cost method: every sell reduces the position at the average entry price of all buys.
+The portfolio totals add up quote amounts of all symbols, so they assume all symbols share the same quote asset.
+Requires numpy (pip install .[analytics]).
+"""
+
+# the sums switch to python ints once they could exceed this bound,
+# it leaves room for the rounding of the float estimate (see PortfolioAnalytics.add_history)
+INT64_SUM_LIMIT = 2**62
+
+
+class PortfolioReport:
+    """
+    Columns per symbol (in the order of symbols) and the totals of the portfolio, as floats.
+    Values that need a price are nan for symbols without a price.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        position: np.ndarray,
+        invested_quote: np.ndarray,
+        avg_entry_price: np.ndarray,
+        cost_basis: np.ndarray,
+        realized_pnl: np.ndarray,
+        price: np.ndarray,
+    ) -> None:
+        self.symbols = symbols
+        self.position = position
+        self.invested_quote = invested_quote
+        self.avg_entry_price = avg_entry_price
+        self.cost_basis = cost_basis
+        self.realized_pnl = realized_pnl
+        self.price = price
+        self.market_value = position * price
+        self.unrealized_pnl = self.market_value - cost_basis
+
+    def totals(self) -> Dict[str, float]:
+        return {
+            "invested_quote": float(self.invested_quote.sum()),
+            "cost_basis": float(self.cost_basis.sum()),
+            "realized_pnl": float(self.realized_pnl.sum()),
+            "market_value": float(np.nansum(self.market_value)),
+            "unrealized_pnl": float(np.nansum(self.unrealized_pnl)),
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Returns one dict per symbol, e.g. to send it to the notifier app.
+        """
+        return [
+            {
+                "symbol": symbol,
+                "position": float(self.position[i]),
+                "invested_quote": float(self.invested_quote[i]),
+                "avg_entry_price": float(self.avg_entry_price[i]),
+                "cost_basis": float(self.cost_basis[i]),
+                "realized_pnl": float(self.realized_pnl[i]),
+                "price": float(self.price[i]),
+                "market_value": float(self.market_value[i]),
+                "unrealized_pnl": float(self.unrealized_pnl[i]),
+            }
+            for i, symbol in enumerate(self.symbols)
+        ]
+
+
+class PortfolioAnalytics:
+    def __init__(self) -> None:
+        self._symbols: List[str] = []
+        self._symbol_codes: Dict[str, int] = {}
+        # exact fixed-point sums per symbol code, int64 or object (python ints) if they could overflow int64
+        self._bought_qty = np.zeros(0, dtype=np.int64)
+        self._bought_quote = np.zeros(0, dtype=np.int64)
+        self._sold_qty = np.zeros(0, dtype=np.int64)
+        self._sold_quote = np.zeros(0, dtype=np.int64)
+        self._fill_count = 0
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def fill_count(self) -> int:
+        return self._fill_count
+
+    def add_orders(self, orders: Iterable[BinanceOrder]) -> None:
+        """
+        Adds fulfilled orders, every order must only be added once.
+        """
+        self.add_history(OrderHistory.from_orders(orders))
+
+    def add_history(self, history: OrderHistory) -> None:
+        """
+        Adds the fills of an (exported) order history, see order_history_export.
+        """
+        if len(history) == 0:
+            return
+        # map the symbol codes of the history to our own codes
+        code_map = np.array([self.__symbol_code(symbol) for symbol in history.symbols], dtype=np.intp)
+        codes = code_map[history.symbol_code]
+        self.__grow(len(self._symbols))
+
+        executed_qty = history.executed_qty
+        quote_qty = history.quote_qty
+        if self._bought_qty.dtype != object and not self.__fits_int64(executed_qty, quote_qty):
+            self.__use_python_ints()
+        if self._bought_qty.dtype == object:
+            executed_qty = executed_qty.astype(object)
+            quote_qty = quote_qty.astype(object)
+
+        buys = history.side == SIDE_CODES[SIDE_BUY]
+        sells = history.side == SIDE_CODES[SIDE_SELL]
+        np.add.at(self._bought_qty, codes[buys], executed_qty[buys])
+        np.add.at(self._bought_quote, codes[buys], quote_qty[buys])
+        np.add.at(self._sold_qty, codes[sells], executed_qty[sells])
+        np.add.at(self._sold_quote, codes[sells], quote_qty[sells])
+        self._fill_count += int(np.count_nonzero(buys | sells))
+
+    def report(self, prices: Mapping[str, Decimal]) -> PortfolioReport:
+        """
+        Returns the analytics of all symbols with the given current prices.
+        """
+        bought_qty = _to_float(self._bought_qty)
+        bought_quote = _to_float(self._bought_quote)
+        sold_qty = _to_float(self._sold_qty)
+        sold_quote = _to_float(self._sold_quote)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_entry_price = np.where(bought_qty > 0, bought_quote / bought_qty, 0.0)
+        position = bought_qty - sold_qty
+        cost_basis = position * avg_entry_price
+        realized_pnl = sold_quote - sold_qty * avg_entry_price
+        price = np.array([float(prices[s]) if s in prices else np.nan for s in self._symbols], dtype=np.float64)
+        return PortfolioReport(self.symbols(), position, bought_quote, avg_entry_price, cost_basis, realized_pnl, price)
+
+    def __symbol_code(self, symbol: str) -> int:
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            code = len(self._symbols)
+            self._symbol_codes[symbol] = code
+            self._symbols.append(symbol)
+        return code
+
+    def __grow(self, size: int) -> None:
+        missing = size - len(self._bought_qty)
+        if missing <= 0:
+            return
+        padding = np.zeros(missing, dtype=self._bought_qty.dtype)
+        self._bought_qty = np.concatenate([self._bought_qty, padding])
+        self._bought_quote = np.concatenate([self._bought_quote, padding])
+        self._sold_qty = np.concatenate([self._sold_qty, padding])
+        self._sold_quote = np.concatenate([self._sold_quote, padding])
+
+    def __fits_int64(self, executed_qty: np.ndarray, quote_qty: np.ndarray) -> bool:
+        """
+        Upper bound of every sum after adding the columns, estimated with floats so the estimate itself can't overflow.
+        """
+        largest_sum = max(
+            float(np.abs(sums).max(initial=0))
+            for sums in (self._bought_qty, self._bought_quote, self._sold_qty, self._sold_quote)
+        )
+        added = max(float(np.abs(executed_qty).sum(dtype=np.float64)), float(np.abs(quote_qty).sum(dtype=np.float64)))
+        return largest_sum + added < INT64_SUM_LIMIT
+
+    def __use_python_ints(self) -> None:
+        self._bought_qty = self._bought_qty.astype(object)
+        self._bought_quote = self._bought_quote.astype(object)
+        self._sold_qty = self._sold_qty.astype(object)
+        self._sold_quote = self._sold_quote.astype(object)
+
+
+def _to_float(sums: np.ndarray) -> np.ndarray:
+    # python ints are divided exactly and rounded once
+    return np.asarray(sums / FIXED_POINT_SCALE, dtype=np.float64)
@@ -0,0 +1,137 @@
+import threading
+from decimal import Decimal
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
+from dca_investment_bot.exceptions import PriceNotAvailableException
+from dca_investment_bot.logger import LOG_DEBUG
+from dca_investment_bot.logger import LOG_WARNING
+
+"""
+Fetches the prices of all configured symbols with a single request.
+Prices are served from the last result until they are older than max_age_seconds.
+Symbols without a price in the result are dropped from the request (until the symbols are set again),
+looking up their price raises PriceNotAvailableException.
+"""
+
+
+class PriceProvider:
+    def __init__(
+        self,
+        fetch_prices: Optional[Callable[[List[str]], Dict[str, Decimal]]] = None,
+        max_age_seconds: float = 10,
+        clock: Clock = SYSTEM_CLOCK,
+    ) -> None:
+        """
+        fetch_prices is called with all symbols to refresh the prices on lookup.
+        Without it (e.g. when prices are fetched asynchronously), the prices
+        have to be refreshed with update() before looking them up.
+        """
+        self._debug_tag = "[PriceProvider]"
+        self._fetch_prices = fetch_prices
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._symbols: List[str] = []
+        self._prices: Dict[str, Decimal] = {}
+        # symbols that were missing in a result, they are not requested again
+        self._unavailable: Set[str] = set()
+        self._fetched_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def set_symbols(self, symbols: Iterable[str]) -> None:
+        """
+        Sets the symbols that are fetched with every request.
+        """
+        with self._lock:
+            self._symbols = list(dict.fromkeys(symbols))
+            self._unavailable = set()
+            self._fetched_at = None
+
+    def get_price(self, symbol: str) -> Decimal:
+        """
+        Returns the price of the symbol.
+        All symbols are fetched again if the prices are outdated or the symbol is unknown.
+        """
+        with self._lock:
+            self.__add_symbol(symbol)
+            if self.__is_outdated():
+                self.__refresh()
+            return self.__price(symbol)
+
+    def get_prices(self) -> Dict[str, Decimal]:
+        """
+        Returns the prices of all configured symbols.
+        """
+        with self._lock:
+            if self.__is_outdated():
+                self.__refresh()
+            return dict(self._prices)
+
+    def needs_refresh(self, symbol: Optional[str] = None) -> bool:
+        """
+        Returns True if the prices are outdated or the symbol is unknown.
+        Unknown symbols are added to the symbols that are fetched.
+        """
+        with self._lock:
+            if symbol is not None:
+                self.__add_symbol(symbol)
+            return self.__is_outdated()
+
+    def get_symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._symbols)
+
+    def update(self, prices: Dict[str, Decimal]) -> None:
+        """
+        Replaces the prices with the given prices.
+        """
+        with self._lock:
+            self.__set_prices(prices)
+
+    def get_cached_price(self, symbol: str) -> Decimal:
+        """
+        Returns the last fetched price of the symbol without refreshing it.
+        """
+        with self._lock:
+            return self.__price(symbol)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._fetched_at = None
+
+    def __is_outdated(self) -> bool:
+        return self._fetched_at is None or self._clock.monotonic() - self._fetched_at > self._max_age_seconds
+
+    def __refresh(self) -> None:
+        if self._fetch_prices is None:
+            raise Exception("Prices are outdated and no fetch function is set")
+        self.__set_prices(self._fetch_prices(self._symbols) if len(self._symbols) > 0 else {})
+        LOG_DEBUG(self._debug_tag, f"Fetched prices for {len(self._prices)} symbols")
+
+    def __set_prices(self, prices: Dict[str, Decimal]) -> None:
+        missing_symbols = [symbol for symbol in self._symbols if symbol not in prices]
+        if len(missing_symbols) > 0:
+            LOG_WARNING(
+                self._debug_tag, f"No prices returned for {', '.join(missing_symbols)}, not requesting them again"
+            )
+            self._unavailable.update(missing_symbols)
+            self._symbols = [symbol for symbol in self._symbols if symbol in prices]
+        self._prices = prices
+        self._fetched_at = self._clock.monotonic()
+
+    def __add_symbol(self, symbol: str) -> None:
+        if symbol not in self._symbols and symbol not in self._unavailable:
+            self._symbols.append(symbol)
+            self._fetched_at = None
+
+    def __price(self, symbol: str) -> Decimal:
+        price = self._prices.get(symbol)
+        if price is None:
+            raise PriceNotAvailableException(symbol)
+        return price
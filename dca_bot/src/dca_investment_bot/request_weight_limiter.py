@@ -0,0 +1,223 @@
+import asyncio
+import collections
+import threading
+import time
+import typing
+from typing import Any
+from typing import Deque
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+"""
+Keeps track of the request weight used in the last minute.
+Binance bans the api key if the request weight limit is exceeded,
+so every request waits until enough weight is available.
+
+Every request reserves its weight for one window, a token bucket whose tokens come back
+window_seconds after they were used. A bucket that refills continuously would allow up to
+twice the limit within one minute of binance.
+The used weight binance reports in the response headers is fed back (update_used_weight),
+weight used by other processes with the same api key or ip is then reserved as well.
+
+Requests have a priority: PRIORITY_ORDER (placing and canceling orders) before PRIORITY_DEFAULT
+before PRIORITY_LOW (e.g. requests whose result is only logged). A request waits while a request with
+a higher priority waits, and the lower priorities can't use the last part of the limit (PRIORITY_RESERVES),
+so orders don't wait for requests that are less important.
+"""
+
+# request weights of the used endpoints
+# see https://binance-docs.github.io/apidocs/spot/en/#limits
+ENDPOINT_WEIGHTS: typing.Dict[str, int] = {
+    "exchangeInfo": 20,
+    "avgPrice": 2,
+    "tickerPrice": 4,
+    "tickerPrice_symbol": 2,
+    "account": 20,
+    "order_get": 4,
+    "order_post": 1,
+    "order_delete": 1,
+    "openOrders": 6,
+    "userDataStream": 1,
+}
+
+DEFAULT_REQUEST_WEIGHT_LIMIT = 1200
+
+# used weight of the current minute returned by binance with every response
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+# seconds to wait after binance rejected a request because of the request weight (http 429 or 418)
+RETRY_AFTER_HEADER = "Retry-After"
+RATE_LIMIT_STATUS_CODES = (429, 418)
+
+PRIORITY_ORDER = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_LOW = 2
+# fraction of the limit the priority can not use
+PRIORITY_RESERVES: typing.Dict[int, float] = {
+    PRIORITY_ORDER: 0.0,
+    PRIORITY_DEFAULT: 0.05,
+    PRIORITY_LOW: 0.2,
+}
+# priority of the endpoints if the request does not set one
+ENDPOINT_PRIORITIES: typing.Dict[str, int] = {
+    "order_post": PRIORITY_ORDER,
+    "order_delete": PRIORITY_ORDER,
+}
+
+
+class RequestWeightLimiter:
+    def __init__(self, weight_limit: int = DEFAULT_REQUEST_WEIGHT_LIMIT, window_seconds: float = 60.0) -> None:
+        """
+        One limiter is shared by all threads and coroutines that use the same api key.
+        """
+        self._debug_tag = "[RequestWeightLimiter]"
+        self._weight_limit = weight_limit
+        self._window_seconds = window_seconds
+        # weight limit of every priority, the rest is reserved for the higher priorities
+        self._priority_limits = {
+            priority: max(1, weight_limit - int(weight_limit * reserve))
+            for priority, reserve in PRIORITY_RESERVES.items()
+        }
+        # (timestamp, weight) of every request in the current window
+        self._requests: Deque[Tuple[float, int]] = collections.deque()
+        self._used_weight = 0
+        # number of waiting requests per priority
+        self._waiting = {priority: 0 for priority in PRIORITY_RESERVES}
+        # no request is sent before this time, set after binance rejected a request
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, weight: int, priority: int = PRIORITY_DEFAULT) -> None:
+        """
+        Blocks until the request weight is available and reserves it.
+        Can be called from multiple threads.
+        """
+        with self._condition:
+            wait_time = self.__try_acquire(weight, priority)
+            if wait_time == 0:
+                return
+            self._waiting[priority] += 1
+            try:
+                while wait_time > 0:
+                    self._condition.wait(wait_time)
+                    wait_time = self.__try_acquire(weight, priority)
+            finally:
+                self._waiting[priority] -= 1
+                # requests with a lower priority may continue now
+                self._condition.notify_all()
+
+    async def acquire_async(self, weight: int, priority: int = PRIORITY_DEFAULT) -> None:
+        """
+        Same as acquire() but waits without blocking the event loop.
+        """
+        with self._condition:
+            wait_time = self.__try_acquire(weight, priority)
+            if wait_time == 0:
+                return
+            self._waiting[priority] += 1
+        try:
+            while wait_time > 0:
+                await asyncio.sleep(wait_time)
+                with self._condition:
+                    wait_time = self.__try_acquire(weight, priority)
+        finally:
+            with self._condition:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def endpoint(self, endpoint: str, priority: Optional[int] = None) -> None:
+        """
+        Reserves the request weight of the given endpoint (see ENDPOINT_WEIGHTS).
+        Without priority the priority of the endpoint is used (see ENDPOINT_PRIORITIES).
+        """
+        self.acquire(ENDPOINT_WEIGHTS[endpoint], self.__endpoint_priority(endpoint, priority))
+
+    async def endpoint_async(self, endpoint: str, priority: Optional[int] = None) -> None:
+        await self.acquire_async(ENDPOINT_WEIGHTS[endpoint], self.__endpoint_priority(endpoint, priority))
+
+    def used_weight(self) -> int:
+        with self._condition:
+            self.__drop_expired_requests(time.monotonic())
+            return self._used_weight
+
+    def update_used_weight(self, used_weight: int) -> None:
+        """
+        Feeds back the used weight reported by binance.
+        Weight that is not reserved yet (used by other processes) is reserved for a whole window.
+        """
+        with self._condition:
+            now = time.monotonic()
+            self.__drop_expired_requests(now)
+            untracked_weight = used_weight - self._used_weight
+            if untracked_weight > 0:
+                self._requests.append((now, untracked_weight))
+                self._used_weight += untracked_weight
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Feeds back the used weight of the response headers (see USED_WEIGHT_HEADER), if there are any.
+        """
+        if headers is None:
+            return
+        used_weight = headers.get(USED_WEIGHT_HEADER)
+        if used_weight is not None and used_weight.isdigit():
+            self.update_used_weight(int(used_weight))
+
+    def pause(self, seconds: float) -> None:
+        """
+        No request gets its weight before seconds passed, e.g. after binance returned http 429.
+        """
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def paused_seconds(self) -> float:
+        """
+        Returns the seconds until requests get their weight again, 0 if the limiter is not paused.
+        """
+        with self._condition:
+            return max(0.0, self._paused_until - time.monotonic())
+
+    def pause_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Pauses for the time of the Retry-After header, a whole window if it is missing.
+        """
+        retry_after = headers.get(RETRY_AFTER_HEADER) if headers is not None else None
+        self.pause(float(retry_after) if retry_after is not None and retry_after.isdigit() else self._window_seconds)
+
+    def __endpoint_priority(self, endpoint: str, priority: Optional[int]) -> int:
+        if priority is not None:
+            return priority
+        return ENDPOINT_PRIORITIES.get(endpoint, PRIORITY_DEFAULT)
+
+    def __try_acquire(self, weight: int, priority: int) -> float:
+        # reserves the weight and returns 0 or returns the time to wait until it could be available
+        # a single request can never be bigger than the limit of its priority
+        priority_limit = self._priority_limits[priority]
+        weight = min(weight, priority_limit)
+        now = time.monotonic()
+        self.__drop_expired_requests(now)
+        if now < self._paused_until:
+            return self._paused_until - now
+        higher_priority_waiting = any(self._waiting[p] > 0 for p in self._waiting if p < priority)
+        if not higher_priority_waiting and self._used_weight + weight <= priority_limit:
+            self._requests.append((now, weight))
+            self._used_weight += weight
+            return 0
+        if len(self._requests) == 0:
+            # the higher priority request gets its weight right away
+            return 0.001
+        # wait until the oldest request leaves the window
+        oldest_timestamp = self._requests[0][0]
+        return max(0.001, oldest_timestamp + self._window_seconds - now)
+
+    def __drop_expired_requests(self, now: float) -> None:
+        while len(self._requests) > 0 and self._requests[0][0] + self._window_seconds <= now:
+            _, weight = self._requests.popleft()
+            self._used_weight -= weight
+
+
+def response_headers(response: Any) -> Optional[Mapping[str, str]]:
+    """
+    Returns the headers of a requests or aiohttp response, None without a response (e.g. the SimulatedClient).
+    """
+    return getattr(response, "headers", None)
@@ -0,0 +1,173 @@
+import threading
+from decimal import Decimal
+from decimal import localcontext
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+"""
+Precompiled trading rules of a symbol.
+The filters of the symbol info are parsed once into Decimals,
+so validating and rounding an order only needs a few comparisons.
+See https://binance-docs.github.io/apidocs/spot/en/#filters
+"""
+
+
+def _decimal_or_none(value: Optional[str]) -> Optional[Decimal]:
+    """
+    Binance uses 0 to disable a limit (e.g. maxPrice of 0 means no max price).
+    """
+    if value is None:
+        return None
+    decimal_value = Decimal(value)
+    return decimal_value if decimal_value != 0 else None
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    return int(value) if value is not None else None
+
+
+def _round_to_step(value: Decimal, step_size: Optional[Decimal]) -> Decimal:
+    if step_size is None:
+        return value
+    return (value / step_size).to_integral_value() * step_size
+
+
+def _matches_step(value: Decimal, step_size: Optional[Decimal]) -> bool:
+    if step_size is None:
+        return True
+    # the bot lowers the decimal precision to 8 digits, the remainder needs every digit of value / step_size
+    with localcontext() as context:
+        context.prec = max(context.prec, value.adjusted() - step_size.adjusted() + 2)
+        return value % step_size == 0
+
+
+class SymbolRules:
+    def __init__(self, symbol_info: Dict[str, Any]) -> None:
+        self.symbol: str = symbol_info["symbol"]
+        self.base_asset: str = symbol_info["baseAsset"]
+        self.quote_asset: str = symbol_info["quoteAsset"]
+        self.filters: Dict[str, Dict[str, Any]] = {f["filterType"]: f for f in symbol_info.get("filters", [])}
+
+        # PRICE_FILTER
+        price_filter = self.filters.get("PRICE_FILTER")
+        self.has_price_filter = price_filter is not None
+        self.min_price = _decimal_or_none(price_filter.get("minPrice")) if price_filter else None
+        self.max_price = _decimal_or_none(price_filter.get("maxPrice")) if price_filter else None
+        self.tick_size = _decimal_or_none(price_filter.get("tickSize")) if price_filter else None
+
+        # PERCENT_PRICE and PERCENT_PRICE_BY_SIDE (buy side, the bot only places buy orders)
+        percent_price = self.filters.get("PERCENT_PRICE")
+        percent_price_by_side = self.filters.get("PERCENT_PRICE_BY_SIDE")
+        self.multiplier_up: Optional[Decimal] = None
+        self.multiplier_down: Optional[Decimal] = None
+        if percent_price is not None:
+            self.multiplier_up = _decimal_or_none(percent_price.get("multiplierUp"))
+            self.multiplier_down = _decimal_or_none(percent_price.get("multiplierDown"))
+        elif percent_price_by_side is not None:
+            self.multiplier_up = _decimal_or_none(percent_price_by_side.get("bidMultiplierUp"))
+            self.multiplier_down = _decimal_or_none(percent_price_by_side.get("bidMultiplierDown"))
+
+        # LOT_SIZE
+        lot_filter = self.filters.get("LOT_SIZE")
+        self.has_lot_filter = lot_filter is not None
+        self.min_qty = _decimal_or_none(lot_filter.get("minQty")) if lot_filter else None
+        self.max_qty = _decimal_or_none(lot_filter.get("maxQty")) if lot_filter else None
+        self.step_size = _decimal_or_none(lot_filter.get("stepSize")) if lot_filter else None
+
+        # MARKET_LOT_SIZE
+        market_lot_filter = self.filters.get("MARKET_LOT_SIZE")
+        self.market_min_qty = _decimal_or_none(market_lot_filter.get("minQty")) if market_lot_filter else None
+        self.market_max_qty = _decimal_or_none(market_lot_filter.get("maxQty")) if market_lot_filter else None
+        self.market_step_size = _decimal_or_none(market_lot_filter.get("stepSize")) if market_lot_filter else None
+
+        # MIN_NOTIONAL (replaced by NOTIONAL on newer symbols)
+        min_notional_filter = self.filters.get("MIN_NOTIONAL")
+        notional_filter = self.filters.get("NOTIONAL")
+        self.has_notional_filter = min_notional_filter is not None or notional_filter is not None
+        self.min_notional: Optional[Decimal] = None
+        self.max_notional: Optional[Decimal] = None
+        if min_notional_filter is not None:
+            self.min_notional = _decimal_or_none(min_notional_filter.get("minNotional"))
+        if notional_filter is not None:
+            self.min_notional = _decimal_or_none(notional_filter.get("minNotional"))
+            self.max_notional = _decimal_or_none(notional_filter.get("maxNotional"))
+
+        # order count and position limits
+        self.iceberg_parts = _int_or_none(self.filters.get("ICEBERG_PARTS", {}).get("limit"))
+        self.max_num_orders = _int_or_none(self.filters.get("MAX_NUM_ORDERS", {}).get("maxNumOrders"))
+        self.max_num_algo_orders = _int_or_none(self.filters.get("MAX_NUM_ALGO_ORDERS", {}).get("maxNumAlgoOrders"))
+        self.max_num_iceberg_orders = _int_or_none(
+            self.filters.get("MAX_NUM_ICEBERG_ORDERS", {}).get("maxNumIcebergOrders")
+        )
+        self.max_position = _decimal_or_none(self.filters.get("MAX_POSITION", {}).get("maxPosition"))
+
+        # TRAILING_DELTA
+        trailing_delta = self.filters.get("TRAILING_DELTA", {})
+        self.min_trailing_above_delta = _int_or_none(trailing_delta.get("minTrailingAboveDelta"))
+        self.max_trailing_above_delta = _int_or_none(trailing_delta.get("maxTrailingAboveDelta"))
+        self.min_trailing_below_delta = _int_or_none(trailing_delta.get("minTrailingBelowDelta"))
+        self.max_trailing_below_delta = _int_or_none(trailing_delta.get("maxTrailingBelowDelta"))
+
+    def round_price(self, price: Decimal) -> Decimal:
+        """
+        Rounds the price to the tick size of the symbol.
+        """
+        return _round_to_step(price, self.tick_size)
+
+    def round_quantity(self, quantity: Decimal) -> Decimal:
+        """
+        Rounds the quantity to the lot step size of the symbol.
+        """
+        return _round_to_step(quantity, self.step_size)
+
+    def price_in_range(self, price: Decimal) -> bool:
+        return (self.min_price is None or price >= self.min_price) and (
+            self.max_price is None or price <= self.max_price
+        )
+
+    def price_matches_tick_size(self, price: Decimal) -> bool:
+        return _matches_step(price, self.tick_size)
+
+    def price_in_percent_range(self, price: Decimal, avg_price: Decimal) -> bool:
+        return (self.multiplier_up is None or price <= avg_price * self.multiplier_up) and (
+            self.multiplier_down is None or price >= avg_price * self.multiplier_down
+        )
+
+    def quantity_in_range(self, quantity: Decimal) -> bool:
+        return (self.min_qty is None or quantity >= self.min_qty) and (self.max_qty is None or quantity <= self.max_qty)
+
+    def quantity_matches_step_size(self, quantity: Decimal) -> bool:
+        return _matches_step(quantity, self.step_size)
+
+    def notional_in_range(self, notional: Decimal) -> bool:
+        return (self.min_notional is None or notional >= self.min_notional) and (
+            self.max_notional is None or notional <= self.max_notional
+        )
+
+
+class SymbolRulesCache:
+    """
+    Compiles the rules once per symbol.
+    Call invalidate() with the changed symbols when the exchange info changed
+    (see ExchangeInfoCache.add_invalidation_listener).
+    """
+
+    def __init__(self) -> None:
+        self._rules: Dict[str, SymbolRules] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol_info: Dict[str, Any]) -> SymbolRules:
+        symbol = symbol_info["symbol"]
+        rules = self._rules.get(symbol)
+        if rules is None:
+            rules = SymbolRules(symbol_info)
+            with self._lock:
+                self._rules[symbol] = rules
+        return rules
+
+    def invalidate(self, symbols: List[str]) -> None:
+        with self._lock:
+            for symbol in symbols:
+                self._rules.pop(symbol, None)
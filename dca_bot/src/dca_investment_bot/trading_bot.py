@@ -1,36 +1,107 @@
+import json
 import os
 import time
 from decimal import Decimal
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
 
-import requests
 from binance import Client
 from binance.enums import ORDER_TYPE_LIMIT
 from binance.enums import SIDE_BUY
 from binance.enums import TIME_IN_FORCE_GTC
 from binance.exceptions import BinanceAPIException
+from binance.streams import BinanceSocketManager
 
 import dca_investment_bot.global_vars as global_vars
+from dca_investment_bot.account_snapshot import AccountSnapshot
 from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import SYSTEM_CLOCK
+from dca_investment_bot.exceptions import UnknownSymbolException
+from dca_investment_bot.exchange_info_cache import DEFAULT_EXCHANGE_INFO_TTL
+from dca_investment_bot.exchange_info_cache import ExchangeInfoCache
+from dca_investment_bot.http_transport import HttpTransport
+from dca_investment_bot.http_transport import NETWORK_ERRORS
 from dca_investment_bot.logger import LOG_DEBUG
 from dca_investment_bot.logger import LOG_ERROR_AND_NOTIFY
 from dca_investment_bot.logger import LOG_INFO
 from dca_investment_bot.logger import LOG_WARNING
 from dca_investment_bot.order_validator import OrderValidator
+from dca_investment_bot.paths import Paths
+from dca_investment_bot.price_provider import PriceProvider
+from dca_investment_bot.request_weight_limiter import DEFAULT_REQUEST_WEIGHT_LIMIT
+from dca_investment_bot.request_weight_limiter import PRIORITY_DEFAULT
+from dca_investment_bot.request_weight_limiter import RATE_LIMIT_STATUS_CODES
+from dca_investment_bot.request_weight_limiter import RequestWeightLimiter
+from dca_investment_bot.request_weight_limiter import response_headers
+from dca_investment_bot.symbol_rules import SymbolRules
+from dca_investment_bot.symbol_rules import SymbolRulesCache
 
 # TODO: Remove LOG_INFO calls from this file or convert to LOG_DEBUG.
 
+ClientT = TypeVar("ClientT")
+
 
 class TradingBot:
-    def __init__(self, use_testnet=True):
+    def __init__(
+        self,
+        use_testnet=True,
+        request_weight_limit=DEFAULT_REQUEST_WEIGHT_LIMIT,
+        price_max_age=10,
+        exchange_info_ttl=DEFAULT_EXCHANGE_INFO_TTL,
+        api_url: Optional[str] = None,
+        client: Optional[Any] = None,
+        clock: Clock = SYSTEM_CLOCK,
+        request_weight_limiter: Optional[RequestWeightLimiter] = None,
+        transport: Optional[HttpTransport] = None,
+    ):
+        """
+        api_url replaces the binance api (e.g. http://127.0.0.1:8080/api for the exchange simulator).
+        client replaces the python-binance client (e.g. a SimulatedClient for paper trading),
+        connect() then uses it without api key and its exchange info is not cached in a file.
+        request_weight_limiter is shared with other bots using the same api key,
+        by default the bot has its own limiter with request_weight_limit.
+        transport pools the connections of the client and retries idempotent requests (see HttpTransport).
+        """
         self.debug_tag = "[TradingBot]"
         self.connected = False
         self.use_testnet = use_testnet
+        self.api_url = api_url
+        self.custom_client = client
+        # shared by all threads using this bot
+        if request_weight_limiter is None:
+            request_weight_limiter = RequestWeightLimiter(request_weight_limit)
+        self.request_weight_limiter = request_weight_limiter
+        self.transport = transport if transport is not None else HttpTransport()
+        self.account_snapshot = AccountSnapshot(self.__fetch_account, clock)
+        self.price_provider = PriceProvider(self.__fetch_prices, price_max_age, clock)
+        self.exchange_info_cache = ExchangeInfoCache(
+            self.__fetch_exchange_info,
+            exchange_info_filepath(use_testnet, api_url) if client is None else None,
+            exchange_info_ttl,
+            clock,
+        )
+        self.symbol_rules = SymbolRulesCache()
+        self.exchange_info_cache.add_invalidation_listener(self.symbol_rules.invalidate)
 
-        self.symbol_info_dict = {}
-        self.sockets = []
-        self.order_listeners = []
+        self.sockets: List[Any] = []
+        self.order_listeners: List[Any] = []
 
     def connect(self):
+        if self.custom_client is not None:
+            LOG_INFO(self.debug_tag, f"Using {type(self.custom_client).__name__} instead of binance")
+            self.client = self.custom_client
+            self.connected = True
+            self.exchange_info_cache.load()
+            self.exchange_info_cache.start_background_refresh()
+            return
+
         # load key and secret from env and throw error if they are empty
         key = os.environ.get("BINANCE_KEY")
         secret = os.environ.get("BINANCE_SECRET")
@@ -38,19 +109,30 @@ class TradingBot:
         if key is None or secret is None:
             raise Exception("Binance key or secret is not set")
 
-        if self.use_testnet:
+        if self.api_url is not None:
+            LOG_INFO(self.debug_tag, f"Using {self.api_url} instead of binance")
+        elif self.use_testnet:
             LOG_INFO(self.debug_tag, "Using testnet to connect to binance")
         else:
             LOG_INFO(self.debug_tag, "!!!Using MAINNET!!!")
 
+        client_class = client_class_for_api_url(Client, self.api_url)
         self.connected = False
+        attempt = 0
         while not self.connected:
             try:
-                self.client = Client(key, secret, testnet=self.use_testnet)
+                self.client = client_class(key, secret, testnet=self.use_testnet)
+                self.transport.mount(self.client.session)
                 self.connected = True
-            except requests.exceptions.ConnectionError:
-                LOG_WARNING("No internet connection... retrying in 10sec..")
-                time.sleep(10)
+                # symbol infos of all symbols, only fetched if the cache file is missing or outdated
+                self.exchange_info_cache.load()
+            except NETWORK_ERRORS:
+                self.connected = False
+                delay = self.transport.backoff(attempt)
+                LOG_WARNING(f"No internet connection... retrying in {delay:.1f}sec..")
+                time.sleep(delay)
+                attempt += 1
+        self.exchange_info_cache.start_background_refresh()
 
     def check_connected(self):
         if not self.connected:
@@ -61,26 +143,65 @@ class TradingBot:
             )
             raise Exception("Binance client is not connected")
 
-    def get_symbol_info(self, symbol):
+    def __request(self, endpoint: str, method_name: str, priority: Optional[int] = None, **params: Any) -> Any:
+        """
+        Calls the method of the client once the request weight of the endpoint is reserved
+        and feeds the used weight binance reports back to the limiter.
+        Idempotent requests are retried by the transport, every attempt reserves its weight.
+        """
         self.check_connected()
-        if symbol in self.symbol_info_dict:
-            return self.symbol_info_dict[symbol]
-        else:
-            symbol_info = self.client.get_symbol_info(symbol)
-            self.symbol_info_dict[symbol] = symbol_info
-            return symbol_info
+        return self.transport.call(endpoint, lambda: self.__send(endpoint, method_name, priority, **params))
+
+    def __send(self, endpoint: str, method_name: str, priority: Optional[int], **params: Any) -> Any:
+        self.request_weight_limiter.endpoint(endpoint, priority)
+        try:
+            return getattr(self.client, method_name)(**params)
+        except BinanceAPIException as e:
+            if e.status_code in RATE_LIMIT_STATUS_CODES:
+                LOG_WARNING(self.debug_tag, "Request weight limit exceeded, pausing all requests:", e)
+                self.request_weight_limiter.pause_from_headers(response_headers(e.response))
+            raise
+        finally:
+            # the client keeps the last response of any thread, an outdated used weight only makes requests wait longer
+            self.request_weight_limiter.update_from_headers(response_headers(getattr(self.client, "response", None)))
+
+    def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
+        """
+        Raises UnknownSymbolException if the exchange does not know the symbol.
+        """
+        self.check_connected()
+        return self.exchange_info_cache.get_symbol_info(symbol)
+
+    def get_symbol_rules(self, symbol: str) -> SymbolRules:
+        """
+        Returns the precompiled filters of the symbol.
+        """
+        return self.symbol_rules.get(self.get_symbol_info(symbol))
+
+    def add_symbol_info_listener(self, listener: Callable[[List[str]], None]) -> None:
+        """
+        listener is called with the symbols whose filters changed on an exchange info refresh.
+        """
+        self.exchange_info_cache.add_invalidation_listener(listener)
+
+    def __fetch_exchange_info(self) -> Dict[str, Any]:
+        exchange_info: Dict[str, Any] = self.__request("exchangeInfo", "get_exchange_info")
+        return exchange_info
 
     def close_all(self):
-        pass
+        self.exchange_info_cache.stop_background_refresh()
 
     def get_order_status(self, symbol, order_id):
-        self.check_connected()
-        return BinanceOrder(self.client.get_order(symbol=symbol, orderId=order_id))
+        return BinanceOrder(self.__request("order_get", "get_order", symbol=symbol, orderId=order_id))
 
     def create_limit_buy_order(self, symbol, limit, quantity) -> BinanceOrder:
         self.check_connected()
+        # the order locks part of the quote balance
+        self.account_snapshot.invalidate()
         return BinanceOrder(
-            self.client.create_order(
+            self.__request(
+                "order_post",
+                "create_order",
                 symbol=symbol,
                 side=SIDE_BUY,
                 type=ORDER_TYPE_LIMIT,
@@ -92,71 +213,197 @@ class TradingBot:
 
     def cancel_order(self, symbol, order_id):
         self.check_connected()
-        LOG_INFO(self.client.cancel_order(symbol=symbol, orderId=order_id))
+        self.account_snapshot.invalidate()
+        LOG_INFO(self.__request("order_delete", "cancel_order", symbol=symbol, orderId=order_id))
 
-    def get_asset_balance(self, asset: str):
+    def get_asset_balance(self, asset: str) -> Optional[Decimal]:
+        """
+        Returns the free balance of the asset, served from the account snapshot.
+        """
         self.check_connected()
-        return Decimal(self.client.get_asset_balance(asset)["free"])
+        return self.account_snapshot.get_free_balance(asset)
 
-    def get_orders(self, symbol: str):
-        self.check_connected()
+    def invalidate_account_snapshot(self) -> None:
+        """
+        Balances are fetched again on the next lookup.
+        Call this when the balances changed, e.g. an order got filled.
+        """
+        self.account_snapshot.invalidate()
+
+    def __fetch_account(self):
+        return self.__request("account", "get_account")
+
+    def get_orders(self, symbol: str, priority: int = PRIORITY_DEFAULT):
+        """
+        Returns the open orders of the symbol.
+        Use PRIORITY_LOW if the orders are only logged.
+        """
         orders = []
-        for order in self.client.get_open_orders(symbol=symbol):
+        for order in self.__request("openOrders", "get_open_orders", priority, symbol=symbol):
             orders.append(BinanceOrder(order))
         return orders
 
-    def get_avg_price(self, symbol: str):
-        self.check_connected()
-        return Decimal(self.client.get_avg_price(symbol=symbol)["price"])
+    def get_avg_price(self, symbol: str) -> Decimal:
+        """
+        Returns the current price of the symbol.
+        Prices of all configured symbols are fetched with a single ticker request
+        and reused until they are older than price_max_age seconds.
+        Raises UnknownSymbolException if the exchange does not know the symbol
+        and PriceNotAvailableException if it returned no price for it.
+        """
+        # an unknown symbol would make binance reject the request of all symbols
+        self.get_symbol_info(symbol)
+        return self.price_provider.get_price(symbol)
+
+    def get_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        """
+        Returns the current prices of the symbols, fetched together with the configured symbols in one request.
+        """
+        for symbol in symbols:
+            self.get_symbol_info(symbol)
+            # adds unknown symbols to the symbols that are fetched
+            self.price_provider.needs_refresh(symbol)
+        return {symbol: self.price_provider.get_price(symbol) for symbol in symbols}
+
+    def set_price_symbols(self, symbols: List[str]) -> None:
+        """
+        Sets the symbols whose prices are fetched together.
+        Symbols the exchange does not know are left out.
+        """
+        known_symbols = []
+        for symbol in symbols:
+            try:
+                self.get_symbol_info(symbol)
+                known_symbols.append(symbol)
+            except UnknownSymbolException as e:
+                LOG_WARNING(self.debug_tag, f"{e}, its price is not fetched")
+        self.price_provider.set_symbols(known_symbols)
+
+    def __fetch_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        try:
+            tickers = self.__request(
+                "tickerPrice", "get_symbol_ticker", symbols=json.dumps(symbols, separators=(",", ":"))
+            )
+        except BinanceAPIException as e:
+            if not is_invalid_symbol_error(e):
+                raise
+            # a symbol was delisted after the exchange info was fetched, fetch the prices one by one
+            LOG_WARNING(self.debug_tag, "Ticker request of all symbols rejected, fetching them one by one:", e)
+            tickers = []
+            for symbol in symbols:
+                try:
+                    tickers.append(self.__request("tickerPrice_symbol", "get_symbol_ticker", symbol=symbol))
+                except BinanceAPIException as symbol_error:
+                    if not is_invalid_symbol_error(symbol_error):
+                        raise
+                    LOG_WARNING(self.debug_tag, f"Ticker request of {symbol} rejected:", symbol_error)
+        return {ticker["symbol"]: Decimal(ticker["price"]) for ticker in tickers}
+
+    def create_listen_key(self) -> str:
+        """
+        Creates a listen key for the user data stream, see get_user_data_stream_url.
+        """
+        listen_key: str = self.__request("userDataStream", "stream_get_listen_key")
+        return listen_key
+
+    def keepalive_listen_key(self, listen_key: str) -> None:
+        """
+        Listen keys expire after 60 minutes without keepalive.
+        """
+        self.__request("userDataStream", "stream_keepalive", listenKey=listen_key)
+
+    def close_listen_key(self, listen_key: str) -> None:
+        self.__request("userDataStream", "stream_close", listenKey=listen_key)
+
+    def get_user_data_stream_url(self, listen_key: str) -> str:
+        if self.use_testnet:
+            stream_url: str = BinanceSocketManager.STREAM_TESTNET_URL
+        else:
+            stream_url = BinanceSocketManager.STREAM_URL.format("com")
+        return stream_url + "ws/" + listen_key
 
     def cancel_all_orders_for_symbol(self, symbol: str):
         for order in self.get_orders(symbol):
             self.cancel_order(symbol, order.orderId)
 
-    def invest_at_current_price(self, symbol: str, quote_amount: Decimal) -> BinanceOrder:
+    def invest_at_current_price(self, symbol: str, quote_amount: Decimal) -> Optional[BinanceOrder]:
         price = self.get_avg_price(symbol)
-        amount = quote_amount / price
-        symbol_info = self.get_symbol_info(symbol)
-
-        # round amount to match step size
-        # get filter for LOT_SIZE
-        filters = symbol_info["filters"]
-        lot_filter = [f for f in filters if f["filterType"] == "LOT_SIZE"][0]
-        if lot_filter is None:
-            LOG_ERROR_AND_NOTIFY(self.debug_tag, f"No lot filter found for symbol {symbol}")
-        else:
-            lot_step_size = Decimal(lot_filter["stepSize"])
-            amount = round(amount / lot_step_size) * lot_step_size
-
-        price = round(round(price / 10) * 10)
+        symbol_rules = self.get_symbol_rules(symbol)
+        amount, price = calculate_investment_order(symbol_rules, quote_amount, price)
         LOG_INFO(f"Investing {amount} at price {price} for {symbol}")
         try:
-            quote_balance = self.get_asset_balance(symbol_info["quoteAsset"])
-            if OrderValidator.check_order_possible(symbol_info, quote_balance, symbol, amount, price):
+            quote_balance = self.get_asset_balance(symbol_rules.quote_asset)
+            if OrderValidator.check_order_possible(symbol_rules, quote_balance, symbol, amount, price):
                 return self.create_limit_buy_order(symbol, price, amount)
             else:
                 LOG_ERROR_AND_NOTIFY(self.debug_tag, "Investment not possible")
         except BinanceAPIException as e:
-            LOG_ERROR_AND_NOTIFY(self.debug_tag, "Failed to create investment order:", e)
-
-            message_body = (
-                "Failed to create investment order:\n"
-                + f"Symbol: {symbol}\n"
-                + f"Amount: {amount}\n"
-                + f"Price: {price}\n"
-                + f"Error: {e}\n"
-            )
-            LOG_DEBUG(self.debug_tag, "Sending push notification failed order:", message_body)
-
-            # TODO: Move this to a separate function (event handler)
-            if global_vars.firebaseMessager is not None:
-                LOG_DEBUG(
-                    self.debug_tag,
-                    "Sending push notification failed order:",
-                    message_body,
-                )
-                global_vars.firebaseMessager.push_notification(
-                    title="Failed to create investment order", body=message_body
-                )
+            notify_failed_investment_order(self.debug_tag, symbol, amount, price, e)
+
+        return None
+
 
+def exchange_info_filepath(use_testnet: bool, api_url: Optional[str] = None) -> Optional[str]:
+    """
+    Testnet and mainnet have different symbols, so they use separate cache files.
+    The exchange info of a custom api url (e.g. the exchange simulator) is not cached in a file.
+    """
+    if api_url is not None:
         return None
+    return Paths.exchange_info_testnet_filepath if use_testnet else Paths.exchange_info_filepath
+
+
+def client_class_for_api_url(client_class: Type[ClientT], api_url: Optional[str]) -> Type[ClientT]:
+    """
+    Returns a subclass of the python-binance client class that sends its requests to api_url.
+    The url has to be set on the class, the constructor of the client already sends a request.
+    """
+    if api_url is None:
+        return client_class
+    return type(client_class.__name__, (client_class,), {"API_URL": api_url, "API_TESTNET_URL": api_url})
+
+
+def is_invalid_symbol_error(error: BinanceAPIException) -> bool:
+    """
+    Binance rejects a request with an unknown or delisted symbol with http 400 (e.g. code -1121 "Invalid symbol.").
+    """
+    status_code: int = error.status_code
+    return status_code == 400
+
+
+def calculate_investment_order(
+    symbol_rules: SymbolRules, quote_amount: Decimal, price: Decimal
+) -> Tuple[Decimal, Decimal]:
+    """
+    Calculates the amount to buy for quote_amount at price.
+    Returns the amount rounded to the lot step size and the rounded price.
+    """
+    # round amount to match step size
+    amount = symbol_rules.round_quantity(quote_amount / price)
+
+    price = symbol_rules.round_price(Decimal(round(round(price / 10) * 10)))
+    return amount, price
+
+
+def notify_failed_investment_order(
+    debug_tag: str, symbol: str, amount: Decimal, price: Decimal, error: BinanceAPIException
+) -> None:
+    LOG_ERROR_AND_NOTIFY(debug_tag, "Failed to create investment order:", error)
+
+    message_body = (
+        "Failed to create investment order:\n"
+        + f"Symbol: {symbol}\n"
+        + f"Amount: {amount}\n"
+        + f"Price: {price}\n"
+        + f"Error: {error}\n"
+    )
+    LOG_DEBUG(debug_tag, "Sending push notification failed order:", message_body)
+
+    # TODO: Move this to a separate function (event handler)
+    if global_vars.firebaseMessager is not None:
+        LOG_DEBUG(
+            debug_tag,
+            "Sending push notification failed order:",
+            message_body,
+        )
+        global_vars.firebaseMessager.push_notification(title="Failed to create investment order", body=message_body)
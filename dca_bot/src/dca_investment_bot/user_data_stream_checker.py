@@ -0,0 +1,222 @@
+import asyncio
+import json
+import typing
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+import requests
+from binance.exceptions import BinanceAPIException
+from websockets.client import connect
+from websockets.exceptions import WebSocketException
+
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.exceptions import KillProcessException
+from dca_investment_bot.logger import log_and_raise_exeption
+from dca_investment_bot.logger import LOG_CRITICAL_AND_NOTIFY
+from dca_investment_bot.logger import LOG_DEBUG
+from dca_investment_bot.logger import LOG_ERROR_AND_NOTIFY
+from dca_investment_bot.logger import LOG_INFO
+from dca_investment_bot.logger import LOG_WARNING
+from dca_investment_bot.order_fulfilled_checker_thread import OrderFulfilledChecker
+from dca_investment_bot.order_list_manager import OrderListManager
+
+if typing.TYPE_CHECKING:
+    from dca_investment_bot.trading_bot import TradingBot
+
+"""
+Tracks the unfulfilled orders with the user data stream of binance instead of polling their status.
+Execution reports are applied as soon as they arrive.
+After (re)connecting, the status of the unfulfilled orders is requested once
+to catch fills that happened while the stream was disconnected.
+"""
+
+# binance closes listen keys that were not kept alive for 60 minutes
+LISTEN_KEY_KEEPALIVE_INTERVAL = 30 * 60
+MAX_RECONNECT_WAIT = 60
+
+
+def order_from_execution_report(event: Dict[str, Any]) -> BinanceOrder:
+    """
+    Converts an executionReport event into the order object returned by the REST api.
+    See https://binance-docs.github.io/apidocs/spot/en/#payload-order-update
+    """
+    return BinanceOrder(
+        {
+            "symbol": event.get("s"),
+            "orderId": event.get("i"),
+            "orderListId": event.get("g"),
+            "clientOrderId": event.get("c"),
+            "transactTime": event.get("T"),
+            "price": event.get("p"),
+            "origQty": event.get("q"),
+            "executedQty": event.get("z"),
+            "cummulativeQuoteQty": event.get("Z"),
+            "status": event.get("X"),
+            "timeInForce": event.get("f"),
+            "type": event.get("o"),
+            "side": event.get("S"),
+            "stopPrice": event.get("P"),
+            "icebergQty": event.get("F"),
+            "time": event.get("O"),
+            "updateTime": event.get("T"),
+            "isWorking": event.get("w"),
+            "origQuoteOrderQty": event.get("Q"),
+        }
+    )
+
+
+class UserDataStreamOrderChecker(OrderFulfilledChecker):
+    def __init__(
+        self,
+        order_manager: OrderListManager,
+        on_order_filled_callback,
+        get_order_status_callback,
+        bot: "TradingBot",
+    ) -> None:
+        super().__init__(order_manager, on_order_filled_callback, get_order_status_callback)
+        self._debug_tag = "[Thread - User Data Stream Order Checker]"
+        self._bot = bot
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._websocket: Optional[Any] = None
+        # seconds until the next reconnect, doubled on every failed connection
+        self._reconnect_wait = 1
+
+    def stop_and_join(self):
+        self.stop()
+        self.join()
+
+    def start(self) -> None:
+        # set before the thread runs, so a stop() right after start() is not undone
+        self._thread_running = True
+        super().start()
+
+    def stop(self):
+        self._thread_running = False
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self.__close)
+
+    def run(self) -> None:
+        try:
+            asyncio.run(self.__run_stream())
+        except (KillProcessException, KeyboardInterrupt) as e:
+            LOG_CRITICAL_AND_NOTIFY(self._debug_tag, e)
+            LOG_CRITICAL_AND_NOTIFY(
+                self._debug_tag,
+                "KillProcessException received, stopping thread forcefully",
+            )
+        except Exception as e:
+            LOG_ERROR_AND_NOTIFY(self._debug_tag, "Error while tracking unfullfilled orders:", e)
+            LOG_ERROR_AND_NOTIFY(self._debug_tag, "Order listener stopped")
+            log_and_raise_exeption(e, self._debug_tag)
+        LOG_DEBUG(self._debug_tag, "Order listener stopped")
+
+    async def __run_stream(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        if not self._thread_running:
+            return
+
+        while self._thread_running:
+            listen_key: Optional[str] = None
+            try:
+                listen_key = await self._loop.run_in_executor(None, self._bot.create_listen_key)
+                # stop() may have been called while the listen key was requested
+                if not self.__stopped():
+                    await self.__listen(listen_key)
+            except (
+                WebSocketException,
+                OSError,
+                asyncio.TimeoutError,
+                requests.exceptions.RequestException,
+                BinanceAPIException,
+            ) as e:
+                LOG_WARNING(self._debug_tag, f"User data stream disconnected: {e}")
+
+            # stop() is called from another thread while the stream is connected
+            stopped = self.__stopped()
+            if listen_key is not None and stopped:
+                await self.__close_listen_key(listen_key)
+
+            if not stopped:
+                LOG_INFO(self._debug_tag, f"Reconnecting to user data stream in {self._reconnect_wait}sec..")
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), self._reconnect_wait)
+                except asyncio.TimeoutError:
+                    pass
+                self._reconnect_wait = min(self._reconnect_wait * 2, MAX_RECONNECT_WAIT)
+
+    async def __listen(self, listen_key: str) -> None:
+        """
+        Handles the events of the stream until it is closed or the checker is stopped.
+        """
+        assert self._loop is not None and self._stop_event is not None
+        async with connect(self._bot.get_user_data_stream_url(listen_key)) as websocket:
+            self._websocket = websocket
+            LOG_INFO(self._debug_tag, "Connected to user data stream")
+            self._reconnect_wait = 1
+
+            # fills that happened while the stream was not connected are not sent again
+            await self._loop.run_in_executor(None, self.__reconcile_unfulfilled_orders)
+
+            keepalive_task = asyncio.ensure_future(self.__keep_listen_key_alive(listen_key))
+            # the stream can be quiet for a long time, every receive is raced against stop()
+            stop_task = asyncio.ensure_future(self._stop_event.wait())
+            try:
+                while True:
+                    receive_task = asyncio.ensure_future(websocket.recv())
+                    await asyncio.wait({receive_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+                    if not receive_task.done():
+                        receive_task.cancel()
+                        return
+                    self._handle_event(json.loads(receive_task.result()))
+            finally:
+                stop_task.cancel()
+                keepalive_task.cancel()
+                self._websocket = None
+
+    def __stopped(self) -> bool:
+        return not self._thread_running
+
+    def _handle_event(self, event: Dict[str, Any]) -> None:
+        event_type = event.get("e")
+        if event_type == "executionReport":
+            binance_order = order_from_execution_report(event)
+            for order in self._order_manager.open_orders_for_symbol(event["s"]):
+                if order.key() == binance_order.key():
+                    self._handle_order_status(order, binance_order)
+                    break
+        elif event_type == "outboundAccountPosition":
+            # balances changed, e.g. deposit, withdrawal or a trade
+            self._bot.invalidate_account_snapshot()
+
+    def __reconcile_unfulfilled_orders(self) -> None:
+        orders = list(self._order_manager.unfulfilled_orders())
+        if len(orders) > 0:
+            LOG_DEBUG(self._debug_tag, f"Checking status of {len(orders)} unfulfilled orders after reconnect")
+        for order in orders:
+            self._handle_order_status(order, self._get_order_status(order.symbol, order.orderId))
+
+    async def __keep_listen_key_alive(self, listen_key: str) -> None:
+        assert self._loop is not None
+        while True:
+            await asyncio.sleep(LISTEN_KEY_KEEPALIVE_INTERVAL)
+            try:
+                await self._loop.run_in_executor(None, self._bot.keepalive_listen_key, listen_key)
+            except (requests.exceptions.RequestException, BinanceAPIException) as e:
+                # the stream gets closed by binance if the key expires, which triggers a reconnect
+                LOG_WARNING(self._debug_tag, f"Keepalive of listen key failed: {e}")
+
+    async def __close_listen_key(self, listen_key: str) -> None:
+        assert self._loop is not None
+        try:
+            await self._loop.run_in_executor(None, self._bot.close_listen_key, listen_key)
+        except (requests.exceptions.RequestException, BinanceAPIException) as e:
+            LOG_WARNING(self._debug_tag, f"Could not close listen key: {e}")
+
+    def __close(self) -> None:
+        assert self._stop_event is not None
+        self._stop_event.set()
+        if self._websocket is not None:
+            asyncio.ensure_future(self._websocket.close())
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from dca_investment_bot.backtester import Klines
+from dca_investment_bot.dca_investment_parameter import DCAInvestmentParameter
+
+DAY = 24 * 60 * 60 * 1000
+
+
+@pytest.fixture
+def btcusdt_info():
+    return {
+        "symbol": "BTCUSDT",
+        "baseAsset": "BTC",
+        "quoteAsset": "USDT",
+        "filters": [
+            {
+                "filterType": "PRICE_FILTER",
+                "minPrice": "0.01000000",
+                "maxPrice": "1000000.00000000",
+                "tickSize": "0.01",
+            },
+            {"filterType": "LOT_SIZE", "minQty": "0.00001000", "maxQty": "9000.00000000", "stepSize": "0.00001000"},
+            {"filterType": "MIN_NOTIONAL", "minNotional": "10.00000000"},
+        ],
+    }
+
+
+@pytest.fixture
+def create_strategy():
+    def create(interval="1d", amount=100, symbol="BTCUSDT"):
+        return DCAInvestmentParameter(
+            {
+                "symbol": symbol,
+                "investment_amount_quoteasset": amount,
+                "interval": interval,
+                "investment_time": "12:00",
+                "start_date": "2021-11-01",
+            }
+        )
+
+    return create
+
+
+@pytest.fixture
+def create_daily_klines():
+    def create(strategy, days, start_offset_days=0):
+        # klines start at midnight of the start date, the price rises by 100 per day
+        open_time = int(strategy.start_date * 1000) + (np.arange(days, dtype=np.int64) + start_offset_days) * DAY
+        open_price = 20000.0 + 100 * np.arange(days)
+        return Klines(open_time, open_price, open_price + 50, open_price - 50, open_price + 100)
+
+    return create
@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+import pytest
+
+from dca_investment_bot.backtester import Backtester
+from dca_investment_bot.backtester import load_klines
+from dca_investment_bot.batch_order_validator import ValidationReason
+from dca_investment_bot.symbol_rules import SymbolRules
+
+DAY = 24 * 60 * 60 * 1000
+
+
+def test_daily_strategy_fills_every_day(btcusdt_info, create_strategy, create_daily_klines):
+    strategy = create_strategy()
+    result = Backtester(create_daily_klines(strategy, 30), SymbolRules(btcusdt_info)).run(strategy)
+
+    assert len(result.times) == 30
+    assert result.times[0] == int((strategy.start_date + strategy.investment_time) * 1000)
+    assert np.all(np.diff(result.times) == DAY)
+    assert np.all(result.reasons == ValidationReason.OK)
+    assert result.fill_count == 30
+    # amounts are rounded to the step size
+    assert result.amounts[0] == pytest.approx(0.005)
+    assert result.invested_quote == pytest.approx((result.amounts * result.fill_prices).sum())
+    assert result.final_price == 20000.0 + 100 * 29 + 100
+    assert result.summary()["pnl"] == pytest.approx(result.final_value - result.invested_quote)
+
+
+def test_weekly_strategy_starts_with_klines_and_respects_balance(btcusdt_info, create_strategy, create_daily_klines):
+    strategy = create_strategy(interval="1w", amount=100)
+    klines = create_daily_klines(strategy, 60, start_offset_days=3)
+    result = Backtester(klines, SymbolRules(btcusdt_info), quote_balance=250).run(strategy)
+
+    # without a previous order the first investment is at the start of the klines,
+    # the next one a week after midnight of that day at the investment time
+    assert result.times[0] == klines.open_time[0]
+    assert result.times[1] == klines.open_time[0] + 7 * DAY + 12 * 60 * 60 * 1000
+    assert result.fill_count == 2
+    assert np.count_nonzero(result.reasons == ValidationReason.NOT_ENOUGH_BALANCE) == len(result.times) - 2
+
+
+def test_no_order_is_placed_while_the_last_one_is_not_filled(btcusdt_info, create_strategy, create_daily_klines):
+    strategy = create_strategy()
+    klines = create_daily_klines(strategy, 10)
+    # the limit price of the first order (rounded to 10) is only reached on the fourth day
+    klines.open[0] = 20004.0
+    klines.low[:3] = 20001.0
+    klines.low[3] = 19990.0
+    result = Backtester(klines, SymbolRules(btcusdt_info)).run(strategy)
+
+    investment_start = int((strategy.start_date + strategy.investment_time) * 1000)
+    # the next order is placed right after the late fill, the following one at the investment time
+    assert result.times[:3].tolist() == [investment_start, klines.open_time[3], investment_start + 4 * DAY]
+    assert result.limit_prices[0] == 20000.0
+    assert np.all(result.filled)
+
+
+def test_orders_below_min_notional_are_not_filled(btcusdt_info, create_strategy, create_daily_klines):
+    strategy = create_strategy(amount=5)
+    result = Backtester(create_daily_klines(strategy, 5), SymbolRules(btcusdt_info)).run(strategy)
+    assert result.fill_count == 0
+    assert np.all(result.reasons == ValidationReason.NOTIONAL_OUT_OF_RANGE)
+
+
+def test_load_klines_from_csv(tmp_path):
+    filepath = os.path.join(tmp_path, "BTCUSDT-1d.csv")
+    with open(filepath, "w") as f:
+        f.write("open_time,open,high,low,close,volume\n")
+        f.write("1636070400000000,61000,62000,60000,61500,10\n")
+        f.write("1635984000000000,60000,61000,59000,61000,10\n")
+    klines = load_klines(filepath)
+    assert klines.open_time.tolist() == [1635984000000, 1636070400000]
+    assert klines.close.tolist() == [61000.0, 61500.0]
+    assert klines.kline_duration() == DAY
@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+from dca_investment_bot.batch_order_validator import BatchOrderValidator
+from dca_investment_bot.batch_order_validator import ValidationReason
+from dca_investment_bot.order_validator import OrderValidator
+from dca_investment_bot.symbol_rules import SymbolRules
+
+BTCUSDT_INFO = {
+    "symbol": "BTCUSDT",
+    "baseAsset": "BTC",
+    "quoteAsset": "USDT",
+    "filters": [
+        {"filterType": "PRICE_FILTER", "minPrice": "0.01000000", "maxPrice": "1000000.00000000", "tickSize": "0.01"},
+        {"filterType": "LOT_SIZE", "minQty": "0.00001000", "maxQty": "9000.00000000", "stepSize": "0.00001000"},
+        {"filterType": "MIN_NOTIONAL", "minNotional": "10.00000000"},
+    ],
+}
+ETHBTC_INFO = {
+    "symbol": "ETHBTC",
+    "baseAsset": "ETH",
+    "quoteAsset": "BTC",
+    "filters": [
+        {"filterType": "PRICE_FILTER", "minPrice": "0.00000100", "maxPrice": "100.00000000", "tickSize": "0.000001"},
+        {"filterType": "LOT_SIZE", "minQty": "0.00010000", "maxQty": "100000.00000000", "stepSize": "0.00010000"},
+    ],
+}
+
+
+def test_batch_validation_returns_first_failed_check():
+    symbol_rules = {"BTCUSDT": SymbolRules(BTCUSDT_INFO), "ETHBTC": SymbolRules(ETHBTC_INFO)}
+    quote_balances = {"USDT": Decimal("1000")}
+    orders = [
+        ("BTCUSDT", "0.001", "20000", ValidationReason.OK),
+        ("BTCUSDT", "0.001", "20000.001", ValidationReason.PRICE_TICK_SIZE),
+        ("BTCUSDT", "0.001", "2000000", ValidationReason.PRICE_OUT_OF_RANGE),
+        ("BTCUSDT", "0.000011", "20000", ValidationReason.AMOUNT_STEP_SIZE),
+        ("BTCUSDT", "0.000001", "20000", ValidationReason.AMOUNT_OUT_OF_RANGE),
+        ("BTCUSDT", "0.0001", "20000", ValidationReason.NOTIONAL_OUT_OF_RANGE),
+        ("BTCUSDT", "2000", "20000", ValidationReason.NOT_ENOUGH_BALANCE),
+        ("ETHBTC", "0.1", "0.07", ValidationReason.NO_BALANCE),
+        ("XRPUSDT", "10", "0.5", ValidationReason.UNKNOWN_SYMBOL),
+    ]
+
+    reasons = BatchOrderValidator.validate(
+        [o[0] for o in orders],
+        [float(o[1]) for o in orders],
+        [float(o[2]) for o in orders],
+        symbol_rules,
+        quote_balances,
+    )
+    assert [ValidationReason(r) for r in reasons] == [o[3] for o in orders]
+
+    # batch and single validation agree
+    for (symbol, amount, price, _), reason in zip(orders, reasons):
+        if symbol not in symbol_rules:
+            continue
+        rules = symbol_rules[symbol]
+        single_result = OrderValidator.check_order_possible(
+            rules, quote_balances.get(rules.quote_asset), symbol, Decimal(amount), Decimal(price)
+        )
+        assert single_result == (reason == ValidationReason.OK)
+
+
+def test_batch_validation_without_notional_filter():
+    symbol_rules = {"ETHBTC": SymbolRules(ETHBTC_INFO)}
+    reasons = BatchOrderValidator.validate(["ETHBTC"], [0.1], [0.07], symbol_rules, {"BTC": 1.0})
+    assert reasons.tolist() == [ValidationReason.NO_NOTIONAL_FILTER]
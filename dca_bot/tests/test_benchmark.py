@@ -0,0 +1,44 @@
+import logging
+
+import dca_investment_bot.logger as logger
+from dca_investment_bot.benchmark import compare_results
+from dca_investment_bot.benchmark import read_results
+from dca_investment_bot.benchmark import run_benchmarks
+from dca_investment_bot.benchmark import write_results
+
+
+def test_benchmarks_write_results_that_can_be_compared(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(logger, "logger_initialized", True)
+    test_logger = logging.getLogger("test_benchmark")
+    test_logger.setLevel(logging.WARNING)
+    monkeypatch.setattr(logger, "logger", test_logger)
+
+    results = run_benchmarks(strategy_counts=[3], order_counts=[50], repeat=2)
+    assert set(results["benchmarks"].keys()) == {
+        "main_loop_cycle[3]",
+        "order_checker_status_iteration[3]",
+        "order_checker_poll_iteration[3]",
+        "check_order_possible",
+        "binance_order_construction",
+        "binance_order_formatting",
+        "order_list_manager_load[50]",
+        "order_list_manager_store[50]",
+    }
+    for result in results["benchmarks"].values():
+        assert result["repeat"] == 2
+        assert 0 < result["min"] <= result["median"] <= result["max"]
+
+    filepath = str(tmp_path / "benchmark.json")
+    write_results(results, filepath)
+    assert read_results(filepath) == results
+    assert compare_results(results, results) == []
+
+
+def test_compare_results_reports_slower_benchmarks():
+    def results(**timings):
+        return {"benchmarks": {name: {"min": timing} for name, timing in timings.items()}}
+
+    baseline = results(fast=1.0, slow=1.0, removed=1.0)
+    current = results(fast=1.1, slow=1.5, added=9.0)
+    assert compare_results(baseline, current, tolerance=0.2) == ["slow: 1.000000s -> 1.500000s (+50%)"]
@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+import pytest
+
+from dca_investment_bot.binance_order import BinanceOrder
+
+
+def test_numeric_fields_are_decoded_lazily():
+    order = BinanceOrder({"symbol": "BTCUSDT", "orderId": 1, "price": "20000.50", "origQty": "0.001"})
+    assert order.price == "20000.50"
+    assert order.price_decimal == Decimal("20000.50")
+    assert order.price_decimal is order.price_decimal
+    assert order.orig_qty_decimal == Decimal("0.001")
+    assert order.executed_qty_decimal is None
+    assert "Price: 20000.50" in order.to_info_string()
+
+
+def test_identity_is_based_on_order_id():
+    order = BinanceOrder({"symbol": "BTCUSDT", "orderId": 1, "status": "NEW"})
+    filled_order = BinanceOrder({"symbol": "BTCUSDT", "orderId": 1, "status": "FILLED", "executedQty": "1"})
+    assert order == filled_order
+    assert hash(order) == hash(filled_order)
+    assert order != BinanceOrder({"symbol": "ETHUSDT", "orderId": 1, "status": "NEW"})
+    assert len({order, filled_order}) == 1
+
+
+def test_orders_have_no_instance_dict():
+    order = BinanceOrder({"symbol": "BTCUSDT", "orderId": 1})
+    with pytest.raises(AttributeError):
+        order.unknown_field = 1
+    assert BinanceOrder(order.asDict()).asDict() == order.asDict()
@@ -0,0 +1,81 @@
+import asyncio
+import os
+import threading
+
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.clock import Clock
+from dca_investment_bot.clock import VirtualClock
+from dca_investment_bot.order_fulfilled_checker_thread import OrderFulfilledChecker
+from dca_investment_bot.order_fulfilled_checker_thread import STATUS_POLL_INTERVAL
+from dca_investment_bot.order_list_manager import OrderListManager
+
+
+def test_virtual_clock_moves_to_the_earliest_wait_of_all_threads():
+    clock = VirtualClock(1000)
+    wake_up_times = []
+    all_attached = threading.Barrier(4)
+
+    def sleeper(seconds):
+        clock.attach()
+        all_attached.wait()
+        clock.sleep(seconds)
+        wake_up_times.append((seconds, clock.time()))
+
+    threads = [threading.Thread(target=sleeper, args=(seconds,)) for seconds in (3600, 60, 7 * 24 * 3600)]
+    for thread in threads:
+        thread.start()
+    all_attached.wait()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert sorted(wake_up_times) == [(60, 1060), (3600, 4600), (7 * 24 * 3600, 1000 + 7 * 24 * 3600)]
+
+
+def test_virtual_clock_waits_for_busy_threads_and_events():
+    clock = VirtualClock(0)
+    clock.attach()
+    event = threading.Event()
+    results = []
+
+    def waiter():
+        results.append(clock.wait(event, 100))
+        results.append(clock.time())
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    # the time stands still while the attached main thread is busy
+    thread.join(timeout=0.2)
+    assert thread.is_alive()
+    assert clock.time() == 0
+
+    event.set()
+    thread.join(timeout=10)
+    assert results == [True, 0]
+    assert not clock.wait(threading.Event(), 30)
+    assert clock.time() == 30
+
+
+def test_async_order_checker_waits_on_its_clock(tmp_path):
+    class RecordingClock(Clock):
+        def __init__(self) -> None:
+            super().__init__()
+            self.sleeps = []
+
+        async def sleep_async(self, seconds: float) -> None:
+            self.sleeps.append(seconds)
+
+    order_manager = OrderListManager(os.path.join(tmp_path, "orders.json"))
+    order = BinanceOrder({"symbol": "BTCUSDT", "orderId": 1, "status": "NEW", "time": 0})
+    order_manager.add_new_order(order)
+    clock = RecordingClock()
+    checker = None
+
+    async def get_order_status(symbol, order_id):
+        if len(clock.sleeps) == 2:
+            checker.stop()
+        return order
+
+    checker = OrderFulfilledChecker(order_manager, None, get_order_status, clock=clock)
+    asyncio.run(checker.run_async())
+    # no real time passed
+    assert clock.sleeps == [STATUS_POLL_INTERVAL, STATUS_POLL_INTERVAL]
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from dca_investment_bot.clock import VirtualClock
+from dca_investment_bot.exceptions import UnknownSymbolException
+from dca_investment_bot.exchange_info_cache import ExchangeInfoCache
+
+
+def create_exchange_info(btc_step_size="0.00001000"):
+    return {
+        "symbols": [
+            {
+                "symbol": "BTCUSDT",
+                "baseAsset": "BTC",
+                "quoteAsset": "USDT",
+                "filters": [{"filterType": "LOT_SIZE", "stepSize": btc_step_size}],
+            },
+            {
+                "symbol": "ETHUSDT",
+                "baseAsset": "ETH",
+                "quoteAsset": "USDT",
+                "filters": [{"filterType": "LOT_SIZE", "stepSize": "0.00010000"}],
+            },
+        ]
+    }
+
+
+def test_warm_restart_does_not_fetch_exchange_info(tmp_path):
+    filepath = os.path.join(tmp_path, "exchange_info.json")
+    fetch_calls = []
+
+    def fetch():
+        fetch_calls.append(1)
+        return create_exchange_info()
+
+    cache = ExchangeInfoCache(fetch, filepath, ttl_seconds=60)
+    cache.load()
+    assert cache.get_symbol_info("BTCUSDT")["baseAsset"] == "BTC"
+    assert cache.get_symbol_info("ETHUSDT")["baseAsset"] == "ETH"
+    assert len(fetch_calls) == 1
+
+    restarted_cache = ExchangeInfoCache(fetch, filepath, ttl_seconds=60)
+    restarted_cache.load()
+    assert restarted_cache.get_symbol_info("BTCUSDT")["quoteAsset"] == "USDT"
+    assert len(fetch_calls) == 1
+
+    outdated_cache = ExchangeInfoCache(fetch, filepath, ttl_seconds=-1)
+    outdated_cache.load()
+    assert len(fetch_calls) == 2
+
+
+def test_changed_filters_notify_listeners():
+    cache = ExchangeInfoCache()
+    changed = []
+    cache.add_invalidation_listener(changed.append)
+
+    cache.update(create_exchange_info())
+    assert changed == []
+
+    cache.update(create_exchange_info(btc_step_size="0.00000100"))
+    assert changed == [["BTCUSDT"]]
+    assert cache.get_cached_symbol_info("BTCUSDT")["filters"][0]["stepSize"] == "0.00000100"
+
+
+def test_unknown_symbols_refresh_at_most_once_per_interval():
+    clock = VirtualClock(start_time=1_000_000)
+    fetch_calls = []
+
+    def fetch():
+        fetch_calls.append(clock.time())
+        return create_exchange_info()
+
+    cache = ExchangeInfoCache(fetch, ttl_seconds=3600, clock=clock, miss_refresh_interval=60)
+    cache.load()
+    # the cache was just fetched, an unknown symbol does not fetch it again
+    for _ in range(3):
+        with pytest.raises(UnknownSymbolException) as e:
+            cache.get_symbol_info("BTCUSDX")
+        assert e.value.symbol == "BTCUSDX"
+    assert len(fetch_calls) == 1
+
+    clock.advance(60)
+    with pytest.raises(UnknownSymbolException):
+        cache.get_symbol_info("BTCUSDX")
+    assert len(fetch_calls) == 2
+    assert cache.get_symbol_info("ETHUSDT")["baseAsset"] == "ETH"
+    assert len(fetch_calls) == 2
+
+    # the ttl uses the injected clock as well
+    clock.advance(3601)
+    assert cache.is_outdated()
@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+import pytest
+from binance.exceptions import BinanceAPIException
+
+from dca_investment_bot.exchange_simulator import ExchangeSimulator
+from dca_investment_bot.exchange_simulator import MatchingEngine
+from dca_investment_bot.exchange_simulator import SimulatedSymbol
+from dca_investment_bot.exchange_simulator import WEIGHT_HEADER_1M
+from dca_investment_bot.trading_bot import TradingBot
+
+
+def create_engine():
+    return MatchingEngine(
+        [SimulatedSymbol("BTCUSDT", "BTC", "USDT", "20003.00"), SimulatedSymbol("ETHUSDT", "ETH", "USDT", "1500.00")],
+        {"USDT": "1000"},
+    )
+
+
+def test_matching_engine_fills_limit_orders_when_price_is_reached():
+    engine = create_engine()
+    order = engine.create_order(
+        {"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "quantity": "0.01000", "price": "19000.00"}
+    )
+    assert order["status"] == "NEW"
+    assert engine.balance("USDT") == (Decimal("810"), Decimal("190"))
+    assert [o["orderId"] for o in engine.open_orders("BTCUSDT")] == [order["orderId"]]
+
+    assert engine.set_price("BTCUSDT", "19500") == []
+    filled_orders = engine.set_price("BTCUSDT", "18900")
+    assert [o["orderId"] for o in filled_orders] == [order["orderId"]]
+    assert engine.get_order("BTCUSDT", order["orderId"])["executedQty"] == "0.01000000"
+    assert engine.balance("USDT") == (Decimal("810"), Decimal("0"))
+    assert engine.balance("BTC") == (Decimal("0.01000"), Decimal("0"))
+    assert engine.open_orders() == []
+
+
+def test_trading_bot_against_simulator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BINANCE_KEY", "key")
+    monkeypatch.setenv("BINANCE_SECRET", "secret")
+    engine = create_engine()
+    with ExchangeSimulator(engine) as simulator:
+        bot = TradingBot(api_url=simulator.url)
+        bot.connect()
+        try:
+            assert bot.get_symbol_rules("BTCUSDT").tick_size == Decimal("0.01")
+            assert bot.get_avg_price("BTCUSDT") == Decimal("20003.00")
+            assert bot.get_asset_balance("USDT") == Decimal("1000")
+
+            # the price is rounded down to 20000, below the market price
+            order = bot.invest_at_current_price("BTCUSDT", Decimal("100"))
+            assert order.status == "NEW"
+            assert [o.orderId for o in bot.get_orders("BTCUSDT")] == [order.orderId]
+            assert int(bot.client.response.headers[WEIGHT_HEADER_1M]) == simulator.used_weight()
+
+            engine.set_price("BTCUSDT", "19999")
+            assert bot.get_order_status("BTCUSDT", order.orderId).status == "FILLED"
+
+            second_order = bot.create_limit_buy_order("ETHUSDT", "1400.00", "0.10000")
+            bot.cancel_order("ETHUSDT", second_order.orderId)
+            assert bot.get_order_status("ETHUSDT", second_order.orderId).status == "CANCELED"
+            with pytest.raises(BinanceAPIException) as e:
+                bot.cancel_order("ETHUSDT", second_order.orderId)
+            assert e.value.code == -2011
+            assert simulator.request_counts()[("POST", "order")] == 2
+        finally:
+            bot.close_all()
+
+
+def test_simulator_rejects_requests_over_the_weight_limit():
+    with ExchangeSimulator(create_engine(), weight_limit=2) as simulator:
+        assert simulator.handle("GET", "/api/v3/ping", {})[0] == 200
+        assert simulator.handle("GET", "/api/v3/ping", {})[0] == 200
+        status, response, used_weight = simulator.handle("GET", "/api/v3/ping", {})
+        assert status == 429
+        assert response["code"] == -1003
+        assert used_weight == 3
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+
+import pytest
+import requests
+from binance.exceptions import BinanceAPIException
+from requests.adapters import HTTPAdapter
+
+import dca_investment_bot.logger as logger
+from dca_investment_bot.exchange_simulator import ExchangeSimulator
+from dca_investment_bot.exchange_simulator import MatchingEngine
+from dca_investment_bot.exchange_simulator import SimulatedSymbol
+from dca_investment_bot.http_transport import DEFAULT_TIMEOUT
+from dca_investment_bot.http_transport import endpoint_timeout
+from dca_investment_bot.http_transport import EndpointTimeoutAdapter
+from dca_investment_bot.http_transport import ENDPOINT_TIMEOUTS
+from dca_investment_bot.http_transport import HttpTransport
+from dca_investment_bot.trading_bot import TradingBot
+
+
+@pytest.fixture(autouse=True)
+def quiet_logger(monkeypatch):
+    monkeypatch.setattr(logger, "logger_initialized", True)
+    test_logger = logging.getLogger("test_http_transport")
+    test_logger.setLevel(logging.ERROR)
+    monkeypatch.setattr(logger, "logger", test_logger)
+
+
+def failing_request(errors, result="ok"):
+    calls = []
+
+    def request():
+        calls.append(len(calls))
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return request, calls
+
+
+def api_exception(status_code):
+    return BinanceAPIException(None, status_code, '{"code": -1000, "msg": "error"}')
+
+
+def test_idempotent_requests_are_retried_after_transient_errors():
+    delays = []
+    transport = HttpTransport(retries=3, backoff_base=0.01, sleep=delays.append)
+    request, calls = failing_request(
+        [requests.exceptions.ConnectionError(), requests.exceptions.ReadTimeout(), api_exception(502)]
+    )
+    assert transport.call("order_get", request) == "ok"
+    assert len(calls) == 4
+    # full jitter below the exponential bound
+    assert [0 <= delay <= 0.01 * 2**attempt for attempt, delay in enumerate(delays)] == [True, True, True]
+
+    request, calls = failing_request([requests.exceptions.ConnectionError()] * 4)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.call("openOrders", request)
+    assert len(calls) == 4
+
+
+def test_orders_and_client_errors_are_not_retried():
+    transport = HttpTransport(sleep=lambda _: None)
+    request, calls = failing_request([requests.exceptions.ReadTimeout()])
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        transport.call("order_post", request)
+    assert len(calls) == 1
+
+    request, calls = failing_request([api_exception(400)])
+    with pytest.raises(BinanceAPIException):
+        transport.call("order_get", request)
+    assert len(calls) == 1
+
+
+def test_async_requests_are_retried():
+    transport = HttpTransport(backoff_base=0.001)
+    calls = []
+
+    async def request():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise asyncio.TimeoutError()
+        return "ok"
+
+    assert asyncio.run(transport.call_async("account", request)) == "ok"
+    assert len(calls) == 2
+
+
+def test_endpoint_timeouts():
+    assert endpoint_timeout("https://api.binance.com/api/v3/exchangeInfo") == ENDPOINT_TIMEOUTS["exchangeInfo"]
+    assert endpoint_timeout("http://127.0.0.1:8080/api/v3/order?symbol=BTCUSDT") == ENDPOINT_TIMEOUTS["order"]
+    assert endpoint_timeout("https://api.binance.com/api/v3/ticker/price") == DEFAULT_TIMEOUT
+
+
+def test_endpoint_timeout_adapter_replaces_the_timeout_of_the_client(monkeypatch):
+    sent = []
+    monkeypatch.setattr(HTTPAdapter, "send", lambda self, request, **kwargs: sent.append(kwargs))
+    request = requests.Request("GET", "https://api.binance.com/api/v3/exchangeInfo").prepare()
+    EndpointTimeoutAdapter().send(request, stream=True, timeout=10, verify=False)
+    assert sent == [
+        {"stream": True, "timeout": ENDPOINT_TIMEOUTS["exchangeInfo"], "verify": False, "cert": None, "proxies": None}
+    ]
+
+
+def test_trading_bot_recovers_from_a_network_blip_within_milliseconds(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BINANCE_KEY", "key")
+    monkeypatch.setenv("BINANCE_SECRET", "secret")
+    engine = MatchingEngine([SimulatedSymbol("BTCUSDT", "BTC", "USDT", "20000.00")], {"USDT": "1000"})
+    with ExchangeSimulator(engine) as simulator:
+        bot = TradingBot(api_url=simulator.url)
+        bot.connect()
+        try:
+            adapter = bot.client.session.get_adapter(simulator.url)
+            assert isinstance(adapter, EndpointTimeoutAdapter)
+            assert adapter._pool_maxsize == bot.transport._pool_size
+
+            # the first request after the blip fails
+            send = adapter.send
+            failed = []
+
+            def send_after_blip(request, **kwargs):
+                if len(failed) == 0:
+                    failed.append(request.url)
+                    raise requests.exceptions.ConnectionError("connection reset")
+                return send(request, **kwargs)
+
+            monkeypatch.setattr(adapter, "send", send_after_blip)
+            started_at = time.monotonic()
+            assert bot.get_orders("BTCUSDT") == []
+            assert time.monotonic() - started_at < 1
+            assert len(failed) == 1
+        finally:
+            bot.close_all()
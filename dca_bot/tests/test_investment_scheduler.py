@@ -0,0 +1,50 @@
+from dca_investment_bot.dca_investment_parameter import DCAInvestmentParameter
+from dca_investment_bot.investment_scheduler import InvestmentScheduler
+
+
+def create_strategy(symbol):
+    return DCAInvestmentParameter(
+        {
+            "symbol": symbol,
+            "investment_amount_quoteasset": 12,
+            "interval": "1w",
+            "investment_time": "12:00",
+            "start_date": "2021-11-01",
+        }
+    )
+
+
+def test_pop_due_strategies_returns_due_strategies_in_order():
+    scheduler = InvestmentScheduler()
+    btc = create_strategy("BTCUSDT")
+    eth = create_strategy("ETHUSDT")
+    bnb = create_strategy("BNBUSDT")
+    scheduler.schedule(btc, 200)
+    scheduler.schedule(eth, 100)
+    scheduler.schedule(bnb, 300)
+
+    assert scheduler.next_due_timestamp() == 100
+    assert scheduler.pop_due_strategies(250) == [eth, btc]
+    assert scheduler.next_due_timestamp() == 300
+    assert scheduler.pop_due_strategies(250) == []
+
+
+def test_reschedule_replaces_previous_due_time():
+    scheduler = InvestmentScheduler()
+    btc = create_strategy("BTCUSDT")
+    scheduler.schedule(btc, 100)
+    scheduler.schedule(btc, 500)
+
+    assert scheduler.next_due_timestamp() == 500
+    assert scheduler.pop_due_strategies(400) == []
+    assert scheduler.pop_due_strategies(500) == [btc]
+    assert scheduler.next_due_timestamp() is None
+
+
+def test_notify_interrupts_wait():
+    scheduler = InvestmentScheduler()
+    scheduler.schedule(create_strategy("BTCUSDT"), 10_000)
+    scheduler.notify()
+
+    assert scheduler.wait_until_next_due(0, max_wait=5) is True
+    assert scheduler.wait_until_next_due(9_999.99, max_wait=5) is False
@@ -0,0 +1,35 @@
+import logging
+
+import dca_investment_bot.logger as logger
+from dca_investment_bot.load_test import percentile
+from dca_investment_bot.load_test import run_load_tests
+
+
+def test_load_test_measures_one_cycle_per_day(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(logger, "logger_initialized", True)
+    test_logger = logging.getLogger("test_load_test")
+    test_logger.setLevel(logging.WARNING)
+    monkeypatch.setattr(logger, "logger", test_logger)
+
+    results = run_load_tests(strategy_counts=[5, 2], history_days=3, days=2, directory=str(tmp_path / "load_test"))
+
+    assert [run["strategies"] for run in results["runs"]] == [2, 5]
+    for run in results["runs"]:
+        assert run["history_orders"] == 3 * run["strategies"]
+        # every strategy invests once per day, the order fills when it is created
+        assert run["filled_orders"] == 2 * run["strategies"]
+        assert run["cycles"] == 2
+        assert run["max_strategies_per_cycle"] == run["strategies"]
+        assert 0 < run["cycle_latency"]["p50"] <= run["cycle_latency"]["max"]
+        assert run["requests_per_cycle"]["max"] >= run["strategies"]
+        assert run["max_weight_per_cycle"] > run["requests_per_cycle"]["max"]
+    assert results["capacity"] == {"max_strategies_by_latency": 5, "max_strategies_by_latency_and_weight_limit": 5}
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 90) == 3.0
+    assert percentile([], 50) is None
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.order_history_export import export_order_history
+from dca_investment_bot.order_history_export import load_order_history
+
+
+def create_order(order_id, symbol, side, time, price, quantity):
+    return BinanceOrder(
+        {
+            "symbol": symbol,
+            "orderId": order_id,
+            "side": side,
+            "status": "FILLED",
+            "time": time,
+            "price": price,
+            "origQty": quantity,
+            "executedQty": quantity,
+            "cummulativeQuoteQty": str(float(price) * float(quantity)),
+        }
+    )
+
+
+def test_export_and_memory_mapped_load(tmp_path):
+    directory = os.path.join(tmp_path, "history")
+    orders = [
+        create_order(3, "ETHUSDT", "BUY", 3000, "2000.00", "0.01000000"),
+        create_order(1, "BTCUSDT", "BUY", 1000, "20000.00", "0.00100000"),
+        create_order(2, "BTCUSDT", "SELL", 2000, "30000.00", "0.00050000"),
+    ]
+    export_order_history(orders, directory)
+
+    history = load_order_history(directory)
+    assert isinstance(history.time, np.memmap)
+    assert len(history) == 3
+    assert history.symbols == ["BTCUSDT", "ETHUSDT"]
+    assert history.order_id.tolist() == [1, 2, 3]
+    assert history.time.dtype == np.int64
+    assert history.price.tolist() == [2000000000000, 3000000000000, 200000000000]
+    assert history.executed_qty.tolist() == [100000, 50000, 1000000]
+
+    btc_buys = history.symbol_mask("BTCUSDT") & history.side_mask("BUY")
+    assert history.to_float("quote_qty")[btc_buys].tolist() == [20.0]
+    assert not history.symbol_mask("BNBUSDT").any()
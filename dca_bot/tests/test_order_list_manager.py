@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.order_list_manager import OrderListManager
+
+
+def create_order(order_id, symbol="BTCUSDT", side="BUY", time=0, status="NEW"):
+    return BinanceOrder(
+        {
+            "symbol": symbol,
+            "orderId": order_id,
+            "side": side,
+            "time": time,
+            "updateTime": time,
+            "price": "100.00000000",
+            "origQty": "0.10000000",
+            "status": status,
+        }
+    )
+
+
+def test_get_last_order_for_symbol_uses_side_and_symbol(tmp_path):
+    manager = OrderListManager(os.path.join(tmp_path, "orders.json"))
+    first = create_order(1, time=1000)
+    second = create_order(2, symbol="ETHUSDT", time=2000)
+    third = create_order(3, side="SELL", time=3000)
+    for order in [first, second, third]:
+        manager.add_new_order(order)
+        manager.mark_order_filled(order, order)
+
+    assert manager.get_last_order_for_symbol("BTCUSDT") is first
+    assert manager.get_last_order_for_symbol("BTCUSDT", "SELL") is third
+    assert manager.get_last_order_for_symbol("BNBUSDT") is None
+    assert manager.get_last_fill_time("BTCUSDT") == 3000
+
+
+def test_mark_order_filled_updates_open_orders(tmp_path):
+    manager = OrderListManager(os.path.join(tmp_path, "orders.json"))
+    order = create_order(1)
+    manager.add_new_order(order)
+    assert manager.open_orders_for_symbol("BTCUSDT", "BUY") == [order]
+
+    filled_order = create_order(1, status="FILLED", time=5000)
+    manager.mark_order_filled(order, filled_order)
+
+    assert manager.open_orders_for_symbol("BTCUSDT") == []
+    assert manager.unfulfilled_orders() == []
+    assert manager.fulfilled_orders() == [filled_order]
+
+
+def test_orders_in_time_range_after_reload(tmp_path):
+    manager = OrderListManager(os.path.join(tmp_path, "orders.json"))
+    for order_id, time in [(1, 3000), (2, 1000), (3, 2000)]:
+        order = create_order(order_id, time=time)
+        manager.add_new_order(order)
+        manager.mark_order_filled(order, order)
+    manager.store_orders_to_file()
+
+    reloaded_manager = OrderListManager(os.path.join(tmp_path, "orders.json"))
+    reloaded_manager.load_fulfilled_from_file()
+
+    assert [o.orderId for o in reloaded_manager.orders_in_time_range(1000, 3000)] == [2, 3]
+    assert [o.orderId for o in reloaded_manager.orders_in_time_range(0, 10000, "ETHUSDT")] == []
+
+
+def test_concurrent_fills_are_applied_once_and_wake_up_waiters(tmp_path):
+    manager = OrderListManager(os.path.join(tmp_path, "orders.json"))
+    orders = [create_order(order_id, time=order_id) for order_id in range(100)]
+    for order in orders:
+        manager.add_new_order(order)
+
+    snapshot = manager.unfulfilled_orders()
+    filled = []
+
+    def fill_all():
+        for order in orders:
+            if manager.mark_order_filled(order, order):
+                filled.append(order.orderId)
+
+    threads = [threading.Thread(target=fill_all) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    assert manager.wait_for_order_filled("BTCUSDT", 99, timeout=5) is orders[99]
+    for thread in threads:
+        thread.join()
+
+    # every order is filled exactly once and earlier snapshots are not modified
+    assert sorted(filled) == list(range(100))
+    assert len(snapshot) == 100
+    assert manager.unfulfilled_orders() == []
+    assert len(manager.fulfilled_orders()) == 100
+    assert manager.wait_for_order_filled("BTCUSDT", 1000, timeout=0.01) is None
+
+
+def test_orders_of_different_symbols_with_the_same_order_id(tmp_path):
+    manager = OrderListManager(os.path.join(tmp_path, "orders.json"))
+    btc_order = create_order(5, time=1000)
+    eth_order = create_order(5, symbol="ETHUSDT", time=2000)
+    for order in [btc_order, eth_order]:
+        manager.add_new_order(order)
+
+    manager.mark_order_filled(eth_order, eth_order)
+    # the fill of ETHUSDT#5 does not wake up a waiter of BTCUSDT#5
+    assert manager.wait_for_order_filled("BTCUSDT", 5, timeout=0.01) is None
+    assert manager.wait_for_order_filled("ETHUSDT", 5, timeout=0) is eth_order
+
+    manager.mark_order_filled(btc_order, btc_order)
+    assert manager.wait_for_order_filled("BTCUSDT", 5, timeout=0) is btc_order
+    assert manager.wait_for_order_filled("ETHUSDT", 5, timeout=0) is eth_order
+
+
+def test_journal_replays_fills_and_compacts(tmp_path):
+    order_filepath = os.path.join(tmp_path, "orders.json")
+    journal_filepath = os.path.join(tmp_path, "orders_journal.jsonl")
+    manager = OrderListManager(order_filepath, journal_filepath=journal_filepath, compact_after=3)
+    for order_id in range(2):
+        order = create_order(order_id, time=order_id)
+        manager.add_new_order(order)
+        manager.mark_order_filled(order, order)
+        manager.store_orders_to_file()
+    manager.close()
+
+    # fills are only in the journal, the order file is not written yet
+    assert not os.path.exists(order_filepath)
+    reloaded_manager = OrderListManager(order_filepath, journal_filepath=journal_filepath, compact_after=3)
+    reloaded_manager.load_fulfilled_from_file()
+    assert [o.orderId for o in reloaded_manager.fulfilled_orders()] == [0, 1]
+
+    # the third fill reaches compact_after and moves the journal into the order file
+    order = create_order(2, time=2)
+    reloaded_manager.add_new_order(order)
+    reloaded_manager.mark_order_filled(order, order)
+    reloaded_manager.store_orders_to_file()
+    reloaded_manager.close()
+    assert os.path.getsize(journal_filepath) == 0
+
+    # a crash during compaction leaves fills in both files, they are loaded once
+    with open(journal_filepath, "a") as f:
+        f.write('{"type":"ORDER_FILLED","data":' + json.dumps(order.asDict()) + "}\n")
+        f.write('{"type":"ORDER_FI')
+    compacted_manager = OrderListManager(order_filepath, journal_filepath=journal_filepath)
+    compacted_manager.load_fulfilled_from_file()
+    assert [o.orderId for o in compacted_manager.fulfilled_orders()] == [0, 1, 2]
+    compacted_manager.close()
+
+
+def test_journal_replay_keeps_orders_of_different_symbols_with_the_same_order_id(tmp_path):
+    order_filepath = os.path.join(tmp_path, "orders.json")
+    journal_filepath = os.path.join(tmp_path, "orders_journal.jsonl")
+    manager = OrderListManager(order_filepath, journal_filepath=journal_filepath, compact_after=1)
+    btc_order = create_order(5, time=1000)
+    manager.add_new_order(btc_order)
+    manager.mark_order_filled(btc_order, btc_order)
+    manager.store_orders_to_file()
+    manager.close()
+
+    # BTCUSDT#5 is compacted into the order file, ETHUSDT#5 is only in the journal
+    eth_order = create_order(5, symbol="ETHUSDT", time=2000)
+    with open(journal_filepath, "a") as f:
+        f.write('{"type":"ORDER_FILLED","data":' + json.dumps(eth_order.asDict()) + "}\n")
+    reloaded_manager = OrderListManager(order_filepath, journal_filepath=journal_filepath)
+    reloaded_manager.load_fulfilled_from_file()
+    assert [(o.symbol, o.orderId) for o in reloaded_manager.fulfilled_orders()] == [("BTCUSDT", 5), ("ETHUSDT", 5)]
+    reloaded_manager.close()
@@ -0,0 +1,23 @@
+from dca_investment_bot.order_poll_schedule import OrderPollSchedule
+
+
+def test_old_orders_are_polled_less_often():
+    schedule = OrderPollSchedule(min_interval=5, max_interval=120, age_factor=0.1)
+    schedule.sync({"BTCUSDT": 0, "ETHUSDT": 3600}, now_timestamp=1000)
+
+    assert schedule.next_poll_timestamp() == 1005
+    assert schedule.pop_due_symbols(1005) == ["BTCUSDT"]
+    assert schedule.pop_due_symbols(1119) == []
+    assert schedule.pop_due_symbols(1120) == ["ETHUSDT"]
+
+
+def test_new_order_pulls_symbol_forward_and_removed_symbols_are_dropped():
+    schedule = OrderPollSchedule(min_interval=5, max_interval=120, age_factor=0.1)
+    schedule.sync({"BTCUSDT": 3600, "ETHUSDT": 3600}, now_timestamp=1000)
+    assert schedule.next_poll_timestamp() == 1120
+
+    # a new BTCUSDT order was placed, ETHUSDT has no orders anymore
+    schedule.sync({"BTCUSDT": 1}, now_timestamp=1010)
+    assert schedule.next_poll_timestamp() == 1015
+    assert schedule.pop_due_symbols(2000) == ["BTCUSDT"]
+    assert schedule.next_poll_timestamp() is None
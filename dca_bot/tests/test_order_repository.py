@@ -0,0 +1,134 @@
+import json
+import os
+import sqlite3
+from decimal import Decimal
+
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.order_list_manager import OrderListManager
+from dca_investment_bot.order_repository import SQLiteOrderRepository
+
+# 2021-11-11 and 2021-12-11 (UTC)
+NOVEMBER = 1636591592916
+DECEMBER = 1639183592916
+
+
+def create_order(order_id, symbol, side, time, executed_qty="1", quote_qty="10"):
+    return BinanceOrder(
+        {
+            "symbol": symbol,
+            "orderId": order_id,
+            "side": side,
+            "status": "FILLED",
+            "time": time,
+            "executedQty": executed_qty,
+            "cummulativeQuoteQty": quote_qty,
+            "fills": [{"price": "10", "qty": executed_qty, "commission": "0", "commissionAsset": "BNB", "tradeId": 1}],
+        }
+    )
+
+
+def test_repository_queries(tmp_path):
+    database_filepath = os.path.join(tmp_path, "orders.sqlite3")
+    repository = SQLiteOrderRepository(database_filepath)
+    assert repository.is_empty()
+    repository.add_fulfilled_orders(
+        [
+            create_order(1, "BTCUSDT", "BUY", NOVEMBER),
+            create_order(2, "BTCUSDT", "BUY", NOVEMBER + 1000, "2", "20"),
+            create_order(3, "BTCUSDT", "SELL", NOVEMBER + 2000),
+            create_order(4, "ETHUSDT", "BUY", DECEMBER),
+        ]
+    )
+
+    assert repository.get_last_order("BTCUSDT", "BUY").orderId == 2
+    assert repository.get_last_order("ETHUSDT", "SELL") is None
+    assert repository.get_last_fill_time("BTCUSDT") == NOVEMBER + 2000
+    assert [o.orderId for o in repository.orders_in_time_range(NOVEMBER + 1, DECEMBER + 1)] == [2, 3, 4]
+    assert [o.orderId for o in repository.orders_in_time_range(0, DECEMBER, "BTCUSDT")] == [1, 2, 3]
+    assert repository.get_order("ETHUSDT", 4).fills[0]["commissionAsset"] == "BNB"
+    assert repository.monthly_totals("BUY") == [
+        {"month": "2021-11", "symbol": "BTCUSDT", "base_total": Decimal("3.0"), "quote_total": Decimal("30.0")},
+        {"month": "2021-12", "symbol": "ETHUSDT", "base_total": Decimal("1.0"), "quote_total": Decimal("10.0")},
+    ]
+
+    # other processes can read the database while the bot keeps it open
+    with sqlite3.connect(database_filepath) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert connection.execute("SELECT COUNT(*) FROM fills").fetchone()[0] == 4
+    repository.close()
+
+
+def test_orders_of_different_symbols_with_the_same_order_id(tmp_path):
+    database_filepath = os.path.join(tmp_path, "orders.sqlite3")
+    repository = SQLiteOrderRepository(database_filepath)
+    repository.add_fulfilled_order(create_order(5, "BTCUSDT", "BUY", NOVEMBER, "1", "10"))
+    repository.add_fulfilled_order(create_order(5, "ETHUSDT", "BUY", DECEMBER, "2", "20"))
+
+    assert repository.get_order("BTCUSDT", 5).executedQty == "1"
+    assert repository.get_order("ETHUSDT", 5).executedQty == "2"
+    assert repository.get_last_order("BTCUSDT", "BUY").symbol == "BTCUSDT"
+    assert [o.symbol for o in repository.fulfilled_orders()] == ["BTCUSDT", "ETHUSDT"]
+    # replacing an order only replaces the fills of the same symbol
+    repository.add_fulfilled_order(create_order(5, "ETHUSDT", "BUY", DECEMBER, "3", "30"))
+    repository.close()
+    with sqlite3.connect(database_filepath) as connection:
+        fills = connection.execute("SELECT symbol, qty FROM fills ORDER BY symbol").fetchall()
+    assert fills == [("BTCUSDT", "1"), ("ETHUSDT", "3")]
+
+
+def test_order_list_manager_with_database_imports_order_file(tmp_path):
+    order_filepath = os.path.join(tmp_path, "orders.json")
+    database_filepath = os.path.join(tmp_path, "orders.sqlite3")
+    with open(order_filepath, "w") as f:
+        json.dump([create_order(1, "BTCUSDT", "BUY", NOVEMBER).asDict()], f)
+
+    manager = OrderListManager(order_filepath, database_filepath=database_filepath)
+    manager.load_fulfilled_from_file()
+    order = BinanceOrder({"symbol": "BTCUSDT", "orderId": 2, "side": "BUY", "status": "NEW", "time": DECEMBER})
+    manager.add_new_order(order)
+    assert manager.mark_order_filled(order, create_order(2, "BTCUSDT", "BUY", DECEMBER))
+    assert manager.wait_for_order_filled("BTCUSDT", 2, timeout=0).orderId == 2
+    manager.store_orders_to_file()
+    manager.close()
+
+    # the order file is not rewritten, the fills are only in the database
+    with open(order_filepath) as f:
+        assert len(json.load(f)) == 1
+    manager = OrderListManager(order_filepath, database_filepath=database_filepath)
+    manager.load_fulfilled_from_file()
+    assert manager.get_last_order_for_symbol("BTCUSDT").orderId == 2
+    assert [o.orderId for o in manager.fulfilled_orders()] == [1, 2]
+    assert [t["month"] for t in manager.monthly_totals()] == ["2021-11", "2021-12"]
+    manager.close()
+
+
+def test_monthly_totals_are_the_same_with_and_without_database(tmp_path):
+    orders = [
+        create_order(1, "BTCUSDT", "BUY", NOVEMBER, "0.1", "4000.1"),
+        create_order(2, "BTCUSDT", "BUY", NOVEMBER + 1000, "0.2", "8000.2"),
+        create_order(3, "ETHUSDT", "BUY", NOVEMBER + 2000, "0.00000001", "0.00003"),
+        create_order(4, "BTCUSDT", "BUY", DECEMBER, "0.3", "12000.3"),
+        create_order(5, "BTCUSDT", "SELL", DECEMBER + 1000, "0.1", "4500"),
+    ]
+    in_memory = OrderListManager(os.path.join(tmp_path, "memory.json"))
+    with_database = OrderListManager(
+        os.path.join(tmp_path, "orders.json"), database_filepath=os.path.join(tmp_path, "orders.sqlite3")
+    )
+    for manager in (in_memory, with_database):
+        for order in orders:
+            new_order = BinanceOrder({"symbol": order.symbol, "orderId": order.orderId, "status": "NEW"})
+            manager.add_new_order(new_order)
+            manager.mark_order_filled(new_order, order)
+
+    totals = with_database.monthly_totals()
+    assert totals == in_memory.monthly_totals()
+    assert totals[0] == {
+        "month": "2021-11",
+        "symbol": "BTCUSDT",
+        "base_total": Decimal("0.3"),
+        "quote_total": Decimal("12000.3"),
+    }
+    assert all(isinstance(t["base_total"], Decimal) and isinstance(t["quote_total"], Decimal) for t in totals)
+    assert with_database.monthly_totals("SELL") == in_memory.monthly_totals("SELL")
+    in_memory.close()
+    with_database.close()
@@ -0,0 +1,99 @@
+import datetime
+import json
+import logging
+import os
+from decimal import Decimal
+
+import numpy as np
+
+import dca_investment_bot.logger as logger
+from dca_investment_bot.backtester import Klines
+from dca_investment_bot.clock import VirtualClock
+from dca_investment_bot.config_manager import ConfigManager
+from dca_investment_bot.exchange_simulator import MatchingEngine
+from dca_investment_bot.exchange_simulator import SimulatedSymbol
+from dca_investment_bot.paper_trading import KlinePriceFeed
+from dca_investment_bot.paper_trading import PaperTradingInvester
+
+DAY = 24 * 60 * 60
+WEEKS = 8
+START_TIME = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+
+
+def create_config_manager():
+    config_manager = ConfigManager()
+    config_manager.use_testnet = True
+    config_manager.check_interval = 3600
+    config_manager.sync_fulfilled_orders_to_firebase = False
+    config_manager.use_firebase = False
+    config_manager.max_concurrent_requests = 5
+    config_manager.request_weight_limit = 1200
+    config_manager.price_max_age = 10
+    config_manager.exchange_info_ttl = 86400
+    config_manager.use_user_data_stream = False
+    config_manager.use_order_journal = True
+    config_manager.use_order_database = False
+    config_manager.api_url = ""
+    return config_manager
+
+
+def create_daily_klines(days, start_price):
+    # the low of every day reaches the limit price of an order placed at its open price
+    open_time = (int(START_TIME) + np.arange(days, dtype=np.int64) * DAY) * 1000
+    open_price = start_price + 10 * np.arange(days)
+    return Klines(open_time, open_price, open_price * 1.01, open_price * 0.99, open_price + 10)
+
+
+def test_weekly_investments_in_100_symbols_with_virtual_time(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(logger, "logger_initialized", True)
+    test_logger = logging.getLogger("test_paper_trading")
+    test_logger.setLevel(logging.WARNING)
+    monkeypatch.setattr(logger, "logger", test_logger)
+
+    symbols = [f"COIN{i}USDT" for i in range(100)]
+    os.mkdir("configs")
+    with open(os.path.join("configs", "dca_investment_parameter.json"), "w") as f:
+        json.dump(
+            [
+                {
+                    "symbol": symbol,
+                    "investment_amount_quoteasset": 100,
+                    "interval": "1w",
+                    "investment_time": "12:00",
+                    "start_date": "2022-01-01",
+                }
+                for symbol in symbols
+            ],
+            f,
+        )
+
+    clock = VirtualClock(START_TIME, tz=datetime.timezone.utc)
+    # odd symbols are rounded to a limit price above the market price and fill when the order is created
+    price_feed = KlinePriceFeed(
+        {symbol: create_daily_klines(WEEKS * 7 + 1, 1003 + 100 * i + 4 * (i % 2)) for i, symbol in enumerate(symbols)}
+    )
+    first_prices = price_feed.first_prices()
+    engine = MatchingEngine(
+        [SimulatedSymbol(symbol, symbol[:-4], "USDT", first_prices[symbol]) for symbol in symbols],
+        {"USDT": "1000000"},
+        time_function=clock.time,
+    )
+    invester = PaperTradingInvester(create_config_manager(), engine, clock, START_TIME + WEEKS * 7 * DAY, price_feed)
+
+    invester.run()
+    assert clock.time() == START_TIME + WEEKS * 7 * DAY
+
+    # 2022-01-01 is the first of the weekly investments before the end time
+    summary = invester.summary()
+    assert summary["filled_orders"] == WEEKS * len(symbols)
+    assert invester.order_list_manager.unfulfilled_orders() == []
+    fills_by_symbol = {}
+    for order in invester.engine_fills:
+        fills_by_symbol.setdefault(order["symbol"], []).append(order)
+    for symbol in symbols:
+        fill_times = [order["time"] // 1000 for order in fills_by_symbol[symbol]]
+        assert fill_times[0] == START_TIME + DAY / 2
+        assert np.all(np.diff(fill_times) == 7 * DAY)
+        assert Decimal(summary["balances"][symbol[:-4]]) > 0
+    assert Decimal(summary["invested_quote"]) + Decimal(summary["balances"]["USDT"]) == Decimal("1000000")
@@ -0,0 +1,35 @@
+import os
+
+from dca_investment_bot.parameter_sweep import ParameterSweep
+
+
+def test_sweep_runs_all_combinations_on_process_pool(tmp_path, btcusdt_info, create_strategy, create_daily_klines):
+    klines = {"BTCUSDT": create_daily_klines(create_strategy(), 120)}
+    combinations = ParameterSweep.grid([["BTCUSDT"]], ["1d", "1w", "2w"], ["08:00", "12:00"], [50, 100], "2021-11-01")
+    assert len(combinations) == 12
+
+    sweep = ParameterSweep(klines, {"BTCUSDT": btcusdt_info}, max_workers=2, chunk_size=5)
+    table = sweep.run(combinations)
+    assert len(table) == 12
+
+    best = table.top(1, key="return")[0]
+    daily = [row for row in table.rows if row["interval"] == "1d" and row["amount"] == 100]
+    assert all(row["fills"] > 100 for row in daily)
+    assert best["return"] == max(row["return"] for row in table.rows)
+
+    filepath = os.path.join(tmp_path, "sweep.csv")
+    table.sorted_by("pnl").to_csv(filepath)
+    with open(filepath) as f:
+        assert f.readline().startswith("symbols,interval,investment_time,amount,start_date,fills")
+
+
+def test_symbols_of_a_combination_share_the_quote_balance(btcusdt_info, create_strategy, create_daily_klines):
+    symbols = ["BTCUSDT", "ETHUSDT"]
+    klines = {symbol: create_daily_klines(create_strategy(symbol=symbol), 10) for symbol in symbols}
+    symbol_infos = {symbol: dict(btcusdt_info, symbol=symbol) for symbol in symbols}
+    combinations = ParameterSweep.grid([symbols], ["1d"], ["12:00"], [100], "2021-11-01")
+
+    row = ParameterSweep(klines, symbol_infos, quote_balance=250, max_workers=1).run(combinations).rows[0]
+    # the balance is enough for two orders of 100 in total, not two per symbol
+    assert row["fills"] == 2
+    assert row["invested_quote"] <= 250
@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+import pytest
+
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.portfolio_analytics import PortfolioAnalytics
+
+
+def create_fill(order_id, symbol, side, quantity, quote_quantity):
+    return BinanceOrder(
+        {
+            "symbol": symbol,
+            "orderId": order_id,
+            "side": side,
+            "status": "FILLED",
+            "time": order_id * 1000,
+            "executedQty": quantity,
+            "cummulativeQuoteQty": quote_quantity,
+        }
+    )
+
+
+def test_cost_basis_and_pnl_with_incremental_fills():
+    analytics = PortfolioAnalytics()
+    analytics.add_orders(
+        [
+            create_fill(1, "BTCUSDT", "BUY", "0.01000000", "200.00000000"),
+            create_fill(2, "BTCUSDT", "BUY", "0.01000000", "400.00000000"),
+            create_fill(3, "ETHUSDT", "BUY", "1.00000000", "1000.00000000"),
+        ]
+    )
+    # a new fill only updates the sums of its symbol
+    analytics.add_orders([create_fill(4, "BTCUSDT", "SELL", "0.01000000", "350.00000000")])
+    assert analytics.fill_count() == 4
+
+    report = analytics.report({"BTCUSDT": Decimal("40000"), "ETHUSDT": Decimal("1500")})
+    btc, eth = report.to_dicts()
+    assert btc["symbol"] == "BTCUSDT"
+    assert btc["invested_quote"] == pytest.approx(600)
+    assert btc["avg_entry_price"] == pytest.approx(30000)
+    assert btc["position"] == pytest.approx(0.01)
+    assert btc["cost_basis"] == pytest.approx(300)
+    assert btc["realized_pnl"] == pytest.approx(50)
+    assert btc["unrealized_pnl"] == pytest.approx(100)
+    assert eth["unrealized_pnl"] == pytest.approx(500)
+
+    totals = report.totals()
+    assert totals["invested_quote"] == pytest.approx(1600)
+    assert totals["market_value"] == pytest.approx(1900)
+    assert totals["unrealized_pnl"] == pytest.approx(600)
+
+
+def test_symbols_without_price_are_excluded_from_market_value():
+    analytics = PortfolioAnalytics()
+    analytics.add_orders([create_fill(1, "BTCUSDT", "BUY", "1", "100"), create_fill(2, "ETHUSDT", "BUY", "1", "10")])
+    report = analytics.report({"BTCUSDT": Decimal("110")})
+    assert report.totals()["market_value"] == pytest.approx(110)
+    assert report.totals()["cost_basis"] == pytest.approx(110)
+
+
+def test_sums_that_exceed_int64_stay_exact():
+    analytics = PortfolioAnalytics()
+    # every fill fits into an int64 fixed-point value, their sum does not
+    analytics.add_orders([create_fill(1, "SHIBUSDT", "BUY", "60000000000", "600000")])
+    analytics.add_orders(
+        [
+            create_fill(2, "SHIBUSDT", "BUY", "60000000000", "1200000"),
+            create_fill(3, "SHIBUSDT", "SELL", "0.00000001", "0.00000001"),
+        ]
+    )
+    analytics.add_orders([create_fill(4, "BTCUSDT", "BUY", "1", "100")])
+
+    shib, btc = analytics.report({"SHIBUSDT": Decimal("0.00002"), "BTCUSDT": Decimal("110")}).to_dicts()
+    assert shib["position"] == pytest.approx(120000000000 - 0.00000001)
+    assert shib["invested_quote"] == pytest.approx(1800000)
+    assert shib["avg_entry_price"] == pytest.approx(0.000015)
+    assert btc["unrealized_pnl"] == pytest.approx(10)
@@ -0,0 +1,70 @@
+import logging
+from decimal import Decimal
+
+import pytest
+
+import dca_investment_bot.logger as logger
+from dca_investment_bot.exceptions import PriceNotAvailableException
+from dca_investment_bot.exceptions import UnknownSymbolException
+from dca_investment_bot.exchange_simulator import MatchingEngine
+from dca_investment_bot.exchange_simulator import SimulatedClient
+from dca_investment_bot.exchange_simulator import SimulatedSymbol
+from dca_investment_bot.exchange_simulator import SimulatorError
+from dca_investment_bot.price_provider import PriceProvider
+from dca_investment_bot.trading_bot import TradingBot
+
+
+@pytest.fixture(autouse=True)
+def quiet_logger(monkeypatch):
+    monkeypatch.setattr(logger, "logger_initialized", True)
+    test_logger = logging.getLogger("test_price_provider")
+    test_logger.setLevel(logging.CRITICAL)
+    monkeypatch.setattr(logger, "logger", test_logger)
+
+
+def test_symbols_without_price_are_not_requested_again():
+    requested = []
+
+    def fetch_prices(symbols):
+        requested.append(list(symbols))
+        return {"BTCUSDT": Decimal("20000")}
+
+    provider = PriceProvider(fetch_prices, max_age_seconds=-1)
+    provider.set_symbols(["BTCUSDT", "LUNAUSDT"])
+    assert provider.get_price("BTCUSDT") == Decimal("20000")
+    with pytest.raises(PriceNotAvailableException) as e:
+        provider.get_price("LUNAUSDT")
+    assert e.value.symbol == "LUNAUSDT"
+    assert requested == [["BTCUSDT", "LUNAUSDT"], ["BTCUSDT"]]
+
+
+def test_unknown_and_delisted_symbols_do_not_break_the_prices_of_other_symbols(monkeypatch):
+    engine = MatchingEngine(
+        [SimulatedSymbol("BTCUSDT", "BTC", "USDT", "20000.00"), SimulatedSymbol("ETHUSDT", "ETH", "USDT", "1500.00")],
+        {"USDT": "1000"},
+    )
+    bot = TradingBot(client=SimulatedClient(engine), price_max_age=-1)
+    bot.connect()
+    try:
+        # a typo in the strategies is not added to the ticker request of all symbols
+        bot.set_price_symbols(["BTCUSDT", "ETHUSDT", "BTCUSDX"])
+        assert bot.price_provider.get_symbols() == ["BTCUSDT", "ETHUSDT"]
+        with pytest.raises(UnknownSymbolException):
+            bot.get_avg_price("BTCUSDX")
+        assert bot.get_avg_price("BTCUSDT") == Decimal("20000.00")
+
+        # ETHUSDT gets delisted after the exchange info was fetched, binance rejects the whole request
+        get_price = engine.get_price
+
+        def get_price_of_listed_symbols(symbol):
+            if symbol == "ETHUSDT":
+                raise SimulatorError(400, -1121, "Invalid symbol.")
+            return get_price(symbol)
+
+        monkeypatch.setattr(engine, "get_price", get_price_of_listed_symbols)
+        assert bot.get_avg_price("BTCUSDT") == Decimal("20000.00")
+        with pytest.raises(PriceNotAvailableException):
+            bot.get_avg_price("ETHUSDT")
+        assert bot.price_provider.get_symbols() == ["BTCUSDT"]
+    finally:
+        bot.close_all()
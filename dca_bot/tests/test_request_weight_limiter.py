@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from binance.exceptions import BinanceAPIException
+
+from dca_investment_bot.exchange_simulator import ExchangeSimulator
+from dca_investment_bot.exchange_simulator import MatchingEngine
+from dca_investment_bot.exchange_simulator import SimulatedSymbol
+from dca_investment_bot.request_weight_limiter import PRIORITY_DEFAULT
+from dca_investment_bot.request_weight_limiter import PRIORITY_LOW
+from dca_investment_bot.request_weight_limiter import PRIORITY_ORDER
+from dca_investment_bot.request_weight_limiter import RequestWeightLimiter
+from dca_investment_bot.trading_bot import TradingBot
+
+
+def start_acquire(limiter, weight, priority, acquired):
+    def acquire():
+        limiter.acquire(weight, priority)
+        acquired.append(priority)
+
+    thread = threading.Thread(target=acquire, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_lower_priorities_leave_weight_for_orders():
+    limiter = RequestWeightLimiter(weight_limit=100, window_seconds=60)
+    limiter.acquire(80, PRIORITY_DEFAULT)
+
+    # 20% of the limit are reserved for the default and order priority
+    acquired = []
+    low_priority_thread = start_acquire(limiter, 1, PRIORITY_LOW, acquired)
+    low_priority_thread.join(timeout=0.2)
+    assert low_priority_thread.is_alive()
+
+    # a waiting request with a lower priority doesn't block the higher priorities
+    limiter.acquire(15, PRIORITY_DEFAULT)
+    limiter.acquire(5, PRIORITY_ORDER)
+    assert limiter.used_weight() == 100
+    assert acquired == []
+
+
+def test_waiting_requests_get_their_weight_in_order_of_priority():
+    limiter = RequestWeightLimiter(weight_limit=10, window_seconds=0.5)
+    limiter.acquire(10, PRIORITY_ORDER)
+
+    acquired = []
+    threads = [start_acquire(limiter, 8, PRIORITY_LOW, acquired)]
+    time.sleep(0.05)
+    threads.append(start_acquire(limiter, 8, PRIORITY_DEFAULT, acquired))
+    time.sleep(0.05)
+    threads.append(start_acquire(limiter, 8, PRIORITY_ORDER, acquired))
+    for thread in threads:
+        thread.join(timeout=5)
+
+    # only one request fits into the window at a time
+    assert acquired == [PRIORITY_ORDER, PRIORITY_DEFAULT, PRIORITY_LOW]
+
+
+def test_async_requests_wait_for_the_window():
+    limiter = RequestWeightLimiter(weight_limit=10, window_seconds=0.2)
+
+    async def acquire_twice():
+        started_at = time.monotonic()
+        await limiter.endpoint_async("openOrders", PRIORITY_LOW)
+        await limiter.endpoint_async("openOrders")
+        return time.monotonic() - started_at
+
+    assert asyncio.run(acquire_twice()) >= 0.2
+    assert limiter.used_weight() == 6
+
+
+def test_used_weight_reported_by_binance_is_reserved():
+    limiter = RequestWeightLimiter(weight_limit=100, window_seconds=60)
+    limiter.acquire(10)
+
+    # weight used by another process
+    limiter.update_from_headers({"X-MBX-USED-WEIGHT-1M": "60"})
+    assert limiter.used_weight() == 60
+    # reports of older responses don't release weight
+    limiter.update_from_headers({"X-MBX-USED-WEIGHT-1M": "20"})
+    limiter.update_from_headers(None)
+    assert limiter.used_weight() == 60
+
+    limiter.pause_from_headers({"Retry-After": "30"})
+    assert 29 < limiter.paused_seconds() <= 30
+
+
+def test_trading_bot_feeds_back_used_weight_and_pauses_when_rejected(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BINANCE_KEY", "key")
+    monkeypatch.setenv("BINANCE_SECRET", "secret")
+    engine = MatchingEngine([SimulatedSymbol("BTCUSDT", "BTC", "USDT", "20000.00")], {"USDT": "1000"})
+    with ExchangeSimulator(engine, weight_limit=100) as simulator:
+        bot = TradingBot(api_url=simulator.url)
+        bot.connect()
+        try:
+            # requests of another process with the same ip
+            for _ in range(20):
+                simulator.handle("GET", "/api/v3/ping", {})
+            bot.get_orders("BTCUSDT")
+            assert bot.request_weight_limiter.used_weight() == simulator.used_weight()
+            assert bot.request_weight_limiter.paused_seconds() == 0
+
+            for _ in range(100):
+                simulator.handle("GET", "/api/v3/ping", {})
+            with pytest.raises(BinanceAPIException) as e:
+                bot.get_orders("BTCUSDT")
+            assert e.value.status_code == 429
+            assert bot.request_weight_limiter.paused_seconds() > 0
+        finally:
+            bot.close_all()
@@ -0,0 +1,74 @@
+from decimal import Decimal
+from decimal import localcontext
+
+from dca_investment_bot.order_validator import OrderValidator
+from dca_investment_bot.symbol_rules import SymbolRules
+from dca_investment_bot.symbol_rules import SymbolRulesCache
+
+BTCUSDT_INFO = {
+    "symbol": "BTCUSDT",
+    "baseAsset": "BTC",
+    "quoteAsset": "USDT",
+    "filters": [
+        {"filterType": "PRICE_FILTER", "minPrice": "0.01000000", "maxPrice": "0.00000000", "tickSize": "0.01000000"},
+        {"filterType": "LOT_SIZE", "minQty": "0.00001000", "maxQty": "9000.00000000", "stepSize": "0.00001000"},
+        {"filterType": "MIN_NOTIONAL", "minNotional": "10.00000000", "applyToMarket": True, "avgPriceMins": 5},
+        {"filterType": "MAX_NUM_ORDERS", "maxNumOrders": 200},
+    ],
+}
+
+
+def test_symbol_rules_parse_filters():
+    rules = SymbolRules(BTCUSDT_INFO)
+    assert rules.quote_asset == "USDT"
+    assert rules.tick_size == Decimal("0.01")
+    assert rules.max_price is None
+    assert rules.step_size == Decimal("0.00001")
+    assert rules.min_notional == Decimal("10")
+    assert rules.max_num_orders == 200
+
+    assert rules.round_quantity(Decimal("0.000123456")) == Decimal("0.00012")
+    assert rules.round_price(Decimal("20000.004")) == Decimal("20000.00")
+
+
+def test_order_validator_uses_symbol_rules():
+    rules = SymbolRules(BTCUSDT_INFO)
+    balance = Decimal("1000")
+    assert OrderValidator.check_order_possible(rules, balance, "BTCUSDT", Decimal("0.001"), Decimal("20000"))
+    # price does not match tick size
+    assert not OrderValidator.check_order_possible(rules, balance, "BTCUSDT", Decimal("0.001"), Decimal("20000.001"))
+    # quantity does not match step size
+    assert not OrderValidator.check_order_possible(rules, balance, "BTCUSDT", Decimal("0.000011"), Decimal("20000"))
+    # notional smaller than min notional
+    assert not OrderValidator.check_order_possible(rules, balance, "BTCUSDT", Decimal("0.0001"), Decimal("20000"))
+    # no balance
+    assert not OrderValidator.check_order_possible(rules, None, "BTCUSDT", Decimal("0.001"), Decimal("20000"))
+
+
+def test_symbol_rules_cache_compiles_once_until_invalidated():
+    cache = SymbolRulesCache()
+    rules = cache.get(BTCUSDT_INFO)
+    assert cache.get(BTCUSDT_INFO) is rules
+    cache.invalidate(["BTCUSDT"])
+    assert cache.get(BTCUSDT_INFO) is not rules
+
+
+def test_step_size_check_with_more_digits_than_the_decimal_precision():
+    rules = SymbolRules(
+        {
+            "symbol": "SHIBUSDT",
+            "baseAsset": "SHIB",
+            "quoteAsset": "USDT",
+            "filters": [
+                {"filterType": "PRICE_FILTER", "minPrice": "0.00000001", "maxPrice": "0", "tickSize": "0.00000001"},
+                {"filterType": "LOT_SIZE", "minQty": "1", "maxQty": "92141578", "stepSize": "1"},
+            ],
+        }
+    )
+    # the bot runs with a precision of 8 digits (see DCAInvester.run)
+    with localcontext() as context:
+        context.prec = 8
+        assert rules.quantity_matches_step_size(Decimal("111111111"))
+        assert not rules.quantity_matches_step_size(Decimal("111111111.5"))
+        assert rules.price_matches_tick_size(Decimal("1.23456789"))
+        assert not rules.price_matches_tick_size(Decimal("1.234567891"))
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import threading
+
+from dca_investment_bot import user_data_stream_checker
+from dca_investment_bot.binance_order import BinanceOrder
+from dca_investment_bot.order_list_manager import OrderListManager
+from dca_investment_bot.user_data_stream_checker import UserDataStreamOrderChecker
+
+
+class AccountSnapshotBot:
+    def __init__(self):
+        self.invalidated = 0
+
+    def invalidate_account_snapshot(self):
+        self.invalidated += 1
+
+
+def create_execution_report(order_id, status):
+    return {
+        "e": "executionReport",
+        "E": 1499405658658,
+        "s": "BTCUSDT",
+        "c": "mUvoqJxFIILMdfAW5iGSOW",
+        "S": "BUY",
+        "o": "LIMIT",
+        "f": "GTC",
+        "q": "0.10000000",
+        "p": "20000.00000000",
+        "X": status,
+        "i": order_id,
+        "z": "0.10000000" if status == "FILLED" else "0.00000000",
+        "T": 1499405658657,
+        "O": 1499405658000,
+    }
+
+
+def test_execution_report_marks_order_filled(tmp_path):
+    manager = OrderListManager(os.path.join(tmp_path, "orders.json"))
+    order = BinanceOrder({"symbol": "BTCUSDT", "orderId": 4, "side": "BUY", "status": "NEW", "time": 1499405658000})
+    manager.add_new_order(order)
+    filled_orders = []
+    bot = AccountSnapshotBot()
+    checker = UserDataStreamOrderChecker(manager, filled_orders.append, None, bot)
+
+    checker._handle_event(create_execution_report(4, "NEW"))
+    assert filled_orders == []
+
+    checker._handle_event(create_execution_report(4, "FILLED"))
+    assert [o.orderId for o in filled_orders] == [4]
+    assert filled_orders[0].executedQty == "0.10000000"
+    assert list(manager.unfulfilled_orders()) == []
+    assert [o.orderId for o in manager.fulfilled_orders()] == [4]
+
+    checker._handle_event({"e": "outboundAccountPosition", "B": []})
+    assert bot.invalidated == 1
+
+
+class ListenKeyBot(AccountSnapshotBot):
+    """
+    Blocks in create_listen_key until release is set.
+    """
+
+    def __init__(self, stream_url=None):
+        super().__init__()
+        self.stream_url = stream_url
+        self.listen_key_requested = threading.Event()
+        self.release = threading.Event()
+        self.connected = threading.Event()
+        self.closed_listen_keys = []
+
+    def create_listen_key(self):
+        self.listen_key_requested.set()
+        self.release.wait(5)
+        return "listen-key"
+
+    def get_user_data_stream_url(self, listen_key):
+        self.connected.set()
+        return self.stream_url
+
+    def close_listen_key(self, listen_key):
+        self.closed_listen_keys.append(listen_key)
+
+
+def test_stop_while_the_listen_key_is_requested(tmp_path):
+    manager = OrderListManager(os.path.join(tmp_path, "orders.json"))
+    bot = ListenKeyBot()
+    checker = UserDataStreamOrderChecker(manager, None, None, bot)
+    checker.start()
+    assert bot.listen_key_requested.wait(5)
+
+    checker.stop()
+    bot.release.set()
+    checker.join(5)
+    assert not checker.is_alive()
+    assert not bot.connected.is_set()
+    assert bot.closed_listen_keys == ["listen-key"]
+
+
+class QuietWebsocket:
+    """
+    Connection of a user data stream without events.
+    """
+
+    def __init__(self):
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def recv(self):
+        await asyncio.Event().wait()
+
+    async def close(self):
+        self.closed = True
+
+
+def test_stop_while_the_stream_is_quiet(tmp_path, monkeypatch):
+    websocket = QuietWebsocket()
+    monkeypatch.setattr(user_data_stream_checker, "connect", lambda url: websocket)
+    bot = ListenKeyBot("wss://stream.binance.com:9443/ws/listen-key")
+    bot.release.set()
+    checker = UserDataStreamOrderChecker(OrderListManager(os.path.join(tmp_path, "orders.json")), None, None, bot)
+    checker.start()
+    assert bot.connected.wait(5)
+
+    checker.stop()
+    checker.join(5)
+    assert not checker.is_alive()
+    assert bot.closed_listen_keys == ["listen-key"]